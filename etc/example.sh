@@ -1,4 +1,4 @@
-DS_PATH="/tmp/example.pkl"
+DS_PATH="/tmp/example-project"
 
 # Initialize project using example.json
 mos-cli init \
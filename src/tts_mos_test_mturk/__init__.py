@@ -1,3 +1,17 @@
-from tts_mos_test_mturk.correlations import get_algorithm_mos_correlations as algorithm_correlation
-from tts_mos_test_mturk.correlations import \
-  get_sentence_mos_correlations_3dim as sentence_correlation
+from importlib import import_module
+from typing import Any
+
+# the correlations (and thereby scipy) are only imported on first access
+LAZY_ATTRIBUTES = {
+  "algorithm_correlation": ("tts_mos_test_mturk.correlations", "get_algorithm_mos_correlations"),
+  "sentence_correlation": ("tts_mos_test_mturk.correlations", "get_sentence_mos_correlations_3dim"),
+}
+
+
+def __getattr__(name: str) -> Any:
+  if name not in LAZY_ATTRIBUTES:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  module_name, attribute = LAZY_ATTRIBUTES[name]
+  value = getattr(import_module(module_name), attribute)
+  globals()[name] = value
+  return value
@@ -1,10 +1,9 @@
-from collections import defaultdict
-from typing import Dict, List, Set
+from typing import List, Set
 
 import numpy as np
 
 from tts_mos_test_mturk.evaluation_data import EvaluationData
-from tts_mos_test_mturk.typing import RatingName, Ratings, RatingValue, WorkerName
+from tts_mos_test_mturk.typing import RatingName, Ratings, RatingValue
 
 
 def get_duplicate_votes_mad(data: EvaluationData, rating_names: Set[str]):
@@ -21,14 +20,15 @@ def get_duplicate_votes_mad(data: EvaluationData, rating_names: Set[str]):
     for _ in range(data.n_algorithms)
   ]
 
-  for worker, worker_data in data.worker_data.items():
-    worker_i = data.workers.get_loc(worker)
-    for assignment_data in worker_data.assignments.values():
-      for (alg_name, file_name), ass_ratings in assignment_data.ratings.items():
-        alg_i = data.algorithms.get_loc(alg_name)
-        file_i = data.files.get_loc(file_name)
-        rating = get_mean_rating(ass_ratings.votes, rating_names)
-        ratings[alg_i][worker_i][file_i].append(rating)
+  mean_votes = get_mean_votes(data, rating_names)
+  cells = zip(
+    data.rating_algorithms.tolist(),
+    data.rating_workers.tolist(),
+    data.rating_files.tolist(),
+    mean_votes.tolist(),
+  )
+  for alg_i, worker_i, file_i, rating in cells:
+    ratings[alg_i][worker_i][file_i].append(rating)
 
   final_ratings = np.full(
     (data.n_algorithms, data.n_workers, data.n_files),
@@ -47,43 +47,59 @@ def get_duplicate_votes_mad(data: EvaluationData, rating_names: Set[str]):
 
 
 def get_ratings(data: EvaluationData, rating_names: Set[str]) -> np.ndarray:
-  ratings: List[List[List[List[RatingValue]]]] = [
-    [
-      [
-        []
-        for _ in range(data.n_files)
-      ]
-      for _ in range(data.n_workers)
-    ]
-    for _ in range(data.n_algorithms)
-  ]
+  result = get_ratings_view(data, rating_names).copy()
+  return result
+
 
-  for worker, worker_data in data.worker_data.items():
-    worker_i = data.workers.get_loc(worker)
-    for assignment_data in worker_data.assignments.values():
-      for (alg_name, file_name), ass_ratings in assignment_data.ratings.items():
-        alg_i = data.algorithms.get_loc(alg_name)
-        file_i = data.files.get_loc(file_name)
-        rating = get_mean_rating(ass_ratings.votes, rating_names)
-        ratings[alg_i][worker_i][file_i].append(rating)
+def get_ratings_view(data: EvaluationData, rating_names: Set[str]) -> np.ndarray:
+  """returns the cached ratings, which are read-only"""
+  key = frozenset(rating_names)
+  if key not in data.ratings_cache:
+    ratings = calculate_ratings(data, rating_names)
+    ratings.flags.writeable = False
+    data.ratings_cache[key] = ratings
+  return data.ratings_cache[key]
+
+
+def calculate_ratings(data: EvaluationData, rating_names: Set[str]) -> np.ndarray:
+  sparse_ratings = get_sparse_ratings(data, rating_names)
 
   final_ratings = np.full(
     (data.n_algorithms, data.n_workers, data.n_files),
     fill_value=np.nan,
     dtype=np.float32
   )
-
-  for alg_i in range(data.n_algorithms):
-    for worker_i in range(data.n_workers):
-      for file_i in range(data.n_files):
-        rs = ratings[alg_i][worker_i][file_i]
-        if len(rs) > 0:
-          # Note: theoretically its better to take the mean for each rating-name separately and then the mean of both but in case the amount per rating is equal it makes no difference
-          avg_rating = np.mean(rs)
-          final_ratings[alg_i, worker_i, file_i] = avg_rating
+  final_ratings.flat[data.rated_cells] = sparse_ratings
   return final_ratings
 
 
+def get_sparse_ratings(data: EvaluationData, rating_names: Set[str]) -> np.ndarray:
+  """returns the ratings of the rated cells (data.rated_cells), i.e., without the NaN of the unrated cells"""
+  mean_votes = get_mean_votes(data, rating_names)
+
+  # sum and count all ratings of a cell in one pass, i.e., duplicate ratings are averaged
+  n_rated_cells = len(data.rated_cells)
+  sums = np.bincount(data.rating_cells, weights=mean_votes, minlength=n_rated_cells)
+  counts = np.bincount(data.rating_cells, minlength=n_rated_cells)
+
+  # Note: theoretically its better to take the mean for each rating-name separately and then the mean of both but in case the amount per rating is equal it makes no difference
+  result = (sums / counts).astype(np.float32)
+  return result
+
+
+def get_mean_votes(data: EvaluationData, rating_names: Set[RatingName]) -> np.ndarray:
+  rating_name_indices = [data.rating_names.get_loc(rating_name) for rating_name in rating_names]
+  selected_votes = data.votes[:, rating_name_indices].astype(np.float64)
+  result = np.mean(selected_votes, axis=1)
+  return result
+
+
+def get_vote_value(vote: float) -> RatingValue:
+  if vote.is_integer():
+    return int(vote)
+  return vote
+
+
 def get_mean_rating(ratings: Ratings, rating_names: Set[RatingName]) -> RatingValue:
   selected_ratings = [
     ratings[rating_name]
@@ -91,3 +107,9 @@ def get_mean_rating(ratings: Ratings, rating_names: Set[RatingName]) -> RatingVa
   ]
   result = np.mean(selected_ratings)
   return result
+
+
+def get_time_strings(times: np.ndarray) -> np.ndarray:
+  # same as strftime("%Y-%m-%d %H:%M:%S") for each time
+  result = np.char.replace(np.datetime_as_string(times, unit="s"), "T", " ")
+  return result
@@ -1,9 +1,12 @@
 import warnings
+from dataclasses import dataclass
 from typing import Literal
 
 import numpy as np
 from mean_opinion_score import get_mos
 
+CORRELATION_BLOCK_SIZE = 256
+
 
 def get_sentence_mos_correlation(worker: int, Z: np.ndarray) -> float:
   assert len(Z.shape) == 2
@@ -27,13 +30,10 @@ def get_sentence_mos_correlation_3dim(worker: int, ratings: np.ndarray) -> float
 
 
 def get_sentence_mos_correlations_3dim(ratings: np.ndarray) -> np.ndarray:
-  n_workers = ratings.shape[1]
   Z = np.concatenate(ratings, axis=1)
-
-  correlations = np.empty(n_workers)
-  for worker_i in range(n_workers):
-    correlations[worker_i] = get_sentence_mos_correlation(worker_i, Z)
-
+  rated = ~np.isnan(Z)
+  sums = np.where(rated, Z, 0)
+  correlations = get_leave_one_out_mos_correlations(sums, rated)
   return correlations
 
 
@@ -52,7 +52,24 @@ def get_algorithm_mos_correlation(worker: int, ratings: np.ndarray) -> float:
   return get_corrcoef(mos_ratings)
 
 
-def get_worker_mos_correlations(ratings: np.ndarray) -> np.ndarray:
+@dataclass
+class WorkerCorrelations:
+  sentence: np.ndarray
+  algorithm: np.ndarray
+  both: np.ndarray
+  n_ratings: np.ndarray
+
+  def get(self, mode: Literal["sentence", "algorithm", "both"]) -> np.ndarray:
+    if mode == "sentence":
+      return self.sentence
+    if mode == "algorithm":
+      return self.algorithm
+    if mode == "both":
+      return self.both
+    raise NotImplementedError()
+
+
+def get_worker_correlations(ratings: np.ndarray) -> WorkerCorrelations:
   n_workers = ratings.shape[1]
 
   correlations = np.empty((2, n_workers))
@@ -63,7 +80,20 @@ def get_worker_mos_correlations(ratings: np.ndarray) -> np.ndarray:
   with warnings.catch_warnings():
     warnings.simplefilter("ignore", category=RuntimeWarning)
     worker_correlations = np.nanmean(correlations, axis=0)
-  return worker_correlations
+
+  n_ratings = np.sum(~np.isnan(ratings), axis=(0, 2))
+
+  result = WorkerCorrelations(
+    sentence=correlations[1],
+    algorithm=correlations[0],
+    both=worker_correlations,
+    n_ratings=n_ratings,
+  )
+  return result
+
+
+def get_worker_mos_correlations(ratings: np.ndarray) -> np.ndarray:
+  return get_worker_correlations(ratings).both
 
 
 def get_mos_correlations(ratings: np.ndarray, mode: Literal["sentence", "algorithm", "both"]) -> np.ndarray:
@@ -77,15 +107,65 @@ def get_mos_correlations(ratings: np.ndarray, mode: Literal["sentence", "algorit
 
 
 def get_algorithm_mos_correlations(ratings: np.ndarray) -> np.ndarray:
-  n_workers = ratings.shape[1]
+  rated = ~np.isnan(ratings)
+  sums = np.sum(np.where(rated, ratings, 0), axis=2, dtype=np.float64).T
+  counts = np.sum(rated, axis=2).T
+  correlations = get_leave_one_out_mos_correlations(sums, counts)
+  return correlations
 
-  correlations = np.empty(n_workers)
-  for worker_i in range(n_workers):
-    correlations[worker_i] = get_algorithm_mos_correlation(worker_i, ratings)
 
+def get_leave_one_out_mos_correlations(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+  """
+  Computes for each worker the correlation between its MOS and the MOS of all other workers.
+
+  sums: a W-by-N matrix containing the sum of the ratings of each worker for each item (sentence or algorithm)
+  counts: a W-by-N matrix containing the count of the ratings of each worker for each item
+  """
+  assert len(sums.shape) == 2
+  assert sums.shape == counts.shape
+  n_workers = sums.shape[0]
+
+  total_sums = np.sum(sums, axis=0, dtype=np.float64)
+  total_counts = np.sum(counts, axis=0)
+
+  correlations = np.empty(n_workers)
+  # process workers in blocks to limit the size of the temporary arrays
+  for start in range(0, n_workers, CORRELATION_BLOCK_SIZE):
+    end = min(start + CORRELATION_BLOCK_SIZE, n_workers)
+    block_sums = sums[start:end].astype(np.float64)
+    block_counts = counts[start:end]
+    other_counts = total_counts - block_counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+      worker_mos = np.where(block_counts > 0, block_sums / block_counts, np.nan)
+      others_mos = np.where(other_counts > 0, (total_sums - block_sums) / other_counts, np.nan)
+    correlations[start:end] = get_corrcoefs(worker_mos, others_mos)
   return correlations
 
 
+def get_corrcoefs(X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+  """
+  Computes get_corrcoef() for each row of X and Y.
+  """
+  assert len(X.shape) == 2
+  assert X.shape == Y.shape
+
+  valid = ~np.isnan(X) & ~np.isnan(Y)
+  n_values_per_vec = np.sum(valid, axis=1)
+
+  with np.errstate(divide="ignore", invalid="ignore"):
+    mean_x = np.sum(np.where(valid, X, 0), axis=1) / n_values_per_vec
+    mean_y = np.sum(np.where(valid, Y, 0), axis=1) / n_values_per_vec
+    dev_x = np.where(valid, X - mean_x[:, None], 0)
+    dev_y = np.where(valid, Y - mean_y[:, None], 0)
+    ss_x = np.sum(dev_x**2, axis=1)
+    ss_y = np.sum(dev_y**2, axis=1)
+    result = np.sum(dev_x * dev_y, axis=1) / np.sqrt(ss_x * ss_y)
+
+  result = np.clip(result, -1, 1)
+  result[(n_values_per_vec < 2) | (ss_x == 0) | (ss_y == 0)] = np.nan
+  return result
+
+
 def get_corrcoef(v: np.ndarray) -> float:
   assert len(v.shape) == 2
   assert v.shape[0] == 2
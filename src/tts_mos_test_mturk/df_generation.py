@@ -1,5 +1,10 @@
 import datetime
+import math
+import tempfile
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 from typing import OrderedDict as ODType
 from typing import Set, Tuple
@@ -9,8 +14,9 @@ import pandas as pd
 from mean_opinion_score import get_ci95, get_ci95_default, get_mos
 from ordered_set import OrderedSet
 
-from tts_mos_test_mturk.common import get_ratings
+from tts_mos_test_mturk.common import get_ratings_view, get_vote_value
 from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.io import load_array
 from tts_mos_test_mturk.logging import get_detail_logger, get_logger
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
 from tts_mos_test_mturk.masking.masks import MaskBase
@@ -18,103 +24,234 @@ from tts_mos_test_mturk.typing import MaskName
 
 ALL_CELL_CONTENT = "-ALL-"
 
-def get_row(row_template: ODType, ratings: np.ndarray, ratings_masked: np.ndarray, algo_i: int, masks: List[MaskBase]) -> ODType:
+
+def get_ci95_of_group(Z: np.ndarray, n_workers: int, n_sentences: int) -> float:
+  """
+  Computes the same CI95 as get_ci95() for the matrix of all workers and sentences, of which Z
+  contains only the workers and sentences of a group (and not the other all-NaN rows and columns).
+  """
+  # all-NaN rows and columns change only the degrees of freedom, which get_ci95() takes from the
+  # smaller dimension of the matrix; therefore Z is filled up with them to that dimension
+  n_min = min(n_workers, n_sentences)
+  n_group_workers, n_group_sentences = Z.shape
+  if min(n_group_workers, n_group_sentences) != n_min:
+    filled_Z = np.full((max(n_group_workers, n_min), max(n_group_sentences, n_min)),
+                       fill_value=np.nan, dtype=Z.dtype)
+    filled_Z[:n_group_workers, :n_group_sentences] = Z
+    Z = filled_Z
+  ci95 = get_ci95(Z)
+  return ci95
+
+
+def get_row(row_template: ODType, Z: np.ndarray, rated: np.ndarray, n_ratings_all: int, n_algorithms: int, windices: Optional[np.ndarray]) -> ODType:
+  """
+  Z: the masked ratings of an algorithm (workers x sentences)
+  rated: ~np.isnan(Z), it is shared by all rows of the algorithm
+  n_ratings_all: the count of all (also masked) ratings of the algorithm
+  windices: indices or boolean mask of the workers of the group or None for all workers
+  """
   row = row_template.copy()
-  current_ratings_masked = ratings_masked.copy()
-  for mask in masks:
-    mask.apply_by_nan(current_ratings_masked)
-  row["MOS"] = get_mos(current_ratings_masked[algo_i])
-  row["CI95"] = get_ci95(current_ratings_masked[algo_i])
-  row["CI95 (default)"] = get_ci95_default(current_ratings_masked[algo_i])
-  row["STD"] = np.nanstd(current_ratings_masked[algo_i])
-  row["Min. #Ratings per Sentence"] = np.min(
-    np.sum(~np.isnan(current_ratings_masked[algo_i]), axis=0))
-  row["Max. #Ratings per Sentence"] = np.max(
-    np.sum(~np.isnan(current_ratings_masked[algo_i]), axis=0))
-  row["Avg. #Ratings per Sentence"] = np.mean(
-    np.sum(~np.isnan(current_ratings_masked[algo_i]), axis=0))
-  row["#Sentences"] = current_ratings_masked.shape[0]
-  row["#Workers"] = np.sum(np.any(~np.isnan(current_ratings_masked[algo_i]), axis=1))
-  row["#Workers (all)"] = current_ratings_masked.shape[1]
-  row["#Ratings"] = np.sum(~np.isnan(current_ratings_masked[algo_i]))
-  row["#Ratings (all)"] = np.sum(~np.isnan(ratings[algo_i]))
+  n_workers, n_sentences = Z.shape
+  if windices is not None:
+    Z = Z[windices]
+    rated = rated[windices]
+  sentence_counts = np.sum(rated, axis=0)
+  # only the rated sentences are considered for the statistics
+  Z_rated = Z[:, sentence_counts > 0]
+  row["MOS"] = get_mos(Z_rated)
+  row["CI95"] = get_ci95_of_group(Z_rated, n_workers, n_sentences)
+  row["CI95 (default)"] = get_ci95_default(Z_rated)
+  row["STD"] = np.nanstd(Z_rated)
+  row["Min. #Ratings per Sentence"] = np.min(sentence_counts)
+  row["Max. #Ratings per Sentence"] = np.max(sentence_counts)
+  row["Avg. #Ratings per Sentence"] = np.mean(sentence_counts)
+  row["#Sentences"] = n_algorithms
+  row["#Workers"] = np.sum(np.any(rated, axis=1))
+  row["#Workers (all)"] = n_workers
+  row["#Ratings"] = np.sum(sentence_counts)
+  row["#Ratings (all)"] = n_ratings_all
   if row["#Ratings (all)"] == 0:
     row["%"] = np.nan
   else:
     row["%"] = row["#Ratings"] / row["#Ratings (all)"] * 100
   return row
 
-def get_mos_df(data: EvaluationData, mask_names: Set[MaskName]) -> List[ODType[str, Any]]:
-  masks = data.get_masks_from_names(mask_names)
-  factory = MaskFactory(data)
-  rmask = factory.merge_masks_into_rmask(masks)
 
-  all_genders = OrderedSet(sorted({x.gender for x in data.worker_data.values()}))
-  all_age_groups = OrderedSet(sorted({x.age_group for x in data.worker_data.values()}))
-  all_workers = data.workers
+@dataclass()
+class WorkerGroups():
+  workers: np.ndarray
+  genders: OrderedSet
+  age_groups: OrderedSet
+  gender_windices: Dict[str, np.ndarray]
+  age_group_windices: Dict[str, np.ndarray]
+  gender_age_group_windices: Dict[Tuple[str, str], np.ndarray]
 
-  gender_masks = {
-    gender: factory.convert_mask_to_rmask(factory.get_wmask_by_gender(gender))
-    for gender in all_genders
+
+def get_worker_groups(data: EvaluationData) -> WorkerGroups:
+  # the categories are sorted
+  all_genders = OrderedSet(data.genders.tolist())
+  all_age_groups = OrderedSet(data.age_groups.tolist())
+
+  # worker indices of each group
+  gender_windices = {
+    gender: np.flatnonzero(data.worker_gender_codes == code)
+    for code, gender in enumerate(all_genders)
   }
 
-  age_group_masks = {
-    age_group: factory.convert_mask_to_rmask(factory.get_wmask_by_age_group(age_group))
-    for age_group in all_age_groups
+  age_group_windices = {
+    age_group: np.flatnonzero(data.worker_age_group_codes == code)
+    for code, age_group in enumerate(all_age_groups)
   }
 
-  worker_masks = {
-    worker_id: factory.convert_mask_to_rmask(factory.get_wmask_by_worker_id(worker_id))
-    for worker_id in all_workers
+  gender_age_group_windices = {
+    (gender, age_group): np.intersect1d(gender_windices[gender], age_group_windices[age_group])
+    for gender in all_genders
+    for age_group in all_age_groups
   }
 
+  return WorkerGroups(data.workers, all_genders, all_age_groups, gender_windices, age_group_windices, gender_age_group_windices)
+
+
+def get_algorithm_rows(row_template: ODType, Z: np.ndarray, n_ratings_all: int, n_algorithms: int, groups: WorkerGroups) -> List[ODType[str, Any]]:
   rows = []
-  for rating_name in data.rating_names:
-    row_template = OrderedDict()
-    row_template["Rating"] = rating_name
-    current_ratings = get_ratings(data, {rating_name})
-    current_ratings_masked = current_ratings.copy()
-    rmask.apply_by_nan(current_ratings_masked)
-
-    for algo_i, alg_name in enumerate(data.algorithms):
-      row_template["Algorithm"] = alg_name
-
-      for gender in all_genders:
-        row_template["Gender"] = gender
-        gender_mask = gender_masks[gender]
-        for age_group in all_age_groups:
-          row_template["AgeGroup"] = age_group
-          age_group_mask = age_group_masks[age_group]
-          for worker_id, worker_info in data.worker_data.items():
-            if worker_info.age_group != age_group:
-              continue
-            if worker_info.gender != gender:
-              continue
-            row_template["WorkerId"] = worker_id
-            worker_mask = worker_masks[worker_id]
-            rows.append(get_row(row_template, current_ratings,
-                        current_ratings_masked, algo_i, [worker_mask]))
-          # All workers row
-          row_template["WorkerId"] = ALL_CELL_CONTENT
-          rows.append(get_row(row_template, current_ratings,
-                      current_ratings_masked, algo_i, [gender_mask, age_group_mask]))
-        row_template["AgeGroup"] = ALL_CELL_CONTENT
-        rows.append(get_row(row_template, current_ratings,
-                    current_ratings_masked, algo_i, [gender_mask]))
-      row_template["Gender"] = ALL_CELL_CONTENT
-      rows.append(get_row(row_template, current_ratings,
-                  current_ratings_masked, algo_i, []))
-
-      for age_group in all_age_groups:
-        row_template["AgeGroup"] = age_group
-        age_group_mask = age_group_masks[age_group]
-        rows.append(get_row(row_template, current_ratings,
-                    current_ratings_masked, algo_i, [age_group_mask]))
+  row_template = row_template.copy()
+  rated = ~np.isnan(Z)
+
+  for gender in groups.genders:
+    row_template["Gender"] = gender
+    for age_group in groups.age_groups:
+      row_template["AgeGroup"] = age_group
+      windices = groups.gender_age_group_windices[(gender, age_group)]
+      for i, w_i in enumerate(windices):
+        row_template["WorkerId"] = groups.workers[w_i]
+        rows.append(get_row(row_template, Z, rated, n_ratings_all, n_algorithms, windices[i:i + 1]))
+      # All workers row
+      row_template["WorkerId"] = ALL_CELL_CONTENT
+      rows.append(get_row(row_template, Z, rated, n_ratings_all, n_algorithms, windices))
+    row_template["AgeGroup"] = ALL_CELL_CONTENT
+    rows.append(get_row(row_template, Z, rated, n_ratings_all,
+                n_algorithms, groups.gender_windices[gender]))
+  row_template["Gender"] = ALL_CELL_CONTENT
+  rows.append(get_row(row_template, Z, rated, n_ratings_all, n_algorithms, None))
+
+  for age_group in groups.age_groups:
+    row_template["AgeGroup"] = age_group
+    rows.append(get_row(row_template, Z, rated, n_ratings_all,
+                n_algorithms, groups.age_group_windices[age_group]))
+  return rows
+
+
+# state of a pool process, it is set once per process by __init_pool_process
+__pool_state: Dict[str, Any] = {}
+
+
+def __init_pool_process(ratings_path: Path, n_ratings_all: np.ndarray, n_algorithms: int, groups: WorkerGroups) -> None:
+  # the masked ratings are memory-mapped and therefore shared between all processes
+  __pool_state["ratings"] = load_array(ratings_path)
+  __pool_state["n_ratings_all"] = n_ratings_all
+  __pool_state["n_algorithms"] = n_algorithms
+  __pool_state["groups"] = groups
+
+
+def __get_algorithm_rows_in_pool(rating_i: int, algo_i: int, row_template: ODType) -> List[ODType[str, Any]]:
+  Z = __pool_state["ratings"][rating_i, algo_i]
+  n_ratings_all = __pool_state["n_ratings_all"][rating_i, algo_i]
+  return get_algorithm_rows(row_template, Z, n_ratings_all, __pool_state["n_algorithms"], __pool_state["groups"])
+
+
+def get_masked_ratings(data: EvaluationData, rmask: MaskBase, rating_name: str) -> Tuple[np.ndarray, np.ndarray]:
+  """returns the masked ratings (algorithms, workers, files) and the count of all ratings of each algorithm"""
+  current_ratings = get_ratings_view(data, {rating_name})
+  ratings_masked = current_ratings.copy()
+  rmask.apply_by_nan(ratings_masked)
+  n_ratings_all = np.sum(~np.isnan(current_ratings), axis=(1, 2))
+  return ratings_masked, n_ratings_all
+
+
+def get_row_template(rating_name: str, alg_name: str) -> ODType[str, Any]:
+  row_template = OrderedDict()
+  row_template["Rating"] = rating_name
+  row_template["Algorithm"] = alg_name
+  return row_template
+
+
+def get_mos_df(data: EvaluationData, mask_names: Set[MaskName], n_jobs: int = 1) -> List[ODType[str, Any]]:
+  assert n_jobs >= 1
+  masks = data.get_masks_from_names(mask_names)
+  factory = MaskFactory(data)
+  rmask = factory.merge_masks_into_rmask(masks)
+  groups = get_worker_groups(data)
+
+  rows = []
+  if n_jobs == 1 or len(data.rating_names) * data.n_algorithms <= 1:
+    # only the ratings of one rating name are kept in memory at a time
+    for rating_name in data.rating_names:
+      ratings_masked, n_ratings_all = get_masked_ratings(data, rmask, rating_name)
+      for algo_i, alg_name in enumerate(data.algorithms):
+        rows.extend(get_algorithm_rows(
+          get_row_template(rating_name, alg_name), ratings_masked[algo_i], n_ratings_all[algo_i], data.n_algorithms, groups))
+  else:
+    with tempfile.TemporaryDirectory(prefix="tts-mos-test-mturk-") as tmp_dir:
+      ratings_path = Path(tmp_dir) / "ratings.npy"
+      # shape: (ratings, algorithms, workers, files); it is written to the file which the pool processes memory-map
+      ratings_masked_all = np.lib.format.open_memmap(ratings_path, mode="w+", dtype=np.float32, shape=(
+        len(data.rating_names), data.n_algorithms, data.n_workers, data.n_files))
+      n_ratings_all = np.empty((len(data.rating_names), data.n_algorithms), dtype=np.int64)
+      row_templates = []
+      for rating_i, rating_name in enumerate(data.rating_names):
+        ratings_masked_all[rating_i], n_ratings_all[rating_i] = get_masked_ratings(data, rmask, rating_name)
+        for algo_i, alg_name in enumerate(data.algorithms):
+          row_templates.append((rating_i, algo_i, get_row_template(rating_name, alg_name)))
+      ratings_masked_all.flush()
+      del ratings_masked_all
+
+      with ProcessPoolExecutor(
+          max_workers=min(n_jobs, len(row_templates)),
+          initializer=__init_pool_process,
+          initargs=(ratings_path, n_ratings_all, data.n_algorithms, groups),
+        ) as executor:
+        # map() returns the results in the order of the tasks
+        for algorithm_rows in executor.map(__get_algorithm_rows_in_pool, *zip(*row_templates)):
+          rows.extend(algorithm_rows)
+
   rows.sort(key=lambda row: (row["Gender"], row["AgeGroup"],
             row["WorkerId"], row["Rating"], row["Algorithm"]))
   return rows
 
 
+def get_assignment_details(data: EvaluationData, assignment_indices: np.ndarray) -> List[Dict[str, Any]]:
+  """
+  Returns the worker and the details of each assignment sorted by the index of the assignment. They
+  are read from the columns, i.e., the result doesn't need to be created.
+  """
+  assignment_indices = np.sort(assignment_indices)
+  worker_indices = data.assignment_workers[assignment_indices]
+  rows = zip(
+    worker_indices.tolist(),
+    assignment_indices.tolist(),
+    data.genders[data.worker_gender_codes[worker_indices]].tolist(),
+    data.age_groups[data.worker_age_group_codes[worker_indices]].tolist(),
+    data.hit_ids[data.assignment_hit_id_codes[assignment_indices]].tolist(),
+    data.devices[data.assignment_device_codes[assignment_indices]].tolist(),
+    data.states[data.assignment_state_codes[assignment_indices]].tolist(),
+    data.assignment_times[assignment_indices].astype(datetime.datetime).tolist(),
+  )
+  result = [
+    {
+      "WorkerId": data.workers[w_i],
+      "AssignmentId": data.assignments[a_i],
+      "Gender": gender,
+      "AgeGroup": age_group,
+      "HITId": hit_id,
+      "Device": device,
+      "State": state,
+      "Time": datetime.datetime.strftime(time, "%d.%m.%Y %H:%M:%S"),
+    }
+    for w_i, a_i, gender, age_group, hit_id, device, state, time in rows
+  ]
+  return result
+
+
 def generate_approve_csv(data: EvaluationData, mask_names: Set[str], reason: Optional[str], approval_cost: Optional[float], amazon_fee: Optional[float]) -> Tuple[pd.DataFrame, List[Dict]]:
   logger = get_logger()
   dlogger = get_detail_logger()
@@ -141,7 +278,6 @@ def generate_approve_csv(data: EvaluationData, mask_names: Set[str], reason: Opt
     dlogger.info("No masked workers exist.")
 
   assignment_indices = amask.unmasked_indices
-  assignments_worker_matrix = factory.get_assignments_worker_index_matrix()
 
   logger.info(f"Count of assignments that will be approved: {len(assignment_indices)}")
 
@@ -150,11 +286,10 @@ def generate_approve_csv(data: EvaluationData, mask_names: Set[str], reason: Opt
 
   results: List[Dict[str, Any]] = []
   results_dict = []
-  for assignment_index in sorted(assignment_indices):
-    assignment_id = data.assignments[assignment_index]
-    worker_index = assignments_worker_matrix[assignment_index]
-    worker_id = data.workers[worker_index]
-    hit_id = data.worker_data[worker_id].assignments[assignment_id].hit_id
+  for assignment_details in get_assignment_details(data, assignment_indices):
+    worker_id = assignment_details["WorkerId"]
+    assignment_id = assignment_details["AssignmentId"]
+    hit_id = assignment_details["HITId"]
     line = OrderedDict((
       ("WorkerId", worker_id),
       ("AssignmentId", assignment_id),
@@ -175,16 +310,7 @@ def generate_approve_csv(data: EvaluationData, mask_names: Set[str], reason: Opt
     # assignment_meta["Costs"] = approval_cost
     # assignment_meta["Fee"] = amazon_fee
     # worker_data[assignment_id] = assignment_meta
-    results_dict.append({
-      "WorkerId": worker_id,
-      "AssignmentId": assignment_id,
-      "Gender": data.worker_data[worker_id].gender,
-      "AgeGroup": data.worker_data[worker_id].age_group,
-      "HITId": data.worker_data[worker_id].assignments[assignment_id].hit_id,
-      "Device": data.worker_data[worker_id].assignments[assignment_id].device,
-      "State": data.worker_data[worker_id].assignments[assignment_id].state,
-      "Time": datetime.datetime.strftime(data.worker_data[worker_id].assignments[assignment_id].time, "%d.%m.%Y %H:%M:%S"),
-    })
+    results_dict.append(assignment_details)
 
   result = pd.DataFrame.from_records(results)
   if len(result.index) > 0:
@@ -246,17 +372,15 @@ def generate_reject_csv(data: EvaluationData, mask_names: Set[str], reject_mask_
     dlogger.info("No unmasked workers exist.")
 
   assignment_indices = amask.masked_indices
-  assignments_worker_matrix = factory.get_assignments_worker_index_matrix()
 
   logger.info(f"Count of assignments that will be rejected: {len(assignment_indices)}")
 
   results: List[Dict[str, Any]] = []
   results_dict = []
-  for assignment_index in sorted(assignment_indices):
-    assignment_id = data.assignments[assignment_index]
-    worker_index = assignments_worker_matrix[assignment_index]
-    worker_id = data.workers[worker_index]
-    hit_id = data.worker_data[worker_id].assignments[assignment_id].hit_id
+  for assignment_details in get_assignment_details(data, assignment_indices):
+    worker_id = assignment_details["WorkerId"]
+    assignment_id = assignment_details["AssignmentId"]
+    hit_id = assignment_details["HITId"]
     line = OrderedDict((
       ("WorkerId", worker_id),
       ("AssignmentId", assignment_id),
@@ -270,16 +394,7 @@ def generate_reject_csv(data: EvaluationData, mask_names: Set[str], reject_mask_
     # worker_data: List[str] = results_dict[worker_id]
     # assert assignment_id not in worker_data
     # worker_data.append(assignment_id)
-    results_dict.append({
-      "WorkerId": worker_id,
-      "AssignmentId": assignment_id,
-      "Gender": data.worker_data[worker_id].gender,
-      "AgeGroup": data.worker_data[worker_id].age_group,
-      "HITId": data.worker_data[worker_id].assignments[assignment_id].hit_id,
-      "Device": data.worker_data[worker_id].assignments[assignment_id].device,
-      "State": data.worker_data[worker_id].assignments[assignment_id].state,
-      "Time": datetime.datetime.strftime(data.worker_data[worker_id].assignments[assignment_id].time, "%d.%m.%Y %H:%M:%S"),
-    })
+    results_dict.append(assignment_details)
   result = pd.DataFrame.from_records(results)
   if len(result.index) > 0:
     result.sort_values(["WorkerId", "AssignmentId"], inplace=True)
@@ -313,17 +428,15 @@ def generate_bonus_csv(data: EvaluationData, mask_names: Set[str], bonus: float,
     dlogger.info("No masked workers exist.")
 
   assignment_indices = amask.unmasked_indices
-  assignments_worker_matrix = factory.get_assignments_worker_index_matrix()
 
   logger.info(f"Count of assignments that will be paid a bonus: {len(assignment_indices)}")
 
   results: List[Dict[str, Any]] = []
   results_dict = []
-  for assignment_index in sorted(assignment_indices):
-    assignment_id = data.assignments[assignment_index]
-    worker_index = assignments_worker_matrix[assignment_index]
-    worker_id = data.workers[worker_index]
-    hit_id = data.worker_data[worker_id].assignments[assignment_id].hit_id
+  for assignment_details in get_assignment_details(data, assignment_indices):
+    worker_id = assignment_details["WorkerId"]
+    assignment_id = assignment_details["AssignmentId"]
+    hit_id = assignment_details["HITId"]
     line = OrderedDict((
       ("WorkerId", worker_id),
       ("AssignmentId", assignment_id),
@@ -334,14 +447,7 @@ def generate_bonus_csv(data: EvaluationData, mask_names: Set[str], bonus: float,
     ))
     results.append(line)
     results_dict.append({
-      "WorkerId": worker_id,
-      "AssignmentId": assignment_id,
-      "Gender": data.worker_data[worker_id].gender,
-      "AgeGroup": data.worker_data[worker_id].age_group,
-      "HITId": data.worker_data[worker_id].assignments[assignment_id].hit_id,
-      "Device": data.worker_data[worker_id].assignments[assignment_id].device,
-      "State": data.worker_data[worker_id].assignments[assignment_id].state,
-      "Time": datetime.datetime.strftime(data.worker_data[worker_id].assignments[assignment_id].time, "%d.%m.%Y %H:%M:%S"),
+      **assignment_details,
       "BonusAmount": bonus,
       "BonusAmountWithFee": bonus + (bonus * amazon_fee_percent),
       "Reason": reason,
@@ -371,34 +477,43 @@ def generate_ground_truth_table(data: EvaluationData, mask_names: Set[str]) -> p
   masks = data.get_masks_from_names(mask_names)
   factory = MaskFactory(data)
 
-  rmask = factory.merge_masks_into_rmask(masks)
+  rmask = factory.merge_masks_into_sparse_rmask(masks)
 
   results: List[Dict[str, Any]] = []
 
-  for worker, worker_data in data.worker_data.items():
-    w_i = data.workers.get_loc(worker)
-    for assignment, assignment_data in worker_data.assignments.items():
-      for (alg_name, file_name), ass_ratings in assignment_data.ratings.items():
-        alg_i = data.algorithms.get_loc(alg_name)
-        file_i = data.files.get_loc(file_name)
-        is_masked = rmask.mask[alg_i, w_i, file_i]
-        line = OrderedDict()
-        line["WorkerId"] = worker
-        line["Algorithm"] = alg_name
-        line["File"] = file_name
-        for rating_name, rating in ass_ratings.votes.items():
-          line[f"Rating \"{rating_name}\""] = rating
-        # line["AcceptTime"] = assignment_data.time
-        # line["FinishTime"] = assignment_data.time + datetime.timedelta(seconds=assignment_data.worktime)
-        # line["Worktime"] = str(datetime.timedelta(seconds=assignment_data.worktime))
-        # line["Worktime (s)"] = assignment_data.worktime
-        line["Device"] = assignment_data.device
-        line["State"] = assignment_data.state
-        line["HITId"] = assignment_data.hit_id
-        line["AssignmentId"] = assignment
-        line["Masked?"] = is_masked
-        # line["Comments"] = assignment_data.comments
-        results.append(line)
+  assignment_devices = data.assignment_devices.tolist()
+  assignment_states = data.assignment_states.tolist()
+  assignment_hit_ids = data.assignment_hit_ids.tolist()
+  is_masked = rmask.mask[data.rating_cells]
+  rows = zip(
+    data.rating_workers.tolist(),
+    data.rating_assignments.tolist(),
+    data.rating_algorithms.tolist(),
+    data.rating_files.tolist(),
+    is_masked.tolist(),
+    data.votes.tolist(),
+  )
+
+  for w_i, a_i, alg_i, file_i, o_is_masked, votes in rows:
+    line = OrderedDict()
+    line["WorkerId"] = data.workers[w_i]
+    line["Algorithm"] = data.algorithms[alg_i]
+    line["File"] = data.files[file_i]
+    for rating_name, rating in zip(data.rating_names, votes):
+      if math.isnan(rating):
+        continue
+      line[f"Rating \"{rating_name}\""] = get_vote_value(rating)
+    # line["AcceptTime"] = assignment_data.time
+    # line["FinishTime"] = assignment_data.time + datetime.timedelta(seconds=assignment_data.worktime)
+    # line["Worktime"] = str(datetime.timedelta(seconds=assignment_data.worktime))
+    # line["Worktime (s)"] = assignment_data.worktime
+    line["Device"] = assignment_devices[a_i]
+    line["State"] = assignment_states[a_i]
+    line["HITId"] = assignment_hit_ids[a_i]
+    line["AssignmentId"] = data.assignments[a_i]
+    line["Masked?"] = o_is_masked
+    # line["Comments"] = assignment_data.comments
+    results.append(line)
 
   result = pd.DataFrame.from_records(results)
   if len(result.index) > 0:
@@ -1,20 +1,99 @@
+import os
+import shutil
+import uuid
 from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 from typing import OrderedDict as ODType
 from typing import Set, cast
 
+import numpy as np
 from ordered_set import OrderedSet
 
-from tts_mos_test_mturk.io import load_obj, save_obj
-from tts_mos_test_mturk.masking.masks import MaskBase, get_mask_name_and_reverse
-from tts_mos_test_mturk.result import Result, Worker
-from tts_mos_test_mturk.typing import MaskName
+from tts_mos_test_mturk.io import (get_tmp_path, load_array, load_json, load_obj, save_array,
+                                   save_json)
+from tts_mos_test_mturk.masking.masks import (AssignmentsMask, MaskBase, RatingsMask,
+                                              SparseRatingsMask, WorkersMask,
+                                              get_mask_name_and_reverse)
+from tts_mos_test_mturk.result import Assignment, AssignmentRatings, Result, Worker
+from tts_mos_test_mturk.typing import MaskName, RatingName
+
+PROJECT_FORMAT = "tts-mos-test-mturk-project"
+# 1: masks as bool arrays, 2: masks as packed bits, 3: categorical columns as codes,
+# 4: columns directory is referenced by the header
+PROJECT_FORMAT_VERSION = 4
+HEADER_FILE_NAME = "header.json"
+# directory of the columns up to format version 3; later a new "columns-<uuid>" on each change
+COLUMNS_DIR_NAME = "columns"
+MASKS_DIR_NAME = "masks"
+
+# columns which are saved as .npy-files
+COLUMNS = (
+  "rating_workers",
+  "rating_assignments",
+  "rating_algorithms",
+  "rating_files",
+  "votes",
+  "rated_cells",
+  "rating_cells",
+  "rated_cell_assignments",
+  "rated_cell_workers",
+  "assignment_workers",
+  "assignment_times",
+  "assignment_device_codes",
+  "assignment_state_codes",
+  "assignment_hit_id_codes",
+  "worker_age_group_codes",
+  "worker_gender_codes",
+  "devices",
+  "states",
+  "hit_ids",
+  "age_groups",
+  "genders",
+)
+
+# string column -> (codes, sorted categories); the values of the column are categories[codes]
+CATEGORICAL_COLUMNS = {
+  "assignment_devices": ("assignment_device_codes", "devices"),
+  "assignment_states": ("assignment_state_codes", "states"),
+  "assignment_hit_ids": ("assignment_hit_id_codes", "hit_ids"),
+  "worker_age_groups": ("worker_age_group_codes", "age_groups"),
+  "worker_genders": ("worker_gender_codes", "genders"),
+}
+CODES_AND_CATEGORIES_COLUMNS = {
+  column
+  for columns in CATEGORICAL_COLUMNS.values()
+  for column in columns
+}
+
+MASK_TYPES = {
+  mask_type.__name__: mask_type
+  for mask_type in (RatingsMask, AssignmentsMask, WorkersMask)
+}
+
+# header entry of a saved mask, the mask and its version when it was saved
+SavedMask = Tuple[Dict[str, Any], MaskBase, int]
+
+
+def get_code_dtype(n_categories: int) -> np.dtype:
+  for dtype in (np.uint8, np.uint16):
+    if n_categories <= np.iinfo(dtype).max + 1:
+      return np.dtype(dtype)
+  return np.dtype(np.uint32)
+
+
+def get_mask_type_name(mask: MaskBase) -> str:
+  for name, mask_type in MASK_TYPES.items():
+    if isinstance(mask, mask_type):
+      return name
+  raise ValueError(f"Mask type \"{type(mask).__name__}\" can't be saved!")
 
 
 class EvaluationData():
   def __init__(self, result: Result):
-    self.__result = result
+    self.__result: Optional[Result] = result
+    self.__algorithms = result.algorithms
+    self.__files = result.files
     self.workers = OrderedSet(result.workers.keys())
     self.assignments = OrderedSet(
       assignment
@@ -35,35 +114,468 @@ class EvaluationData():
       for rating_name in rating_data.votes.keys()
     )
 
+    self.__init_columns()
+
     self.masks: ODType[str, MaskBase] = OrderedDict()
     self.file_path: Optional[Path] = None
+    self.__init_caches()
+    self.__init_saved_state(None, None, {})
+
+  @classmethod
+  def from_columns(cls, algorithms: OrderedSet[str], files: OrderedSet[str],
+                   workers: OrderedSet[str], assignments: OrderedSet[str],
+                   rating_names: OrderedSet[RatingName], columns: Dict[str, np.ndarray]):
+    """
+    creates the project from the columns of the ratings, assignments and workers (without the
+    columns of the rated cells), i.e., without creating a Result; the categorical columns are given
+    as strings
+    """
+    result = cls.__new__(cls)
+    result.__init_from_columns(algorithms, files, workers, assignments, rating_names, columns)
+    return result
+
+  def __init_from_columns(self, algorithms: OrderedSet[str], files: OrderedSet[str],
+                          workers: OrderedSet[str], assignments: OrderedSet[str],
+                          rating_names: OrderedSet[RatingName],
+                          columns: Dict[str, np.ndarray]) -> None:
+    self.__result = None
+    self.__algorithms = algorithms
+    self.__files = files
+    self.workers = workers
+    self.assignments = assignments
+    self.rating_names = rating_names
+    self.n_ratings = len(columns["rating_workers"])
+    for column, values in columns.items():
+      if column in CATEGORICAL_COLUMNS:
+        self.__set_categorical_column(column, values)
+      else:
+        assert column in COLUMNS
+        setattr(self, column, values)
+    self.__init_rated_cells()
+
+    self.masks = OrderedDict()
+    self.file_path = None
+    self.__init_caches()
+    self.__init_saved_state(None, None, {})
+
+  def __init_caches(self) -> None:
+    # read-only rating tensors for each set of rating names, see get_ratings()
+    self.ratings_cache: Dict[FrozenSet[RatingName], np.ndarray] = {}
+    # merged masks for each level and set of mask names, see MaskFactory
+    self.merged_masks_cache: Dict[Tuple[str, FrozenSet[MaskName]],
+                                  Tuple[List[MaskBase], FrozenSet[Tuple[int, int]], MaskBase]] = {}
+
+  def __init_saved_state(self, path: Optional[Path], columns_dir_name: Optional[str],
+                         saved_masks: Dict[MaskName, SavedMask]) -> None:
+    # directory to which the project was saved
+    self.__saved_path = path
+    # directory of the columns in that directory
+    self.__saved_columns_dir_name = columns_dir_name
+    # header entry of each mask in that directory; a mask is unchanged if it is the same object with
+    # the same version
+    self.__saved_masks = saved_masks
+
+  def __getstate__(self) -> Dict[str, Any]:
+    state = self.__dict__.copy()
+    del state["ratings_cache"]
+    del state["merged_masks_cache"]
+    del state["_EvaluationData__saved_path"]
+    del state["_EvaluationData__saved_columns_dir_name"]
+    del state["_EvaluationData__saved_masks"]
+    return state
+
+  def __setstate__(self, state: Dict[str, Any]) -> None:
+    string_columns = {
+      column: state.pop(column)
+      for column in CATEGORICAL_COLUMNS
+      if column in state
+    }
+    self.__dict__.update(state)
+    if "assignment_device_codes" not in state:
+      # project was created with an older version
+      if len(string_columns) == len(CATEGORICAL_COLUMNS):
+        for column, values in string_columns.items():
+          self.__set_categorical_column(column, values)
+      else:
+        self.__algorithms = self.__result.algorithms
+        self.__files = self.__result.files
+        self.__init_columns()
+    # the result is recreated compactly from the columns on demand
+    self.__result = None
+    # unpickled datetime64 arrays have (empty) dtype metadata which can't be saved to .npy
+    self.assignment_times = self.assignment_times.view("datetime64[s]")
+    self.__init_caches()
+    self.__init_saved_state(None, None, {})
+
+  def __init_columns(self) -> None:
+    # long-format table, i.e., one row per rating
+    self.rating_workers = np.empty(self.n_ratings, dtype=np.int32)
+    self.rating_assignments = np.empty(self.n_ratings, dtype=np.int32)
+    self.rating_algorithms = np.empty(self.n_ratings, dtype=np.int32)
+    self.rating_files = np.empty(self.n_ratings, dtype=np.int32)
+    # one column per rating name; NaN if the vote is missing
+    self.votes = np.full(
+      (self.n_ratings, len(self.rating_names)),
+      fill_value=np.nan,
+      dtype=np.float32,
+    )
+    self.assignment_workers = np.empty(self.n_assignments, dtype=np.int32)
+    self.assignment_times = np.empty(self.n_assignments, dtype="datetime64[s]")
+    devices = []
+    states = []
+    hit_ids = []
+
+    r_i = 0
+    a_i = 0
+    for w_i, worker_data in enumerate(self.worker_data.values()):
+      for assignment_data in worker_data.assignments.values():
+        self.assignment_workers[a_i] = w_i
+        self.assignment_times[a_i] = assignment_data.time
+        devices.append(assignment_data.device)
+        states.append(assignment_data.state)
+        hit_ids.append(assignment_data.hit_id)
+        for (alg_name, file_name), rating_data in assignment_data.ratings.items():
+          self.rating_workers[r_i] = w_i
+          self.rating_assignments[r_i] = a_i
+          self.rating_algorithms[r_i] = self.algorithms.get_loc(alg_name)
+          self.rating_files[r_i] = self.files.get_loc(file_name)
+          for rating_name, vote in rating_data.votes.items():
+            self.votes[r_i, self.rating_names.get_loc(rating_name)] = vote
+          r_i += 1
+        a_i += 1
+
+    self.__set_categorical_column("assignment_devices", np.array(devices, dtype=str))
+    self.__set_categorical_column("assignment_states", np.array(states, dtype=str))
+    self.__set_categorical_column("assignment_hit_ids", np.array(hit_ids, dtype=str))
+    self.__set_categorical_column("worker_age_groups", np.array(
+      [worker_data.age_group for worker_data in self.worker_data.values()], dtype=str))
+    self.__set_categorical_column("worker_genders", np.array(
+      [worker_data.gender for worker_data in self.worker_data.values()], dtype=str))
+    self.__init_rated_cells()
+
+  def __set_categorical_column(self, column: str, values: np.ndarray) -> None:
+    codes_column, categories_column = CATEGORICAL_COLUMNS[column]
+    categories, codes = np.unique(values, return_inverse=True)
+    setattr(self, categories_column, categories)
+    setattr(self, codes_column, codes.reshape(-1).astype(get_code_dtype(len(categories))))
+
+  def __init_rated_cells(self) -> None:
+    # flat (algorithm, worker, file) index of each rated cell and the cell of each rating
+    rating_cells = np.ravel_multi_index(
+      (self.rating_algorithms, self.rating_workers, self.rating_files),
+      (self.n_algorithms, self.n_workers, self.n_files),
+    )
+    self.rated_cells, rating_cell_codes = np.unique(rating_cells, return_inverse=True)
+    self.rating_cells = rating_cell_codes.astype(np.int32)
+
+    # parent indices of each rated cell; if a cell was rated in multiple assignments the last one is
+    # taken
+    self.rated_cell_assignments = np.empty(len(self.rated_cells), dtype=np.int32)
+    self.rated_cell_assignments[self.rating_cells] = self.rating_assignments
+    self.rated_cell_workers = self.assignment_workers[self.rated_cell_assignments]
+
+  def __create_result(self) -> Result:
+    workers: ODType[str, Worker] = OrderedDict(
+      (worker, Worker(age_group, gender))
+      for worker, age_group, gender in zip(
+        self.workers, self.worker_age_groups.tolist(), self.worker_genders.tolist())
+    )
+
+    # the ratings of each assignment are a slice of the (sorted) rating columns
+    rating_assignments = np.asarray(self.rating_assignments)
+    rating_algorithms = np.asarray(self.rating_algorithms)
+    rating_files = np.asarray(self.rating_files)
+    votes = np.asarray(self.votes)
+    if np.any(rating_assignments[1:] < rating_assignments[:-1]):
+      order = np.argsort(rating_assignments, kind="stable")
+      rating_algorithms = rating_algorithms[order]
+      rating_files = rating_files[order]
+      votes = votes[order]
+    rating_ends = np.cumsum(np.bincount(rating_assignments, minlength=self.n_assignments)).tolist()
+
+    rows = zip(
+      self.assignments,
+      self.assignment_workers.tolist(),
+      self.assignment_devices.tolist(),
+      self.assignment_states.tolist(),
+      self.assignment_hit_ids.tolist(),
+      self.assignment_times.tolist(),
+      [0] + rating_ends[:-1],
+      rating_ends,
+    )
+    for assignment, w_i, device, state, hit_id, time, start, end in rows:
+      ratings = AssignmentRatings(
+        self.algorithms, self.files, self.rating_names,
+        rating_algorithms[start:end], rating_files[start:end], votes[start:end],
+      )
+      workers[self.workers[w_i]].assignments[assignment] = Assignment(
+        device, state, hit_id, time, ratings)
+
+    result = Result(self.algorithms, self.files, workers)
+    return result
 
   @property
   def algorithms(self) -> OrderedSet[str]:
-    return self.__result.algorithms
+    return self.__algorithms
 
   @property
   def files(self) -> OrderedSet[str]:
-    return self.__result.files
+    return self.__files
+
+  @property
+  def assignment_devices(self) -> np.ndarray:
+    return self.devices[self.assignment_device_codes]
+
+  @property
+  def assignment_states(self) -> np.ndarray:
+    return self.states[self.assignment_state_codes]
+
+  @property
+  def assignment_hit_ids(self) -> np.ndarray:
+    return self.hit_ids[self.assignment_hit_id_codes]
+
+  @property
+  def worker_age_groups(self) -> np.ndarray:
+    return self.age_groups[self.worker_age_group_codes]
+
+  @property
+  def worker_genders(self) -> np.ndarray:
+    return self.genders[self.worker_gender_codes]
 
   @property
   def worker_data(self) -> ODType[str, Worker]:
+    if self.__result is None:
+      # project was loaded from the columns
+      self.__result = self.__create_result()
     return self.__result.workers
 
+  @property
+  def assignment_data(self) -> List[Assignment]:
+    result = [
+      assignment_data
+      for worker_data in self.worker_data.values()
+      for assignment_data in worker_data.assignments.values()
+    ]
+    return result
+
   @classmethod
   def load(cls, path: Path):
-    result = cast(EvaluationData, load_obj(path))
+    if path.is_file():
+      # project was pickled by an older version
+      result = cast(EvaluationData, load_obj(path))
+    else:
+      result = cls.__new__(cls)
+      result.__load_from_dir(path)
     result.file_path = path
     return result
 
+  def __load_from_dir(self, path: Path) -> None:
+    header = load_json(path / HEADER_FILE_NAME)
+    if header.get("format") != PROJECT_FORMAT:
+      raise ValueError("Invalid project format!")
+    if header["version"] > PROJECT_FORMAT_VERSION:
+      raise ValueError(
+        f"Project format version {header['version']} is not supported "
+        f"(max. {PROJECT_FORMAT_VERSION}), please update tts-mos-test-mturk!")
+
+    self.__result = None
+    self.__algorithms = OrderedSet(header["algorithms"])
+    self.__files = OrderedSet(header["files"])
+    self.rating_names = OrderedSet(header["rating_names"])
+    self.n_ratings = header["n_ratings"]
+
+    columns_dir_name = header.get("columns", COLUMNS_DIR_NAME)
+    columns_dir = path / columns_dir_name
+    self.workers = OrderedSet(load_array(columns_dir / "workers.npy").tolist())
+    self.assignments = OrderedSet(load_array(columns_dir / "assignments.npy").tolist())
+    has_codes = header["version"] >= 3
+    for column in COLUMNS:
+      if has_codes or column not in CODES_AND_CATEGORIES_COLUMNS:
+        setattr(self, column, load_array(columns_dir / f"{column}.npy"))
+    if not has_codes:
+      for column in CATEGORICAL_COLUMNS:
+        self.__set_categorical_column(column, load_array(columns_dir / f"{column}.npy"))
+
+    self.masks = OrderedDict()
+    saved_masks = {}
+    for mask_entry in header["masks"]:
+      mask_type = MASK_TYPES[mask_entry["type"]]
+      if "shape" in mask_entry:
+        packed = load_array(path / mask_entry["path"])
+        mask = mask_type.from_packed(packed, mask_entry["shape"])
+        saved_entry = {key: value for key, value in mask_entry.items() if key != "name"}
+        saved_masks[mask_entry["name"]] = (saved_entry, mask, mask.version)
+      else:
+        # format version 1; copy-on-write because masks can be changed in-place
+        mask = mask_type(load_array(path / mask_entry["path"], mmap_mode="c"))
+      self.masks[mask_entry["name"]] = mask
+    self.__init_caches()
+    if has_codes:
+      self.__init_saved_state(path.absolute(), columns_dir_name, saved_masks)
+    else:
+      # the columns need to be written in the current format
+      self.__init_saved_state(None, None, {})
+
   def save_to(self, path: Path) -> None:
-    save_obj(self, path)
+    if path.is_file():
+      # replace project which was pickled by an older version
+      tmp_path = get_tmp_path(path)
+      columns_dir_name, saved_masks = self.__save_to_dir(tmp_path)
+      # the pickled project is kept until the directory is in place
+      backup_path = path.parent / f"{path.name}.bak"
+      os.replace(path, backup_path)
+      os.replace(tmp_path, path)
+      backup_path.unlink()
+    else:
+      columns_dir_name, saved_masks = self.__save_to_dir(path)
+    self.__init_saved_state(path.absolute(), columns_dir_name, saved_masks)
+
+  def __save_to_dir(self, path: Path) -> Tuple[str, Dict[MaskName, SavedMask]]:
+    """
+    writes only the masks which were changed since the last save (and the columns if they weren't
+    saved in the directory)
+    """
+    is_saved_path = self.__saved_path == path.absolute() and (path / HEADER_FILE_NAME).is_file()
+    masks_dir = path / MASKS_DIR_NAME
+
+    if is_saved_path:
+      columns_dir_name = cast(str, self.__saved_columns_dir_name)
+    else:
+      # a new directory for each change, i.e., the current header stays valid until the new one is
+      # written
+      columns_dir_name = f"{COLUMNS_DIR_NAME}-{uuid.uuid4().hex}"
+      columns_dir = path / columns_dir_name
+      columns_dir.mkdir(parents=True)
+      save_array(np.array(list(self.workers), dtype=str), columns_dir / "workers.npy")
+      save_array(np.array(list(self.assignments), dtype=str), columns_dir / "assignments.npy")
+      for column in COLUMNS:
+        save_array(getattr(self, column), columns_dir / f"{column}.npy")
+
+    masks_dir.mkdir(parents=True, exist_ok=True)
+    mask_entries = []
+    saved_masks = {}
+    for mask_name, mask in self.masks.items():
+      saved_mask = self.__saved_masks.get(mask_name) if is_saved_path else None
+      if saved_mask is not None and saved_mask[1] is mask and saved_mask[2] == mask.version:
+        mask_entry = saved_mask[0]
+      else:
+        dense_mask = mask.to_dense() if isinstance(mask, SparseRatingsMask) else mask
+        # a new file for each change, i.e., the current header stays valid until the new one is
+        # written
+        mask_path = f"{MASKS_DIR_NAME}/{uuid.uuid4().hex}.npy"
+        save_array(dense_mask.packed, path / mask_path)
+        mask_entry = {
+          "type": get_mask_type_name(dense_mask),
+          "path": mask_path,
+          "shape": list(dense_mask.mask_shape),
+        }
+      mask_entries.append({"name": mask_name, **mask_entry})
+      saved_masks[mask_name] = (mask_entry, mask, mask.version)
+
+    # the header is written last, i.e., it references only existing files
+    header = {
+      "format": PROJECT_FORMAT,
+      "version": PROJECT_FORMAT_VERSION,
+      "algorithms": list(self.algorithms),
+      "files": list(self.files),
+      "rating_names": list(self.rating_names),
+      "n_ratings": self.n_ratings,
+      "columns": columns_dir_name,
+      "masks": mask_entries,
+    }
+    save_json(header, path / HEADER_FILE_NAME)
+
+    for columns_dir in path.glob(f"{COLUMNS_DIR_NAME}*"):
+      if columns_dir.name != columns_dir_name:
+        # columns of an older save; e.g., files which are still memory-mapped on Windows are removed
+        # on the next save
+        shutil.rmtree(columns_dir, ignore_errors=True)
+
+    used_mask_paths = {path / mask_entry["path"] for mask_entry in mask_entries}
+    for mask_path in masks_dir.glob("*.npy"):
+      if mask_path not in used_mask_paths:
+        try:
+          mask_path.unlink()
+        except OSError:
+          # e.g., the file is still memory-mapped on Windows; it will be removed on the next save
+          pass
+    return columns_dir_name, saved_masks
 
   def save(self) -> None:
     if self.file_path is None:
       raise ValueError("Project needs to be loaded from file before!")
     self.save_to(self.file_path)
 
+  def append(self, batch: "EvaluationData") -> None:
+    """
+    Appends the workers, assignments and ratings of another batch. New algorithms, files, workers
+    and rating names are added after the existing ones, i.e., the codes of the existing entries
+    don't change. The masks are grown with unmasked entries. The age group and gender of existing
+    workers are kept.
+    """
+    duplicate_assignments = [
+      assignment for assignment in batch.assignments if assignment in self.assignments
+    ]
+    if len(duplicate_assignments) > 0:
+      raise ValueError(
+        f"Assignment \"{duplicate_assignments[0]}\" exist already! "
+        f"Count of existing assignments: {len(duplicate_assignments)}")
+
+    algorithms = OrderedSet(self.algorithms) | batch.algorithms
+    files = OrderedSet(self.files) | batch.files
+    workers = OrderedSet(self.workers) | batch.workers
+    rating_names = OrderedSet(self.rating_names) | batch.rating_names
+    new_workers = np.array([worker not in self.workers for worker in batch.workers], dtype=bool)
+
+    # codes of the batch in the merged code tables
+    algorithm_codes = np.array([algorithms.get_loc(x) for x in batch.algorithms], dtype=np.int32)
+    file_codes = np.array([files.get_loc(x) for x in batch.files], dtype=np.int32)
+    worker_codes = np.array([workers.get_loc(x) for x in batch.workers], dtype=np.int32)
+    rating_name_codes = [rating_names.get_loc(x) for x in batch.rating_names]
+
+    votes = np.full((self.n_ratings + batch.n_ratings, len(rating_names)),
+                    fill_value=np.nan, dtype=np.float32)
+    votes[:self.n_ratings, :len(self.rating_names)] = self.votes
+    votes[self.n_ratings:, rating_name_codes] = batch.votes
+
+    columns = {
+      "rating_workers": np.concatenate(
+        (self.rating_workers, worker_codes[batch.rating_workers])),
+      "rating_assignments": np.concatenate(
+        (self.rating_assignments, batch.rating_assignments + self.n_assignments)).astype(np.int32),
+      "rating_algorithms": np.concatenate(
+        (self.rating_algorithms, algorithm_codes[batch.rating_algorithms])),
+      "rating_files": np.concatenate(
+        (self.rating_files, file_codes[batch.rating_files])),
+      "votes": votes,
+      "assignment_workers": np.concatenate(
+        (self.assignment_workers, worker_codes[batch.assignment_workers])),
+      "assignment_times": np.concatenate((self.assignment_times, batch.assignment_times)),
+      "assignment_devices": np.concatenate((self.assignment_devices, batch.assignment_devices)),
+      "assignment_states": np.concatenate((self.assignment_states, batch.assignment_states)),
+      "assignment_hit_ids": np.concatenate((self.assignment_hit_ids, batch.assignment_hit_ids)),
+      "worker_age_groups": np.concatenate(
+        (self.worker_age_groups, batch.worker_age_groups[new_workers])),
+      "worker_genders": np.concatenate(
+        (self.worker_genders, batch.worker_genders[new_workers])),
+    }
+    assignments = OrderedSet(self.assignments) | batch.assignments
+
+    masks = OrderedDict(self.masks)
+    file_path = self.file_path
+    self.__init_from_columns(algorithms, files, workers, assignments, rating_names, columns)
+    self.file_path = file_path
+
+    for mask_name, mask in masks.items():
+      if isinstance(mask, RatingsMask):
+        shape = (self.n_algorithms, self.n_workers, self.n_files)
+      elif isinstance(mask, AssignmentsMask):
+        shape = (self.n_assignments,)
+      else:
+        assert isinstance(mask, WorkersMask)
+        shape = (self.n_workers,)
+      self.masks[mask_name] = mask.grow(shape)
+
   @property
   def n_assignments(self) -> int:
     return len(self.assignments)
@@ -106,4 +618,15 @@ class EvaluationData():
 
   def add_or_update_mask(self, name: MaskName, mask: MaskBase) -> None:
     assert name is not None
+    if name in self.masks:
+      self.__remove_merged_masks(self.masks[name])
     self.masks[name] = mask
+
+  def __remove_merged_masks(self, mask: MaskBase) -> None:
+    keys = [
+      key
+      for key, (masks, _, _) in self.merged_masks_cache.items()
+      if any(m is mask for m in masks)
+    ]
+    for key in keys:
+      del self.merged_masks_cache[key]
@@ -1,6 +1,10 @@
+import json
+import os
 import pickle
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 
 def save_obj(obj: Any, path: Path) -> None:
@@ -15,3 +19,31 @@ def load_obj(path: Path) -> Any:
   # assert path.is_file()
   with open(path, mode="rb") as file:
     return pickle.load(file)
+
+
+def get_tmp_path(path: Path) -> Path:
+  return path.parent / f".{path.name}.tmp"
+
+
+def save_array(array: np.ndarray, path: Path) -> None:
+  # write to a temporary file first because the existing file could be memory-mapped
+  tmp_path = get_tmp_path(path)
+  with open(tmp_path, mode="wb") as file:
+    np.save(file, array, allow_pickle=False)
+  os.replace(tmp_path, path)
+
+
+def load_array(path: Path, mmap_mode: Optional[str] = "r") -> np.ndarray:
+  return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+
+
+def save_json(data: Dict, path: Path) -> None:
+  tmp_path = get_tmp_path(path)
+  with open(tmp_path, mode="w", encoding="utf8") as file:
+    json.dump(data, file, indent=2)
+  os.replace(tmp_path, path)
+
+
+def load_json(path: Path) -> Dict:
+  with open(path, mode="r", encoding="utf8") as file:
+    return json.load(file)
@@ -0,0 +1,126 @@
+import json
+from typing import Any, Generator, TextIO, Tuple
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+WHITESPACE = " \t\n\r"
+# errors of json.JSONDecoder which can also be caused by a value which was only partially read
+INCOMPLETE_VALUE_ERROR_OFFSET = 6
+
+
+class JsonStreamReader():
+  """
+  Reads a JSON document incrementally, i.e., objects can be iterated key by key and only the values which are read at once are kept in memory.
+  """
+
+  def __init__(self, file: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    assert chunk_size > 0
+    self.__file = file
+    self.__chunk_size = chunk_size
+    self.__decoder = json.JSONDecoder()
+    self.__buffer = ""
+    self.__pos = 0
+    self.__eof = False
+    # line and start of the line (relative to the buffer) of the current position
+    self.__line = 1
+    self.__line_start = 0
+    self.__counted_pos = 0
+
+  @property
+  def location(self) -> Tuple[int, int]:
+    """line and column of the current position (both starting at 1)"""
+    self.__count_lines()
+    return self.__line, self.__pos - self.__line_start + 1
+
+  def __count_lines(self) -> None:
+    n_lines = self.__buffer.count("\n", self.__counted_pos, self.__pos)
+    if n_lines > 0:
+      self.__line += n_lines
+      self.__line_start = self.__buffer.rindex("\n", self.__counted_pos, self.__pos) + 1
+    self.__counted_pos = self.__pos
+
+  def __read_chunk(self) -> bool:
+    if self.__eof:
+      return False
+    chunk = self.__file.read(self.__chunk_size)
+    if chunk == "":
+      self.__eof = True
+      return False
+    # drop the already consumed part of the buffer
+    self.__count_lines()
+    self.__buffer = self.__buffer[self.__pos:] + chunk
+    self.__line_start -= self.__pos
+    self.__pos = 0
+    self.__counted_pos = 0
+    return True
+
+  def __raise_error(self, msg: str) -> None:
+    line, column = self.location
+    raise ValueError(f"{msg} (line {line}, column {column})")
+
+  def __skip_whitespace(self) -> None:
+    while True:
+      while self.__pos < len(self.__buffer) and self.__buffer[self.__pos] in WHITESPACE:
+        self.__pos += 1
+      if self.__pos < len(self.__buffer) or not self.__read_chunk():
+        return
+
+  def __peek(self) -> str:
+    self.__skip_whitespace()
+    if self.__pos == len(self.__buffer):
+      self.__raise_error("Unexpected end of JSON")
+    return self.__buffer[self.__pos]
+
+  def __expect(self, char: str) -> None:
+    if self.__peek() != char:
+      self.__raise_error(f"Expecting '{char}'")
+    self.__pos += 1
+
+  def read_value(self) -> Any:
+    self.__skip_whitespace()
+    while True:
+      try:
+        value, end = self.__decoder.raw_decode(self.__buffer, self.__pos)
+      except json.JSONDecodeError as error:
+        is_incomplete = error.pos >= len(self.__buffer) - INCOMPLETE_VALUE_ERROR_OFFSET \
+          or error.msg.startswith("Unterminated string")
+        if is_incomplete and self.__read_chunk():
+          continue
+        self.__pos = min(error.pos, len(self.__buffer))
+        self.__raise_error(error.msg)
+      # a number at the end of the buffer could continue in the next chunk
+      is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+      if is_number and end >= len(self.__buffer) - INCOMPLETE_VALUE_ERROR_OFFSET and self.__read_chunk():
+        continue
+      self.__pos = end
+      return value
+
+  def skip_value(self) -> None:
+    if self.__peek() == "{":
+      for _ in self.iter_object():
+        self.skip_value()
+    else:
+      self.read_value()
+
+  def iter_object(self) -> Generator[str, None, None]:
+    """
+    yields the keys of an object; the value of each key needs to be read (or skipped) before the next key is requested
+    """
+    self.__expect("{")
+    if self.__peek() == "}":
+      self.__pos += 1
+      return
+    while True:
+      if self.__peek() != "\"":
+        self.__raise_error("Expecting property name enclosed in double quotes")
+      key = self.read_value()
+      self.__expect(":")
+      yield key
+      if self.__peek() == "}":
+        self.__pos += 1
+        return
+      self.__expect(",")
+
+  def ensure_end(self) -> None:
+    self.__skip_whitespace()
+    if self.__pos < len(self.__buffer):
+      self.__raise_error("Extra data")
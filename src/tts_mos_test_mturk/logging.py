@@ -1,7 +1,9 @@
 
 from logging import Logger, getLogger
+from typing import TYPE_CHECKING
 
-import pandas as pd
+if TYPE_CHECKING:
+  import pandas as pd
 
 
 def get_logger() -> Logger:
@@ -17,7 +19,9 @@ def attach_urllib3_to_detail_logger():
   getLogger("urllib3.connectionpool").parent = dlogger
 
 
-def log_full_df_info(df: pd.DataFrame, title: str = "") -> None:
+def log_full_df_info(df: "pd.DataFrame", title: str = "") -> None:
+  # pandas is imported lazily to keep the startup of the CLI fast
+  import pandas as pd
   logger = get_detail_logger()
   with pd.option_context(
     'display.max_rows', None,
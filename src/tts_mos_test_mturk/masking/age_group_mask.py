@@ -1,19 +1,17 @@
 
 from typing import Set
 
+import numpy as np
+
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk.masking.masks import WorkersMask
 from tts_mos_test_mturk.statistics.update_stats import print_stats_masks
 
 
-def get_wmask_by_age_group(data: EvaluationData, age_groups: Set[str]):
-  factory = MaskFactory(data)
-  res_wmask = factory.get_wmask()
-  for i, worker_id in enumerate(data.workers):
-    worker_data = data.worker_data[worker_id]
-    if worker_data.age_group in age_groups:
-      res_wmask.mask[i] = True
-
+def get_wmask_by_age_group(data: EvaluationData, age_groups: Set[str]) -> WorkersMask:
+  codes = np.flatnonzero(np.isin(data.age_groups, list(age_groups)))
+  res_wmask = WorkersMask(np.isin(data.worker_age_group_codes, codes))
   return res_wmask
 
 
@@ -23,7 +21,7 @@ def mask_workers_by_age_group(data: EvaluationData, mask_names: Set[str], age_gr
 
   existing_wmask = factory.merge_masks_into_wmask(masks)
   new_wmask = get_wmask_by_age_group(data, age_groups)
-  existing_wmask.apply_by_false(new_wmask.mask)
+  new_wmask.unmask_masked(existing_wmask)
 
   data.add_or_update_mask(output_mask_name, new_wmask)
 
@@ -1,5 +1,7 @@
 from typing import Set
 
+import numpy as np
+
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
 from tts_mos_test_mturk.statistics.update_stats import print_stats_masks
@@ -12,12 +14,14 @@ def mask_assignments_by_id(data: EvaluationData, mask_names: Set[str], assignmen
   amask = factory.merge_masks_into_amask(masks)
 
   res_amask = factory.get_amask()
+  indices = []
   for i, assignment_id in enumerate(data.assignments):
     is_masked_already = amask.mask[i]
     if is_masked_already:
       continue
     if assignment_id in assignment_ids:
-      res_amask.mask[i] = True
+      indices.append(i)
+  res_amask.mask_indices(np.array(indices, dtype=np.int64))
 
   data.add_or_update_mask(output_mask_name, res_amask)
 
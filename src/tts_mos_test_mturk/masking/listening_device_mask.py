@@ -7,6 +7,7 @@ import pandas as pd
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.logging import log_full_df_info
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk.masking.masks import AssignmentsMask
 from tts_mos_test_mturk.statistics.update_stats import print_stats_masks
 
 
@@ -14,13 +15,11 @@ def mask_assignments_by_listening_device(data: EvaluationData, mask_names: Set[s
   masks = data.get_masks_from_names(mask_names)
   factory = MaskFactory(data)
 
-  lts = get_listening_devices(data)
   amask = factory.merge_masks_into_amask(masks)
-  amask.apply_by_nan(lts)
 
-  res_amask = get_listening_devices_amask(lts, listening_devices, factory)
+  res_amask = get_listening_devices_amask(data, listening_devices, amask)
 
-  stats_df = get_stats_df(lts, listening_devices)
+  stats_df = get_stats_df(data, listening_devices, amask)
   log_full_df_info(stats_df, "Statistics:")
 
   data.add_or_update_mask(output_mask_name, res_amask)
@@ -28,15 +27,17 @@ def mask_assignments_by_listening_device(data: EvaluationData, mask_names: Set[s
   print_stats_masks(data, masks, [res_amask])
 
 
-def get_stats_df(lts: np.ndarray, mask_devices: Set[str]) -> pd.DataFrame:
+def get_stats_df(data: EvaluationData, mask_devices: Set[str], amask: AssignmentsMask) -> pd.DataFrame:
   col_device = "Device"
   col_count = "# Assignments"
   col_masked = "Masked?"
 
-  listening_devices, ld_counts = np.unique(lts, return_counts=True)
+  # count of the unmasked assignments of each device
+  ld_counts = np.bincount(
+    data.assignment_device_codes[amask.unmasked_indices], minlength=len(data.devices))
   lines = []
-  for device, count in (zip(listening_devices, ld_counts)):
-    if device == "nan":
+  for device, count in zip(data.devices.tolist(), ld_counts):
+    if count == 0:
       continue
     lines.append(OrderedDict((
       (col_device, device),
@@ -55,19 +56,10 @@ def get_stats_df(lts: np.ndarray, mask_devices: Set[str]) -> pd.DataFrame:
   return result
 
 
-def get_listening_devices_amask(listening_devices: np.ndarray, mask_listening_devices: Set[str], factory: MaskFactory) -> None:
-  res_amask = factory.get_amask()
-  for device in mask_listening_devices:
-    lt_mask = listening_devices == device
-    res_amask.combine_mask_np(lt_mask)
+def get_listening_devices_amask(data: EvaluationData, mask_listening_devices: Set[str], amask: AssignmentsMask) -> AssignmentsMask:
+  """masks the assignments of the devices which are not already masked by amask"""
+  device_codes = np.flatnonzero(np.isin(data.devices, list(mask_listening_devices)))
+  res_amask_np = np.isin(data.assignment_device_codes, device_codes)
+  amask.apply_by_false(res_amask_np)
+  res_amask = AssignmentsMask(res_amask_np)
   return res_amask
-
-
-def get_listening_devices(data: EvaluationData) -> np.ndarray:
-  devices = [np.nan] * data.n_assignments
-  for worker_data in data.worker_data.values():
-    for assignment, assignment_data in worker_data.assignments.items():
-      ass_i = data.assignments.get_loc(assignment)
-      devices[ass_i] = assignment_data.device
-  devices_np = np.array(devices)
-  return devices_np
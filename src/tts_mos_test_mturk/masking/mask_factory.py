@@ -1,9 +1,12 @@
-from typing import List
+from typing import Callable, List, TypeVar
 
 import numpy as np
 
 from tts_mos_test_mturk.evaluation_data import EvaluationData
-from tts_mos_test_mturk.masking.masks import AssignmentsMask, MaskBase, RatingsMask, WorkersMask
+from tts_mos_test_mturk.masking.masks import (AssignmentsMask, MaskBase, RatingsMask,
+                                             SparseRatingsMask, WorkersMask)
+
+T = TypeVar("T", bound=MaskBase)
 
 
 class MaskFactory():
@@ -18,6 +21,15 @@ class MaskFactory():
     )
     return RatingsMask(mask)
 
+  def get_sparse_rmask(self) -> SparseRatingsMask:
+    mask = np.full(
+      len(self.__data.rated_cells),
+      fill_value=False,
+      dtype=bool,
+    )
+    shape = (self.__data.n_algorithms, self.__data.n_workers, self.__data.n_files)
+    return SparseRatingsMask(mask, self.__data.rated_cells, shape)
+
   def get_amask(self) -> AssignmentsMask:
     mask = np.full(
       self.__data.n_assignments,
@@ -35,26 +47,15 @@ class MaskFactory():
     return WorkersMask(mask)
 
   def get_wmask_by_gender(self, gender: str):
-    res_wmask = self.get_wmask()
-    for i, worker_id in enumerate(self.__data.workers):
-      worker_data = self.__data.worker_data[worker_id]
-      if worker_data.gender != gender:
-        res_wmask.mask[i] = True
+    res_wmask = WorkersMask(self.__data.worker_genders != gender)
     return res_wmask
 
   def get_wmask_by_age_group(self, age_group: str):
-    res_wmask = self.get_wmask()
-    for i, worker_id in enumerate(self.__data.workers):
-      worker_data = self.__data.worker_data[worker_id]
-      if worker_data.age_group != age_group:
-        res_wmask.mask[i] = True
+    res_wmask = WorkersMask(self.__data.worker_age_groups != age_group)
     return res_wmask
 
   def get_wmask_by_worker_id(self, worker_id: str):
-    res_wmask = self.get_wmask()
-    for i, w_id in enumerate(self.__data.workers):
-      if worker_id != w_id:
-        res_wmask.mask[i] = True
+    res_wmask = WorkersMask(np.array([w_id != worker_id for w_id in self.__data.workers], dtype=bool))
     return res_wmask
 
   def convert_ndarray_to_rmask(self, array: np.ndarray) -> RatingsMask:
@@ -86,35 +87,71 @@ class MaskFactory():
     assert isinstance(mask, RatingsMask)
     return mask
 
+  def __get_merged_mask(self, level: str, masks: List[MaskBase], merge_method: Callable[[List[MaskBase]], T]) -> T:
+    mask_names = {id(mask): mask_name for mask_name, mask in self.__data.masks.items()}
+    if any(id(mask) not in mask_names for mask in masks):
+      # e.g., the reversed masks of get_mask() are new clones on each call, therefore they would never be found again
+      return merge_method(masks)
+    # one entry for each level and set of mask names; it is replaced if one of the masks was replaced or changed
+    key = (level, frozenset(mask_names[id(mask)] for mask in masks))
+    versions = frozenset((id(mask), mask.version) for mask in masks)
+    cache = self.__data.merged_masks_cache
+    if key not in cache or cache[key][1] != versions:
+      # the masks are kept alive by the entry, i.e., their ids can't be reused
+      cache[key] = (list(masks), versions, merge_method(masks))
+    # clone because the callers can change the merged mask
+    return cache[key][2].clone()
+
   def merge_masks_into_rmask(self, masks: List[MaskBase]) -> RatingsMask:
+    return self.__get_merged_mask("ratings", masks, self.__merge_masks_into_rmask)
+
+  def __merge_masks_into_rmask(self, masks: List[MaskBase]) -> RatingsMask:
     result = self.get_rmask()
     for mask in masks:
       mask = self.convert_mask_to_rmask(mask)
       result.combine_mask(mask)
     return result
 
+  def convert_mask_to_sparse_rmask(self, mask: MaskBase) -> SparseRatingsMask:
+    result = self.get_sparse_rmask()
+    if isinstance(mask, WorkersMask):
+      result.mask = mask.unpack()[self.__data.rated_cell_workers]
+    elif isinstance(mask, AssignmentsMask):
+      result.mask = mask.unpack()[self.__data.rated_cell_assignments]
+    else:
+      assert isinstance(mask, RatingsMask)
+      result.combine_mask(mask)
+    return result
+
+  def merge_masks_into_sparse_rmask(self, masks: List[MaskBase]) -> SparseRatingsMask:
+    return self.__get_merged_mask("sparse_ratings", masks, self.__merge_masks_into_sparse_rmask)
+
+  def __merge_masks_into_sparse_rmask(self, masks: List[MaskBase]) -> SparseRatingsMask:
+    result = self.get_sparse_rmask()
+    for mask in masks:
+      mask = self.convert_mask_to_sparse_rmask(mask)
+      result.combine_mask(mask)
+    return result
+
   def get_ratings_assignments_index_matrix(self) -> np.ndarray:
+    # -1 for cells which were not rated
     res = np.full(
       (self.__data.n_algorithms, self.__data.n_workers, self.__data.n_files),
-      fill_value=np.nan,
-      dtype=np.float32,
+      fill_value=-1,
+      dtype=np.int32,
     )
 
-    for worker, worker_data in self.__data.worker_data.items():
-      worker_i = self.__data.workers.get_loc(worker)
-      for assignment, assignment_data in worker_data.assignments.items():
-        ass_i = self.__data.assignments.get_loc(assignment)
-        for (alg_name, file_name) in assignment_data.ratings.keys():
-          alg_i = self.__data.algorithms.get_loc(alg_name)
-          file_i = self.__data.files.get_loc(file_name)
-          res[alg_i, worker_i, file_i] = ass_i
+    res.flat[self.__data.rated_cells] = self.__data.rated_cell_assignments
     return res
 
   def convert_amask_to_rmask(self, amask: AssignmentsMask) -> RatingsMask:
-    ratings_assignments_index_matrix = self.get_ratings_assignments_index_matrix()
-    new_mask = np.isin(ratings_assignments_index_matrix, amask.masked_indices)
-    result = RatingsMask(new_mask)
-    return result
+    mask = np.full(
+      (self.__data.n_algorithms, self.__data.n_workers, self.__data.n_files),
+      fill_value=False,
+      dtype=bool,
+    )
+    mask.flat[self.__data.rated_cells] = amask.unpack()[self.__data.rated_cell_assignments]
+    return RatingsMask(mask)
 
   def convert_mask_to_amask(self, mask: MaskBase) -> AssignmentsMask:
     if isinstance(mask, RatingsMask):
@@ -125,6 +162,9 @@ class MaskFactory():
     return mask
 
   def merge_masks_into_amask(self, masks: List[MaskBase]) -> AssignmentsMask:
+    return self.__get_merged_mask("assignments", masks, self.__merge_masks_into_amask)
+
+  def __merge_masks_into_amask(self, masks: List[MaskBase]) -> AssignmentsMask:
     result = self.get_amask()
     for mask in masks:
       try:
@@ -135,24 +175,11 @@ class MaskFactory():
     return result
 
   def get_assignments_worker_index_matrix(self) -> np.ndarray:
-    res = np.full(
-      self.__data.n_assignments,
-      fill_value=-1,
-      dtype=np.int32,
-    )
-
-    for worker, worker_data in self.__data.worker_data.items():
-      worker_i = self.__data.workers.get_loc(worker)
-      for assignment in worker_data.assignments.keys():
-        ass_i = self.__data.assignments.get_loc(assignment)
-        res[ass_i] = worker_i
-
+    res = self.__data.assignment_workers.copy()
     return res
 
   def convert_wmask_to_amask(self, wmask: WorkersMask) -> AssignmentsMask:
-    result = self.get_amask()
-    assignments_worker_index_matrix = self.get_assignments_worker_index_matrix()
-    result.mask = np.isin(assignments_worker_index_matrix, wmask.masked_indices)
+    result = AssignmentsMask(wmask.unpack()[self.__data.assignment_workers])
     return result
 
   def convert_mask_to_wmask(self, mask: MaskBase) -> WorkersMask:
@@ -163,7 +190,10 @@ class MaskFactory():
     assert isinstance(mask, WorkersMask)
     return mask
 
-  def merge_masks_into_wmask(self, masks: List[WorkersMask]) -> WorkersMask:
+  def merge_masks_into_wmask(self, masks: List[MaskBase]) -> WorkersMask:
+    return self.__get_merged_mask("workers", masks, self.__merge_masks_into_wmask)
+
+  def __merge_masks_into_wmask(self, masks: List[MaskBase]) -> WorkersMask:
     result = self.get_wmask()
     for mask in masks:
       try:
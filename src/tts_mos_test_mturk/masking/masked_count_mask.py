@@ -23,7 +23,7 @@ def mask_ratings_by_masked_count(data: EvaluationData, mask_names: Set[str], ref
 
   # it doesn't matter which ratings are taken
   ratings = get_ratings(data, data.rating_names)
-  rmask.apply_by_false(ref_rmask.mask)
+  ref_rmask.unmask_masked(rmask)
   rmask.apply_by_nan(ratings)
 
   outlier_wmask_np = get_wmask_percent(ref_rmask.mask, from_percent_incl, to_percent_excl)
@@ -45,7 +45,7 @@ def get_stats_df(ref_rmask: RatingsMask, workers: OrderedSet[str], outlier_indic
   col_percent_all = "% of all"
   col_masked = "Masked?"
 
-  outlier_workers_count = get_workers_masked_ratings_count(ref_rmask.mask)
+  outlier_workers_count = ref_rmask.masked_counts(1)
   total_count = np.sum(outlier_workers_count)
 
   lines = []
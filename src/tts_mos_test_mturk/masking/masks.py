@@ -1,48 +1,161 @@
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 
 REVERSE_INDICATOR = "!"
 
+# count of set bits for each byte value
+BIT_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
 
 class MaskBase():
+  """
+  The mask owns its array, which is exposed read-only by `mask`, i.e., all changes go through the methods of the mask. Each change increases `version`.
+  """
+
   def __init__(self, mask: np.ndarray) -> None:
+    self.__version = 0
     self.mask = mask
 
+  @classmethod
+  def from_packed(cls, packed: np.ndarray, shape: Tuple[int, ...]) -> "MaskBase":
+    """creates the mask from its bits which were packed with np.packbits; the bits are unpacked on first access of `mask`"""
+    result = cls.__new__(cls)
+    result.__mask = None
+    result.__packed = packed
+    result.__shape = tuple(shape)
+    result.__version = 0
+    return result
+
+  def __setstate__(self, state: Dict[str, Any]) -> None:
+    mask = state.pop("mask", None)
+    self.__dict__.update(state)
+    # masks pickled by an older version have no version
+    self.__version = state.get("_MaskBase__version", 0)
+    if mask is not None:
+      # mask was pickled by an older version
+      self.mask = mask
+
+  @property
+  def mask(self) -> np.ndarray:
+    if self.__mask is None:
+      self.__mask = self.__unpack_bits()
+    result = self.__mask.view()
+    result.flags.writeable = False
+    return result
+
+  @mask.setter
+  def mask(self, mask: np.ndarray) -> None:
+    self.__mask = mask
+    self.__packed: Optional[np.ndarray] = None
+    self.__shape = mask.shape
+    self.__version += 1
+
+  def __unpack_bits(self) -> np.ndarray:
+    size = int(np.prod(self.__shape))
+    return np.unpackbits(self.__packed, count=size).reshape(self.__shape).view(bool)
+
+  def unpack(self) -> np.ndarray:
+    """returns the mask like `mask` but doesn't keep a packed mask unpacked, i.e., the mask stays small if it is only read once"""
+    if self.__mask is None:
+      result = self.__unpack_bits()
+      result.flags.writeable = False
+      return result
+    return self.mask
+
+  @property
+  def packed(self) -> np.ndarray:
+    """the bits of the mask packed with np.packbits, i.e., 8 cells per byte"""
+    if self.__packed is None:
+      self.__packed = np.packbits(self.__mask, axis=None)
+    return self.__packed
+
+  @property
+  def mask_shape(self) -> Tuple[int, ...]:
+    return self.__shape
+
+  @property
+  def is_unpacked(self) -> bool:
+    return self.__mask is not None
+
+  @property
+  def version(self) -> int:
+    """is increased on each change of the mask"""
+    return self.__version
+
   def combine_mask(self, mask: "MaskBase") -> None:
-    self.combine_mask_np(mask.mask)
+    assert mask.mask_shape == self.mask_shape
+    if self.is_unpacked:
+      self.combine_mask_np(mask.unpack())
+    else:
+      # the other mask is not unpacked for this
+      other_packed = mask.__packed if mask.__packed is not None else np.packbits(mask.__mask, axis=None)
+      self.__packed = self.__packed | other_packed
+      self.__version += 1
 
   def combine_mask_np(self, mask: np.ndarray) -> None:
-    assert mask.shape == self.mask.shape
-    self.mask = (self.mask | mask)
+    assert mask.shape == self.mask_shape
+    if self.is_unpacked:
+      self.mask = (self.__mask | mask)
+    else:
+      self.__packed = self.__packed | np.packbits(mask, axis=None)
+      self.__version += 1
 
   def mask_indices(self, indices: np.ndarray) -> None:
-    self.mask[indices] = True
+    if self.__mask is None:
+      self.__mask = self.__unpack_bits()
+    elif not self.__mask.flags.writeable:
+      # e.g., the array of another mask or a memory-mapped file
+      self.__mask = self.__mask.copy()
+    self.__mask[indices] = True
+    # the packed bits are outdated
+    self.__packed = None
+    self.__version += 1
+
+  def unmask_masked(self, mask: "MaskBase") -> None:
+    """unmasks the cells which are masked by the other mask"""
+    assert mask.mask_shape == self.mask_shape
+    self.mask = self.mask & ~mask.unpack()
 
   def apply_by_nan(self, data: np.ndarray) -> None:
-    assert data.shape == self.mask.shape
-    data[self.mask] = np.nan
+    assert data.shape == self.mask_shape
+    data[self.unpack()] = np.nan
 
   def apply_by_false(self, data: np.ndarray) -> None:
-    assert data.shape == self.mask.shape
-    data[self.mask] = False
+    assert data.shape == self.mask_shape
+    data[self.unpack()] = False
 
   def apply_by_del(self, data: np.ndarray) -> np.ndarray:
-    assert data.shape == self.mask.shape
-    data = data[~self.mask]
+    assert data.shape == self.mask_shape
+    data = data[~self.unpack()]
     return data
 
   def reverse(self) -> None:
-    self.mask = ~self.mask
+    if self.is_unpacked:
+      self.mask = ~self.__mask
+    else:
+      packed = np.invert(self.__packed)
+      # the padding bits of the last byte need to stay unset
+      n_padding_bits = -int(np.prod(self.__shape)) % 8
+      if n_padding_bits > 0:
+        packed[-1] &= (0xFF << n_padding_bits) & 0xFF
+      self.__packed = packed
+      self.__version += 1
 
   @property
   def n_masked(self) -> int:
-    result = np.sum(self.mask)
+    if self.is_unpacked:
+      result = np.sum(self.mask)
+    else:
+      result = np.sum(BIT_COUNTS[self.__packed], dtype=np.int64)
     return result
 
   @property
   def n_unmasked(self) -> int:
-    result = np.sum(~self.mask)
+    if self.is_unpacked:
+      result = np.sum(~self.mask)
+    else:
+      result = int(np.prod(self.__shape)) - self.n_masked
     return result
 
   @property
@@ -56,22 +169,94 @@ class MaskBase():
     return result
 
   def clone(self) -> "MaskBase":
-    raise NotImplementedError()
+    if self.is_unpacked:
+      return type(self)(self.__mask.copy())
+    # the packed bits are never changed in-place, i.e., they can be shared
+    return type(self).from_packed(self.__packed, self.__shape)
+
+  def grow(self, shape: Tuple[int, ...]) -> "MaskBase":
+    """returns a copy of the mask with the given shape; the new entries are appended to each axis and are unmasked"""
+    assert len(shape) == len(self.mask_shape)
+    assert all(new_size >= size for new_size, size in zip(shape, self.mask_shape))
+    mask = np.full(shape, fill_value=False, dtype=bool)
+    mask[tuple(slice(0, size) for size in self.mask_shape)] = self.unpack()
+    return type(self)(mask)
 
 
 class RatingsMask(MaskBase):
-  def clone(self) -> "RatingsMask":
-    return RatingsMask(self.mask.copy())
+  def combine_mask(self, mask: "MaskBase") -> None:
+    if isinstance(mask, SparseRatingsMask):
+      mask = mask.to_dense()
+    super().combine_mask(mask)
+
+  def masked_counts(self, axis: int) -> np.ndarray:
+    """returns the count of masked cells for each entry of the axis (0 = algorithms, 1 = workers, 2 = files)"""
+    other_axes = tuple(a for a in range(self.mask.ndim) if a != axis)
+    result = np.sum(self.mask, axis=other_axes)
+    return result
+
+
+class SparseRatingsMask(RatingsMask):
+  """
+  RatingsMask which only stores the rated (algorithm, worker, file) cells.
+  mask: a vector which contains for each cell in `cells` whether it is masked
+  cells: the sorted flat indices of the rated cells in the (algorithms, workers, files) tensor
+  Unrated cells are never masked, i.e., reverse() only affects rated cells.
+  """
+
+  def __init__(self, mask: np.ndarray, cells: np.ndarray, shape: Tuple[int, int, int]) -> None:
+    assert mask.shape == cells.shape
+    super().__init__(mask)
+    self.cells = cells
+    self.shape = shape
+
+  def combine_mask(self, mask: "MaskBase") -> None:
+    if isinstance(mask, SparseRatingsMask):
+      assert mask.shape == self.shape
+      self.combine_mask_np(mask.mask)
+    elif isinstance(mask, RatingsMask):
+      assert mask.mask_shape == self.shape
+      self.combine_mask_np(mask.unpack().flat[self.cells])
+    else:
+      super().combine_mask(mask)
+
+  def apply_by_nan(self, data: np.ndarray) -> None:
+    if data.shape == self.mask.shape:
+      data[self.mask] = np.nan
+    else:
+      assert data.shape == self.shape
+      data.flat[self.cells[self.mask]] = np.nan
+
+  def apply_by_false(self, data: np.ndarray) -> None:
+    if data.shape == self.mask.shape:
+      data[self.mask] = False
+    else:
+      assert data.shape == self.shape
+      data.flat[self.cells[self.mask]] = False
+
+  def masked_counts(self, axis: int) -> np.ndarray:
+    coordinates = np.unravel_index(self.cells[self.mask], self.shape)[axis]
+    result = np.bincount(coordinates, minlength=self.shape[axis])
+    return result
+
+  def to_dense(self) -> RatingsMask:
+    mask = np.full(self.shape, fill_value=False, dtype=bool)
+    mask.flat[self.cells[self.mask]] = True
+    return RatingsMask(mask)
+
+  def grow(self, shape: Tuple[int, ...]) -> RatingsMask:
+    return self.to_dense().grow(shape)
+
+  def clone(self) -> "SparseRatingsMask":
+    return SparseRatingsMask(self.mask.copy(), self.cells, self.shape)
 
 
 class AssignmentsMask(MaskBase):
-  def clone(self) -> "AssignmentsMask":
-    return AssignmentsMask(self.mask.copy())
+  pass
 
 
 class WorkersMask(MaskBase):
-  def clone(self) -> "WorkersMask":
-    return WorkersMask(self.mask.copy())
+  pass
 
 
 def get_mask_name_and_reverse(mask_name: str) -> Tuple[str, bool]:
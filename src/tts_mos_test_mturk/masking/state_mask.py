@@ -7,6 +7,7 @@ import pandas as pd
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.logging import log_full_df_info
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk.masking.masks import AssignmentsMask
 from tts_mos_test_mturk.statistics.update_stats import print_stats_masks
 
 
@@ -14,13 +15,11 @@ def mask_assignments_by_state(data: EvaluationData, mask_names: Set[str], states
   masks = data.get_masks_from_names(mask_names)
   factory = MaskFactory(data)
 
-  lts = get_states(data)
   amask = factory.merge_masks_into_amask(masks)
-  amask.apply_by_nan(lts)
 
-  res_amask = get_states_amask(lts, states, factory)
+  res_amask = get_states_amask(data, states, amask)
 
-  stats_df = get_stats_df(lts, states)
+  stats_df = get_stats_df(data, states, amask)
   log_full_df_info(stats_df, "Statistics:")
 
   data.add_or_update_mask(output_mask_name, res_amask)
@@ -28,15 +27,17 @@ def mask_assignments_by_state(data: EvaluationData, mask_names: Set[str], states
   print_stats_masks(data, masks, [res_amask])
 
 
-def get_stats_df(lts: np.ndarray, mask_states: Set[str]) -> pd.DataFrame:
+def get_stats_df(data: EvaluationData, mask_states: Set[str], amask: AssignmentsMask) -> pd.DataFrame:
   col_state = "State"
   col_count = "# Assignments"
   col_masked = "Masked?"
 
-  states, ld_counts = np.unique(lts, return_counts=True)
+  # count of the unmasked assignments of each state
+  ld_counts = np.bincount(
+    data.assignment_state_codes[amask.unmasked_indices], minlength=len(data.states))
   lines = []
-  for state, count in (zip(states, ld_counts)):
-    if state == "nan":
+  for state, count in zip(data.states.tolist(), ld_counts):
+    if count == 0:
       continue
     lines.append(OrderedDict((
       (col_state, state),
@@ -55,19 +56,10 @@ def get_stats_df(lts: np.ndarray, mask_states: Set[str]) -> pd.DataFrame:
   return result
 
 
-def get_states_amask(states: np.ndarray, mask_states: Set[str], factory: MaskFactory) -> None:
-  res_amask = factory.get_amask()
-  for state in mask_states:
-    lt_mask = states == state
-    res_amask.combine_mask_np(lt_mask)
+def get_states_amask(data: EvaluationData, mask_states: Set[str], amask: AssignmentsMask) -> AssignmentsMask:
+  """masks the assignments of the states which are not already masked by amask"""
+  state_codes = np.flatnonzero(np.isin(data.states, list(mask_states)))
+  res_amask_np = np.isin(data.assignment_state_codes, state_codes)
+  amask.apply_by_false(res_amask_np)
+  res_amask = AssignmentsMask(res_amask_np)
   return res_amask
-
-
-def get_states(data: EvaluationData) -> np.ndarray:
-  states = [np.nan] * data.n_assignments
-  for worker_data in data.worker_data.values():
-    for assignment, assignment_data in worker_data.assignments.items():
-      ass_i = data.assignments.get_loc(assignment)
-      states[ass_i] = assignment_data.state
-  states_np = np.array(states)
-  return states_np
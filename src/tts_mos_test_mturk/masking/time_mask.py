@@ -1,11 +1,12 @@
 from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional, Set
+from typing import Set
 
 import numpy as np
 import pandas as pd
 from ordered_set import OrderedSet
 
+from tts_mos_test_mturk.common import get_time_strings
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.logging import log_full_df_info
 from tts_mos_test_mturk.masking.etc import mask_values_in_boundary
@@ -27,10 +28,8 @@ def mask_assignments_by_time(data: EvaluationData, mask_names: Set[str], from_th
   too_fast_amask_np = mask_values_in_boundary(times, from_ticks, to_ticks)
   too_fast_amask = factory.convert_ndarray_to_amask(too_fast_amask_np)
 
-  times_str = get_times_str(data)
-  for idx in amask.masked_indices:
-    times_str[idx] = None
-  stats_df = get_stats_df(data.assignments, times_str, too_fast_amask.masked_indices)
+  stats_df = get_stats_df(data.assignments, data.assignment_times,
+                          amask.unmasked_indices, too_fast_amask.masked_indices)
   log_full_df_info(stats_df, "Statistics:")
 
   data.add_or_update_mask(output_mask_name, too_fast_amask)
@@ -38,21 +37,17 @@ def mask_assignments_by_time(data: EvaluationData, mask_names: Set[str], from_th
   print_stats_masks(data, masks, [too_fast_amask])
 
 
-def get_stats_df(assignments: OrderedSet[str], times: List[Optional[datetime]], masked_indices: np.ndarray) -> pd.DataFrame:
+def get_stats_df(assignments: OrderedSet[str], times: np.ndarray, assignment_indices: np.ndarray, masked_indices: np.ndarray) -> pd.DataFrame:
   col_assignment = "AssignmentId"
   col_time = "Time"
   col_masked = "Masked?"
-  lines = []
-  for a_i, time in zip(range(len(assignments)), times):
-    if time is None:
-      continue
-    lines.append(OrderedDict((
-      (col_assignment, assignments[a_i]),
-      (col_time, time.strftime("%Y-%m-%d %H:%M:%S")),
-      (col_masked, a_i in masked_indices),
-    )))
-
-  result = pd.DataFrame.from_records(lines)
+  lines = OrderedDict((
+    (col_assignment, [assignments[a_i] for a_i in assignment_indices]),
+    (col_time, get_time_strings(times[assignment_indices])),
+    (col_masked, np.isin(assignment_indices, masked_indices)),
+  ))
+
+  result = pd.DataFrame(lines)
   row = {
     col_assignment: "-ALL-",
     col_time: "-",
@@ -69,26 +64,6 @@ def get_ticks(dt: datetime) -> float:
 
 
 def get_times(data: EvaluationData) -> np.ndarray:
-  times = np.full(
-    data.n_assignments,
-    fill_value=np.nan,
-    dtype=np.float64,
-  )
-
-  for worker_data in data.worker_data.values():
-    for assignment, assignment_data in worker_data.assignments.items():
-      ass_i = data.assignments.get_loc(assignment)
-      times[ass_i] = get_ticks(assignment_data.time)
-
-  return times
-
-
-def get_times_str(data: EvaluationData) -> List[datetime]:
-  times = [None] * data.n_assignments
-
-  for worker_data in data.worker_data.values():
-    for assignment, assignment_data in worker_data.assignments.items():
-      ass_i = data.assignments.get_loc(assignment)
-      times[ass_i] = assignment_data.time
-
+  # seconds since 0001-01-01, see get_ticks()
+  times = (data.assignment_times - np.datetime64("0001-01-01T00:00:00", "s")).astype(np.float64)
   return times
@@ -7,9 +7,7 @@ import pandas as pd
 from ordered_set import OrderedSet
 
 from tts_mos_test_mturk.common import get_ratings
-from tts_mos_test_mturk.correlations import (get_algorithm_mos_correlations, get_mos_correlations,
-                                             get_sentence_mos_correlations_3dim,
-                                             get_worker_mos_correlations)
+from tts_mos_test_mturk.correlations import WorkerCorrelations, get_worker_correlations
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.logging import log_full_df_info
 from tts_mos_test_mturk.masking.etc import mask_values_in_boundary, sort_indices_after_values
@@ -28,7 +26,8 @@ def mask_workers_by_correlation(data: EvaluationData, mask_names: Set[str], from
   ratings = get_ratings(data, rating_names)
   rmask.apply_by_nan(ratings)
 
-  wcorrelations = get_mos_correlations(ratings, mode)
+  correlations = get_worker_correlations(ratings)
+  wcorrelations = correlations.get(mode)
   res_wmask_np = mask_values_in_boundary(
     wcorrelations, from_threshold_incl, to_threshold_excl)
   if mask_nan:
@@ -36,7 +35,7 @@ def mask_workers_by_correlation(data: EvaluationData, mask_names: Set[str], from
     res_wmask_np = (res_wmask_np | unmasked_nan_correlation)
   res_wmask = factory.convert_ndarray_to_wmask(res_wmask_np)
 
-  stats_df = get_stats_df(data.workers, ratings, res_wmask.masked_indices,
+  stats_df = get_stats_df(data.workers, correlations, res_wmask.masked_indices,
                           wcorrelations, wmask.masked_indices, mode, False)
   log_full_df_info(stats_df, "Statistics:")
 
@@ -57,7 +56,9 @@ def mask_workers_by_correlation_percent(data: EvaluationData, mask_names: Set[st
   rmask.apply_by_nan(ratings)
 
   windices = np.arange(data.n_workers)
-  wcorrelations = get_mos_correlations(ratings, mode)
+  correlations = get_worker_correlations(ratings)
+  # copy because masked workers are overwritten below
+  wcorrelations = correlations.get(mode).copy()
 
   sub_wcorrelations = wcorrelations
   sub_windices = windices
@@ -75,7 +76,7 @@ def mask_workers_by_correlation_percent(data: EvaluationData, mask_names: Set[st
   res_wmask = factory.get_wmask()
   res_wmask.mask_indices(sub_sel_windices)
 
-  stats_df = get_stats_df(data.workers, ratings, res_wmask.masked_indices,
+  stats_df = get_stats_df(data.workers, correlations, res_wmask.masked_indices,
                           wcorrelations, wmask.masked_indices, mode, consider_masked_workers)
   log_full_df_info(stats_df, "Statistics:")
 
@@ -84,7 +85,7 @@ def mask_workers_by_correlation_percent(data: EvaluationData, mask_names: Set[st
   print_stats_masks(data, masks, [res_wmask])
 
 
-def get_stats_df(workers: OrderedSet[str], ratings: np.ndarray, masked_indices: np.ndarray, used_correlations: np.ndarray, already_masked_worker_indices: np.ndarray, mode: Literal["sentence", "algorithm", "both"], print_masked_workers: bool) -> pd.DataFrame:
+def get_stats_df(workers: OrderedSet[str], correlations: WorkerCorrelations, masked_indices: np.ndarray, used_correlations: np.ndarray, already_masked_worker_indices: np.ndarray, mode: Literal["sentence", "algorithm", "both"], print_masked_workers: bool) -> pd.DataFrame:
   col_worker = "Worker"
   col_ratings = "# Ratings"
   col_sent_corr = "Sentence correlation"
@@ -103,20 +104,16 @@ def get_stats_df(workers: OrderedSet[str], ratings: np.ndarray, masked_indices:
     assert mode == "both"
     col_both_corr = f"[{col_both_corr}]"
 
-  w_sent_corr = get_sentence_mos_correlations_3dim(ratings)
-  w_algo_corr = get_algorithm_mos_correlations(ratings)
-  w_both_corr = get_worker_mos_correlations(ratings)
-
   lines = []
   for w_i, worker in enumerate(workers):
     if w_i in already_masked_worker_indices and not print_masked_workers:
       continue
     lines.append(OrderedDict((
       (col_worker, worker),
-      (col_ratings, np.sum(~np.isnan(ratings[:, w_i, :]))),
-      (col_sent_corr, w_sent_corr[w_i]),
-      (col_alg_corr, w_algo_corr[w_i]),
-      (col_both_corr, w_both_corr[w_i]),
+      (col_ratings, correlations.n_ratings[w_i]),
+      (col_sent_corr, correlations.sentence[w_i]),
+      (col_alg_corr, correlations.algorithm[w_i]),
+      (col_both_corr, correlations.both[w_i]),
       (col_percent, 0),
       (col_masked, w_i in masked_indices),
       (col_w_i, w_i),
@@ -1,5 +1,7 @@
 from typing import Set
 
+import numpy as np
+
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
 from tts_mos_test_mturk.statistics.update_stats import print_stats_masks
@@ -12,12 +14,14 @@ def mask_workers_by_id(data: EvaluationData, mask_names: Set[str], worker_ids: S
   wmask = factory.merge_masks_into_wmask(masks)
 
   res_wmask = factory.get_wmask()
+  indices = []
   for i, worker_id in enumerate(data.workers):
     is_masked_already = wmask.mask[i]
     if is_masked_already:
       continue
     if worker_id in worker_ids:
-      res_wmask.mask[i] = True
+      indices.append(i)
+  res_wmask.mask_indices(np.array(indices, dtype=np.int64))
 
   data.add_or_update_mask(output_mask_name, res_wmask)
 
@@ -1,48 +1,168 @@
 import datetime
+import math
 from collections import OrderedDict
-from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, ItemsView, Iterator, List, Mapping, Optional
 from typing import OrderedDict as ODType
 from typing import Set, Tuple, Union, cast
 
+import numpy as np
 from ordered_set import OrderedSet
 
-from tts_mos_test_mturk.typing import AlgorithmName, AssignmentId, FileName, Ratings, WorkerName
+from tts_mos_test_mturk.typing import (AlgorithmName, AssignmentId, FileName, RatingName, Ratings,
+                                       RatingValue, WorkerName)
 
 
-@dataclass()
-class RatingData:
-  votes: Ratings = field(default_factory=OrderedDict)
+class Slotted():
+  """
+  Base class for slotted data classes, i.e., the instances have no __dict__. Equality, representation and pickling are based on __slots__.
+  """
+  __slots__: Tuple[str, ...] = ()
 
+  def __eq__(self, other: object) -> bool:
+    if type(other) is not type(self):
+      return NotImplemented
+    return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
 
-@dataclass()
-class Assignment:
-  # TODO make optional
-  device: str
-  # TODO make optional
-  state: str
-  # TODO make optional
-  hit_id: str
-  # TODO make optional
-  time: datetime.datetime
-  # ratings: List[Rating] = field(default_factory=list)
-  ratings: ODType[Tuple[AlgorithmName, FileName], RatingData] = field(default_factory=OrderedDict)
+  def __repr__(self) -> str:
+    values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+    return f"{type(self).__name__}({values})"
 
+  def __getstate__(self) -> Dict[str, Any]:
+    return {name: getattr(self, name) for name in self.__slots__}
 
-@dataclass()
-class Worker():
-  age_group: str
-  gender: str
-  assignments: ODType[AssignmentId, Assignment] = field(default_factory=OrderedDict)
+  def __setstate__(self, state: Any) -> None:
+    if isinstance(state, tuple):
+      # (__dict__, slots) of the default pickling of slotted objects
+      state = {**(state[0] or {}), **(state[1] or {})}
+    # instances which were pickled by an older version have a __dict__
+    for name, value in state.items():
+      setattr(self, name, value)
 
 
-@dataclass()
-class Result():
-  # TODO make optional
-  algorithms: OrderedSet[AlgorithmName] = field(default_factory=OrderedSet)
-  # TODO make optional
-  files: OrderedSet[FileName] = field(default_factory=OrderedSet)
-  workers: ODType[WorkerName, Worker] = field(default_factory=OrderedDict)
+class RatingData(Slotted):
+  __slots__ = ("votes",)
+
+  def __init__(self, votes: Optional[Ratings] = None) -> None:
+    self.votes: Ratings = OrderedDict() if votes is None else votes
+
+
+class Assignment(Slotted):
+  __slots__ = ("device", "state", "hit_id", "time", "ratings")
+
+  def __init__(self, device: str, state: str, hit_id: str, time: datetime.datetime, ratings: Optional[Mapping[Tuple[AlgorithmName, FileName], RatingData]] = None) -> None:
+    # TODO make optional
+    self.device = device
+    # TODO make optional
+    self.state = state
+    # TODO make optional
+    self.hit_id = hit_id
+    # TODO make optional
+    self.time = time
+    self.ratings: Mapping[Tuple[AlgorithmName, FileName], RatingData] = OrderedDict() if ratings is None else ratings
+
+
+class Worker(Slotted):
+  __slots__ = ("age_group", "gender", "assignments")
+
+  def __init__(self, age_group: str, gender: str, assignments: Optional[ODType[AssignmentId, Assignment]] = None) -> None:
+    self.age_group = age_group
+    self.gender = gender
+    self.assignments: ODType[AssignmentId, Assignment] = OrderedDict() if assignments is None else assignments
+
+
+class Result(Slotted):
+  __slots__ = ("algorithms", "files", "workers")
+
+  def __init__(self, algorithms: Optional[OrderedSet[AlgorithmName]] = None, files: Optional[OrderedSet[FileName]] = None, workers: Optional[ODType[WorkerName, Worker]] = None) -> None:
+    # TODO make optional
+    self.algorithms: OrderedSet[AlgorithmName] = OrderedSet() if algorithms is None else algorithms
+    # TODO make optional
+    self.files: OrderedSet[FileName] = OrderedSet() if files is None else files
+    self.workers: ODType[WorkerName, Worker] = OrderedDict() if workers is None else workers
+
+
+class Votes(Mapping[RatingName, RatingValue]):
+  """read-only votes of a rating which are stored as one row of the votes column; missing votes are NaN"""
+  __slots__ = ("__rating_names", "__values")
+
+  def __init__(self, rating_names: OrderedSet[RatingName], values: List[float]) -> None:
+    self.__rating_names = rating_names
+    self.__values = values
+
+  def __getitem__(self, rating_name: RatingName) -> RatingValue:
+    if rating_name not in self.__rating_names:
+      raise KeyError(rating_name)
+    vote = self.__values[self.__rating_names.get_loc(rating_name)]
+    if math.isnan(vote):
+      raise KeyError(rating_name)
+    return int(vote) if vote.is_integer() else vote
+
+  def __iter__(self) -> Iterator[RatingName]:
+    for rating_name, vote in zip(self.__rating_names, self.__values):
+      if not math.isnan(vote):
+        yield rating_name
+
+  def __len__(self) -> int:
+    return sum(1 for _ in self)
+
+  def __repr__(self) -> str:
+    return repr(dict(self.items()))
+
+
+class AssignmentRatings(Mapping[Tuple[AlgorithmName, FileName], RatingData]):
+  """
+  Read-only ratings of an assignment which are stored as (views of) the rating columns of the assignment, i.e., the RatingData objects are only created on access.
+  """
+  __slots__ = ("__algorithms", "__files", "__rating_names",
+               "__rating_algorithms", "__rating_files", "__votes")
+
+  def __init__(self, algorithms: OrderedSet[AlgorithmName], files: OrderedSet[FileName], rating_names: OrderedSet[RatingName], rating_algorithms: np.ndarray, rating_files: np.ndarray, votes: np.ndarray) -> None:
+    self.__algorithms = algorithms
+    self.__files = files
+    self.__rating_names = rating_names
+    self.__rating_algorithms = rating_algorithms
+    self.__rating_files = rating_files
+    self.__votes = votes
+
+  def __get_rating_data(self, r_i: int) -> RatingData:
+    return RatingData(Votes(self.__rating_names, self.__votes[r_i].tolist()))
+
+  def __getitem__(self, key: Tuple[AlgorithmName, FileName]) -> RatingData:
+    algorithm, file = key
+    if algorithm not in self.__algorithms or file not in self.__files:
+      raise KeyError(key)
+    is_key = (self.__rating_algorithms == self.__algorithms.get_loc(algorithm)) & \
+        (self.__rating_files == self.__files.get_loc(file))
+    indices = np.flatnonzero(is_key)
+    if len(indices) == 0:
+      raise KeyError(key)
+    return self.__get_rating_data(indices[0])
+
+  def __iter__(self) -> Iterator[Tuple[AlgorithmName, FileName]]:
+    for alg_i, file_i in zip(self.__rating_algorithms.tolist(), self.__rating_files.tolist()):
+      yield self.__algorithms[alg_i], self.__files[file_i]
+
+  def __len__(self) -> int:
+    return len(self.__rating_algorithms)
+
+  def items(self) -> ItemsView[Tuple[AlgorithmName, FileName], RatingData]:
+    return AssignmentRatingsItems(self)
+
+  def iter_items(self) -> Iterator[Tuple[Tuple[AlgorithmName, FileName], RatingData]]:
+    """iterates the items without looking up each key"""
+    rows = zip(self.__rating_algorithms.tolist(), self.__rating_files.tolist(), self.__votes.tolist())
+    for alg_i, file_i, votes in rows:
+      yield (self.__algorithms[alg_i], self.__files[file_i]), RatingData(Votes(self.__rating_names, votes))
+
+  def __repr__(self) -> str:
+    return repr(OrderedDict(self.items()))
+
+
+class AssignmentRatingsItems(ItemsView[Tuple[AlgorithmName, FileName], RatingData]):
+  _mapping: AssignmentRatings
+
+  def __iter__(self) -> Iterator[Tuple[Tuple[AlgorithmName, FileName], RatingData]]:
+    return self._mapping.iter_items()
 
 
 def parse_int_then_float(val: str) -> Union[int, float]:
@@ -65,6 +185,43 @@ def parse_time2(val: str) -> datetime.datetime:
   return result
 
 
+# formats of parse_time2() and parse_time() (the time zone is removed before parsing)
+TIME_FORMATS = (
+  "%d.%m.%y %H:%M:%S",
+  "%a %b %d %H:%M:%S %Y",
+)
+TIME_ZONES = (" PST", " PDT")
+# format which was detected last, it is tried first
+__detected_time_formats: List[str] = list(TIME_FORMATS)
+
+
+def parse_times(values: List[str]) -> np.ndarray:
+  """
+  Parses the times in bulk, i.e., each format is applied once to all remaining values instead of detecting it for each value. Returns NaT for values which couldn't be parsed.
+  """
+  # pandas is imported lazily to keep the startup of the CLI fast
+  import pandas as pd
+  result = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[s]")
+  values_series = pd.Series(values, dtype=object)
+  remaining = np.arange(len(values))
+  for time_format in list(__detected_time_formats):
+    if len(remaining) == 0:
+      break
+    remaining_values = values_series.iloc[remaining]
+    if time_format == TIME_FORMATS[1]:
+      for time_zone in TIME_ZONES:
+        remaining_values = remaining_values.str.replace(time_zone, "", regex=False)
+    parsed = pd.to_datetime(remaining_values, format=time_format, errors="coerce").to_numpy()
+    is_parsed = ~np.isnat(parsed)
+    if not np.any(is_parsed):
+      continue
+    result[remaining[is_parsed]] = parsed[is_parsed].astype("datetime64[s]")
+    remaining = remaining[~is_parsed]
+    __detected_time_formats.remove(time_format)
+    __detected_time_formats.insert(0, time_format)
+  return result
+
+
 def parse_result_from_json(data: Dict) -> Result:
   res_data: ODType[str, Worker] = OrderedDict()
   files = OrderedSet(str(x) for x in data["files"])
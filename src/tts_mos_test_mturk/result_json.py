@@ -0,0 +1,195 @@
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from ordered_set import OrderedSet
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.json_stream import DEFAULT_CHUNK_SIZE, JsonStreamReader
+from tts_mos_test_mturk.result import parse_times
+from tts_mos_test_mturk.typing import RatingName
+
+
+@dataclass()
+class ResultColumns():
+  algorithms: OrderedSet[str]
+  files: OrderedSet[str]
+  workers: OrderedSet[str] = field(default_factory=OrderedSet)
+  worker_age_groups: List[str] = field(default_factory=list)
+  worker_genders: List[str] = field(default_factory=list)
+  assignments: OrderedSet[str] = field(default_factory=OrderedSet)
+  assignment_workers: array = field(default_factory=lambda: array("i"))
+  assignment_times: List[str] = field(default_factory=list)
+  assignment_devices: List[str] = field(default_factory=list)
+  assignment_states: List[str] = field(default_factory=list)
+  assignment_hit_ids: List[str] = field(default_factory=list)
+  rating_workers: array = field(default_factory=lambda: array("i"))
+  rating_assignments: array = field(default_factory=lambda: array("i"))
+  rating_algorithms: array = field(default_factory=lambda: array("i"))
+  rating_files: array = field(default_factory=lambda: array("i"))
+  # one column per rating name; NaN if the vote is missing
+  votes: Dict[RatingName, array] = field(default_factory=dict)
+
+
+def get_location(line: int, worker_id: str, assignment_id: Optional[str] = None, rating_nr: Optional[int] = None) -> str:
+  location = f"worker \"{worker_id}\""
+  if assignment_id is not None:
+    location += f", assignment \"{assignment_id}\""
+  if rating_nr is not None:
+    location += f", rating {rating_nr}"
+  location += f", line {line}"
+  return location
+
+
+def parse_assignment(assignment_data: Dict[str, Any], assignment_id: str, w_i: int, columns: ResultColumns, line: int, worker_id: str) -> None:
+  if assignment_id in columns.assignments:
+    raise ValueError(
+      f"Assignment \"{assignment_id}\" exist multiple times! ({get_location(line, worker_id, assignment_id)})")
+  a_i = len(columns.assignments)
+  columns.assignments.add(assignment_id)
+  columns.assignment_workers.append(w_i)
+  columns.assignment_devices.append(str(assignment_data["device"]))
+  columns.assignment_hit_ids.append(str(assignment_data["hit"]))
+  columns.assignment_states.append(str(assignment_data["state"]))
+  # the times are parsed at once after all assignments are read
+  columns.assignment_times.append(str(assignment_data["time"]))
+
+  alg_file_combs: Set[Tuple[int, int]] = set()
+  for rating_nr, rating_data in enumerate(assignment_data["ratings"], start=1):
+    algorithm = str(rating_data["algorithm"])
+    file = str(rating_data["file"])
+    if algorithm not in columns.algorithms:
+      raise ValueError(
+        f"Referenced algorithm \"{algorithm}\" was not defined in \"algorithms\"! ({get_location(line, worker_id, assignment_id, rating_nr)})")
+
+    if file not in columns.files:
+      raise ValueError(
+        f"Referenced file \"{file}\" was not defined in \"files\"! ({get_location(line, worker_id, assignment_id, rating_nr)})")
+
+    alg_file_comb = (columns.algorithms.get_loc(algorithm), columns.files.get_loc(file))
+    if alg_file_comb in alg_file_combs:
+      raise ValueError(
+        f"Rating for algorithm and file combination exist multiple times! ({get_location(line, worker_id, assignment_id, rating_nr)})")
+    alg_file_combs.add(alg_file_comb)
+
+    votes: Dict[str, Any] = rating_data["votes"]
+    for vote_name, vote in votes.items():
+      if not isinstance(vote, (int, float)) or isinstance(vote, bool):
+        raise ValueError(
+          f"Vote \"{vote_name}\" needs to be a number! ({get_location(line, worker_id, assignment_id, rating_nr)})")
+      if vote_name not in columns.votes:
+        columns.votes[vote_name] = array("f", [np.nan]) * len(columns.rating_workers)
+    for vote_name, vote_column in columns.votes.items():
+      vote_column.append(votes.get(vote_name, np.nan))
+
+    columns.rating_workers.append(w_i)
+    columns.rating_assignments.append(a_i)
+    columns.rating_algorithms.append(alg_file_comb[0])
+    columns.rating_files.append(alg_file_comb[1])
+
+
+def parse_worker(reader: JsonStreamReader, worker_id: str, columns: ResultColumns) -> None:
+  line, _ = reader.location
+  if worker_id in columns.workers:
+    raise ValueError(f"Worker \"{worker_id}\" exist multiple times! ({get_location(line, worker_id)})")
+  w_i = len(columns.workers)
+  columns.workers.add(worker_id)
+  age_group = gender = None
+  try:
+    # the assignments are parsed one by one
+    for key in reader.iter_object():
+      if key == "age_group":
+        age_group = str(reader.read_value())
+      elif key == "gender":
+        gender = str(reader.read_value())
+      elif key == "assignments":
+        for assignment_id in reader.iter_object():
+          line, _ = reader.location
+          assignment_data = reader.read_value()
+          parse_assignment(assignment_data, assignment_id, w_i, columns, line, worker_id)
+      else:
+        reader.skip_value()
+  except (KeyError, TypeError) as ex:
+    raise ValueError(f"Data of worker \"{worker_id}\" is invalid! ({get_location(line, worker_id)})") from ex
+  if age_group is None or gender is None:
+    raise ValueError(
+      f"Age group and gender of worker \"{worker_id}\" need to be defined! ({get_location(line, worker_id)})")
+  columns.worker_age_groups.append(age_group)
+  columns.worker_genders.append(gender)
+
+
+def parse_workers(path: Path, columns: ResultColumns, chunk_size: int) -> None:
+  with open(path, mode="r", encoding="utf-8") as file:
+    reader = JsonStreamReader(file, chunk_size)
+    for key in reader.iter_object():
+      if key == "workers":
+        for worker_id in reader.iter_object():
+          parse_worker(reader, worker_id, columns)
+      else:
+        reader.skip_value()
+
+
+def parse_evaluation_data_from_json(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> EvaluationData:
+  """
+  Parses the result JSON incrementally (assignment by assignment) into the columns of a project. If the workers are defined before the algorithms and files, the file is read twice.
+  """
+  algorithms: Optional[OrderedSet[str]] = None
+  files: Optional[OrderedSet[str]] = None
+  columns: Optional[ResultColumns] = None
+  with open(path, mode="r", encoding="utf-8") as file:
+    reader = JsonStreamReader(file, chunk_size)
+    for key in reader.iter_object():
+      if key == "algorithms":
+        algorithms = OrderedSet(str(x) for x in reader.read_value())
+      elif key == "files":
+        files = OrderedSet(str(x) for x in reader.read_value())
+      elif key == "workers" and algorithms is not None and files is not None:
+        columns = ResultColumns(algorithms, files)
+        for worker_id in reader.iter_object():
+          parse_worker(reader, worker_id, columns)
+      else:
+        reader.skip_value()
+    reader.ensure_end()
+
+  if algorithms is None:
+    raise ValueError("\"algorithms\" need to be defined!")
+  if files is None:
+    raise ValueError("\"files\" need to be defined!")
+  if columns is None:
+    columns = ResultColumns(algorithms, files)
+    parse_workers(path, columns, chunk_size)
+
+  assignment_times = parse_times(columns.assignment_times)
+  not_parsed = np.flatnonzero(np.isnat(assignment_times))
+  if len(not_parsed) > 0:
+    a_i = not_parsed[0]
+    raise ValueError(
+      f"Time \"{columns.assignment_times[a_i]}\" couldn't be parsed! (worker \"{columns.workers[columns.assignment_workers[a_i]]}\", assignment \"{columns.assignments[a_i]}\")")
+
+  rating_names = OrderedSet(columns.votes.keys())
+  if len(rating_names) > 0:
+    votes = np.stack([
+      np.frombuffer(columns.votes[rating_name], dtype=np.float32)
+      for rating_name in rating_names
+    ], axis=1)
+  else:
+    votes = np.empty((len(columns.rating_workers), 0), dtype=np.float32)
+
+  result = EvaluationData.from_columns(
+    columns.algorithms, columns.files, columns.workers, columns.assignments, rating_names, {
+      "rating_workers": np.frombuffer(columns.rating_workers, dtype=np.int32),
+      "rating_assignments": np.frombuffer(columns.rating_assignments, dtype=np.int32),
+      "rating_algorithms": np.frombuffer(columns.rating_algorithms, dtype=np.int32),
+      "rating_files": np.frombuffer(columns.rating_files, dtype=np.int32),
+      "votes": votes,
+      "assignment_workers": np.frombuffer(columns.assignment_workers, dtype=np.int32),
+      "assignment_times": assignment_times,
+      "assignment_devices": np.array(columns.assignment_devices, dtype=str),
+      "assignment_states": np.array(columns.assignment_states, dtype=str),
+      "assignment_hit_ids": np.array(columns.assignment_hit_ids, dtype=str),
+      "worker_age_groups": np.array(columns.worker_age_groups, dtype=str),
+      "worker_genders": np.array(columns.worker_genders, dtype=str),
+    })
+  return result
@@ -1,3 +1,4 @@
+import math
 from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, List
@@ -7,6 +8,7 @@ from typing import Set, Union
 import numpy as np
 import pandas as pd
 
+from tts_mos_test_mturk.common import get_vote_value
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
 from tts_mos_test_mturk.masking.masks import MaskBase
@@ -55,7 +57,7 @@ class FileEntry:
 def get_worker_stats(data: EvaluationData, masks: List[MaskBase]):
   factory = MaskFactory(data)
 
-  rmask = factory.merge_masks_into_rmask(masks)
+  rmask = factory.merge_masks_into_sparse_rmask(masks)
   stats: Dict[str, Dict[str, FileEntry]] = {}
 
   for algorithm in data.algorithms:
@@ -63,25 +65,32 @@ def get_worker_stats(data: EvaluationData, masks: List[MaskBase]):
     for file in data.files:
       stats[algorithm][file] = FileEntry()
 
-  for worker, worker_data in data.worker_data.items():
-    w_i = data.workers.get_loc(worker)
-    for assignment_data in worker_data.assignments.values():
-      for (alg_name, file_name), ass_ratings in assignment_data.ratings.items():
-        alg_i = data.algorithms.get_loc(alg_name)
-        file_i = data.files.get_loc(file_name)
-        entry = stats[alg_name][file_name]
-        entry.raters.add(worker)
-
-        o_is_masked = rmask.mask[alg_i, w_i, file_i]
-        if o_is_masked:
-          entry.masked += 1
-          continue
-
-        entry.devices.append(assignment_data.device)
-        for rating_name, rating_val in ass_ratings.votes.items():
-          if rating_name not in entry.ratings:
-            entry.ratings[rating_name] = []
-          entry.ratings[rating_name].append(rating_val)
+  devices = data.assignment_devices.tolist()
+  is_masked = rmask.mask[data.rating_cells]
+  rows = zip(
+    data.rating_algorithms.tolist(),
+    data.rating_workers.tolist(),
+    data.rating_files.tolist(),
+    data.rating_assignments.tolist(),
+    is_masked.tolist(),
+    data.votes.tolist(),
+  )
+
+  for alg_i, w_i, file_i, a_i, o_is_masked, votes in rows:
+    entry = stats[data.algorithms[alg_i]][data.files[file_i]]
+    entry.raters.add(data.workers[w_i])
+
+    if o_is_masked:
+      entry.masked += 1
+      continue
+
+    entry.devices.append(devices[a_i])
+    for rating_name, rating_val in zip(data.rating_names, votes):
+      if math.isnan(rating_val):
+        continue
+      if rating_name not in entry.ratings:
+        entry.ratings[rating_name] = []
+      entry.ratings[rating_name].append(get_vote_value(rating_val))
 
   return stats
 
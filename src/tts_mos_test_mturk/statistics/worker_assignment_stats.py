@@ -1,4 +1,3 @@
-import datetime
 from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, List, Set, Tuple
@@ -7,9 +6,8 @@ import numpy as np
 import pandas as pd
 from ordered_set import OrderedSet
 
-from tts_mos_test_mturk.common import get_ratings
-from tts_mos_test_mturk.correlations import (get_algorithm_mos_correlation,
-                                             get_sentence_mos_correlation_3dim)
+from tts_mos_test_mturk.common import get_ratings, get_time_strings
+from tts_mos_test_mturk.correlations import get_worker_correlations
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
 from tts_mos_test_mturk.masking.masks import MaskBase
@@ -46,7 +44,7 @@ class WorkerEntry:
   # Count of assignment traps which the worker fell into
   listened_file_count: int = 0
   statuses: List[str] = field(default_factory=list)
-  accept_times: List[datetime.datetime] = field(default_factory=list)
+  accept_times: List[np.datetime64] = field(default_factory=list)
   devices: List[str] = field(default_factory=list)
   sentence_correlations: Dict[str, float] = field(default_factory=dict)
   algorithm_correlations: Dict[str, float] = field(default_factory=dict)
@@ -71,6 +69,11 @@ class WorkerEntry:
     return np.mean([self.algorithm_correlations[rating_name], self.sentence_correlations[rating_name]])
 
 
+def get_time_string(time: np.datetime64) -> str:
+  # formatted as DATE_FMT
+  return str(get_time_strings(time))
+
+
 def get_wass_stat_data(data: EvaluationData, masks: List[MaskBase]) -> Dict[str, WorkerEntry]:
   factory = MaskFactory(data)
 
@@ -124,16 +127,14 @@ def get_wass_stat_data(data: EvaluationData, masks: List[MaskBase]) -> Dict[str,
 
       worker_entry.devices.append(assignment_data.device)
       worker_entry.statuses.append(assignment_data.state)
-      worker_entry.accept_times.append(assignment_data.time)
+      worker_entry.accept_times.append(data.assignment_times[a_i])
 
-  for worker, worker_data in data.worker_data.items():
-    worker_entry = stats[worker]
-    w_i = data.workers.get_loc(worker)
-    for rating_name, ratings in all_ratings.items():
-      worker_entry.algorithm_correlations[rating_name] = get_algorithm_mos_correlation(
-        w_i, ratings)
-      worker_entry.sentence_correlations[rating_name] = get_sentence_mos_correlation_3dim(
-        w_i, ratings)
+  for rating_name, ratings in all_ratings.items():
+    correlations = get_worker_correlations(ratings)
+    for w_i, worker in enumerate(data.workers):
+      worker_entry = stats[worker]
+      worker_entry.algorithm_correlations[rating_name] = correlations.algorithm[w_i]
+      worker_entry.sentence_correlations[rating_name] = correlations.sentence[w_i]
 
   return stats
 
@@ -185,9 +186,9 @@ def stats_to_df(stats: Dict[str, WorkerEntry]) -> pd.DataFrame:
       assert first_accept_time == min(entry.accept_times)
       assert last_accept_time == max(entry.accept_times)
 
-      data_entry[COL_FIRST_HIT_ACC_TIME] = first_accept_time.strftime(DATE_FMT)
+      data_entry[COL_FIRST_HIT_ACC_TIME] = get_time_string(first_accept_time)
       data_entry[COL_FIRST_DEVICE] = first_device
-      data_entry[COL_LAST_HIT_ACC_TIME] = max(entry.accept_times).strftime(DATE_FMT)
+      data_entry[COL_LAST_HIT_ACC_TIME] = get_time_string(last_accept_time)
       data_entry[COL_LAST_DEVICE] = last_device
 
     device_counts = Counter(entry.devices)
@@ -239,8 +240,8 @@ def add_all_row(df: pd.DataFrame, stats: Dict[str, WorkerEntry]) -> pd.DataFrame
     for time in entry.accept_times
   ]
 
-  row[COL_FIRST_HIT_ACC_TIME] = min(all_accept_times).strftime(DATE_FMT)
-  row[COL_LAST_HIT_ACC_TIME] = max(all_accept_times).strftime(DATE_FMT)
+  row[COL_FIRST_HIT_ACC_TIME] = get_time_string(min(all_accept_times))
+  row[COL_LAST_HIT_ACC_TIME] = get_time_string(max(all_accept_times))
 
   all_corr_vals = []
   for col in df.columns:
@@ -0,0 +1,125 @@
+import datetime
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generator, List, Tuple
+
+import numpy as np
+
+GENDERS = ("female", "male")
+AGE_GROUPS = ("18-29", "30-49", "50+")
+START_TIME = datetime.datetime(2023, 1, 1)
+TIME_RANGE_S = 60 * 60 * 24 * 30
+MIN_VOTE = 1
+MAX_VOTE = 5
+
+
+@dataclass()
+class SyntheticStudy():
+  n_workers: int = 36
+  n_assignments: int = 12
+  """assignments per worker"""
+  n_ratings: int = 10
+  """ratings per assignment"""
+  n_algorithms: int = 4
+  n_files: int = 120
+  rating_names: Tuple[str, ...] = ("naturalness", "intelligibility")
+  duplicate_ratings: float = 0.0
+  """share of the ratings which repeat an algorithm/file combination that the worker rated already in an earlier assignment"""
+  devices: Tuple[str, ...] = ("headphones", "no-headphones")
+  states: Tuple[str, ...] = ("Approved", "Submitted", "Rejected")
+  seed: int = 0
+
+
+def validate_study(study: SyntheticStudy) -> None:
+  if min(study.n_workers, study.n_assignments, study.n_ratings, study.n_algorithms, study.n_files) <= 0:
+    raise ValueError("Counts need to be greater than zero!")
+  if study.n_ratings > study.n_algorithms * study.n_files:
+    raise ValueError("Ratings per assignment can't exceed the count of algorithm/file combinations!")
+  if not 0 <= study.duplicate_ratings <= 1:
+    raise ValueError("Share of duplicate ratings needs to be in [0, 1]!")
+  if len(study.rating_names) == 0 or len(study.devices) == 0 or len(study.states) == 0:
+    raise ValueError("Rating names, devices and states need to be defined!")
+
+
+def get_assignment_cells(rng: np.random.Generator, study: SyntheticStudy, rated_cells: List[int]) -> List[int]:
+  """returns the flat algorithm/file indices of the ratings of an assignment"""
+  n_cells = study.n_algorithms * study.n_files
+  cells: List[int] = []
+  cells_set = set()
+  n_duplicates = rng.binomial(study.n_ratings, study.duplicate_ratings) if len(rated_cells) > 0 else 0
+  if n_duplicates > 0:
+    duplicates = rng.choice(len(rated_cells), size=min(n_duplicates, len(rated_cells)), replace=False)
+    for i in duplicates.tolist():
+      cell = rated_cells[i]
+      if cell not in cells_set:
+        cells.append(cell)
+        cells_set.add(cell)
+  while len(cells) < study.n_ratings:
+    # a few draws are rejected if the combination is in the assignment already
+    for cell in rng.integers(n_cells, size=study.n_ratings - len(cells)).tolist():
+      if cell not in cells_set and len(cells) < study.n_ratings:
+        cells.append(cell)
+        cells_set.add(cell)
+  rng.shuffle(cells)
+  return cells
+
+
+def iter_synthetic_result_json(study: SyntheticStudy) -> Generator[str, None, None]:
+  """
+  Yields the result JSON of a synthetic study in chunks (one chunk per assignment), so that arbitrarily large studies can be written without keeping them in memory. The votes are drawn around a mean of each algorithm and rating name, shifted by a bias of each worker. The same settings and seed yield the same JSON.
+  """
+  validate_study(study)
+  rng = np.random.default_rng(study.seed)
+  algorithms = [f"alg{i}" for i in range(1, study.n_algorithms + 1)]
+  files = [f"file{i}" for i in range(1, study.n_files + 1)]
+  # JSON encoded names which are pasted into the output
+  algorithms_json = [json.dumps(x) for x in algorithms]
+  files_json = [json.dumps(x) for x in files]
+  rating_names_json = [json.dumps(x) for x in study.rating_names]
+  devices_json = [json.dumps(x) for x in study.devices]
+  states_json = [json.dumps(x) for x in study.states]
+  algorithm_means = rng.uniform(MIN_VOTE + 1, MAX_VOTE - 0.5, size=(study.n_algorithms, len(study.rating_names)))
+  n_hits = max(1, study.n_workers * study.n_assignments // 3)
+
+  yield f"{{\"algorithms\": {json.dumps(algorithms)}, \"files\": {json.dumps(files)}, \"workers\": {{"
+  assignment_nr = 0
+  for worker_nr in range(1, study.n_workers + 1):
+    gender = GENDERS[rng.integers(len(GENDERS))]
+    age_group = AGE_GROUPS[rng.integers(len(AGE_GROUPS))]
+    worker_bias = rng.normal(0, 0.5)
+    separator = "" if worker_nr == 1 else ", "
+    yield f"{separator}\"worker{worker_nr}\": {{\"gender\": \"{gender}\", \"age_group\": \"{age_group}\", \"assignments\": {{"
+    rated_cells: List[int] = []
+    for worker_assignment_nr in range(study.n_assignments):
+      assignment_nr += 1
+      cells = get_assignment_cells(rng, study, rated_cells)
+      alg_indices, file_indices = np.divmod(np.array(cells), study.n_files)
+      votes = algorithm_means[alg_indices] + worker_bias + \
+          rng.normal(0, 0.8, size=(len(cells), len(study.rating_names)))
+      votes = np.clip(np.rint(votes), MIN_VOTE, MAX_VOTE).astype(int).tolist()
+      ratings = ", ".join(
+        f"{{\"algorithm\": {algorithms_json[alg_i]}, \"file\": {files_json[file_i]}, \"votes\": {{" + ", ".join(
+          f"{rating_name}: {vote}" for rating_name, vote in zip(rating_names_json, rating_votes)
+        ) + "}}"
+        for alg_i, file_i, rating_votes in zip(alg_indices.tolist(), file_indices.tolist(), votes)
+      )
+      time = START_TIME + datetime.timedelta(seconds=int(rng.integers(TIME_RANGE_S)))
+      separator = "" if worker_assignment_nr == 0 else ", "
+      yield (
+        f"{separator}\"assignment{assignment_nr}\": {{"
+        f"\"hit\": \"hit{rng.integers(n_hits) + 1}\", "
+        f"\"device\": {devices_json[rng.integers(len(devices_json))]}, "
+        f"\"state\": {states_json[rng.integers(len(states_json))]}, "
+        f"\"time\": \"{time.strftime('%d.%m.%y %H:%M:%S')}\", "
+        f"\"ratings\": [{ratings}]}}"
+      )
+      rated_cells.extend(cells)
+    yield "}}"
+  yield "}}"
+
+
+def write_synthetic_result_json(study: SyntheticStudy, path: Path) -> None:
+  with open(path, mode="w", encoding="utf-8") as file:
+    for chunk in iter_synthetic_result_json(study):
+      file.write(chunk)
@@ -0,0 +1,49 @@
+import json
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from tts_mos_test_mturk_benchmarks.benchmarks import (BENCHMARKS, SIZES, get_environment,
+                                                      run_benchmarks)
+
+
+def main() -> None:
+  parser = ArgumentParser(
+    prog="python -m tts_mos_test_mturk_benchmarks",
+    description="Measure the time and the peak memory of the hot paths on synthetic studies of different sizes. The results are written as JSON, so that runs can be compared over time.",
+  )
+  parser.add_argument("--sizes", metavar="SIZE", nargs="+", choices=list(SIZES),
+                      help="study sizes", default=list(SIZES))
+  parser.add_argument("--benchmarks", metavar="BENCHMARK", nargs="+", choices=list(BENCHMARKS),
+                      help="run only these benchmarks", default=list(BENCHMARKS))
+  parser.add_argument("--repeat", metavar="N", type=int,
+                      help="count of timed runs of each benchmark", default=3)
+  parser.add_argument("--seed", metavar="SEED", type=int,
+                      help="seed of the synthetic studies", default=0)
+  parser.add_argument("--output", metavar="OUTPUT-JSON", type=Path,
+                      help="write the results to this file instead of stdout")
+  ns = parser.parse_args()
+  if ns.repeat <= 0:
+    parser.error("argument --repeat: Value needs to be greater than zero!")
+
+  def log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+  with TemporaryDirectory(prefix="tts-mos-test-mturk-benchmarks-") as tmp_dir:
+    results = list(run_benchmarks(ns.sizes, ns.benchmarks, ns.repeat, Path(tmp_dir), ns.seed, log))
+
+  output = json.dumps({
+    "environment": get_environment(),
+    "seed": ns.seed,
+    "results": results,
+  }, indent=2)
+  if ns.output is None:
+    print(output)
+  else:
+    ns.output.write_text(output, encoding="utf8")
+    log(f"Written results to: \"{ns.output.absolute()}\"")
+
+
+if __name__ == "__main__":
+  main()
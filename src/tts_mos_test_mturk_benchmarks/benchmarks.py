@@ -0,0 +1,294 @@
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+import numpy as np
+
+from tts_mos_test_mturk.common import get_ratings, get_ratings_view
+from tts_mos_test_mturk.correlations import get_mos_correlations
+from tts_mos_test_mturk.df_generation import (generate_approve_csv, generate_bonus_csv,
+                                              generate_reject_csv, get_mos_df)
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.io import save_obj
+from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk.masking.masks import AssignmentsMask, WorkersMask
+from tts_mos_test_mturk.masking.outlier_mask import mask_outliers_alg
+from tts_mos_test_mturk.result import Result, parse_result_from_json
+from tts_mos_test_mturk.result_json import parse_evaluation_data_from_json
+from tts_mos_test_mturk.statistics.algorithm_sentence_stats import get_algorithm_sentence_stats
+from tts_mos_test_mturk.statistics.algorithm_worker_stats import get_worker_algorithm_stats
+from tts_mos_test_mturk.statistics.worker_assignment_stats import get_worker_assignment_stats
+from tts_mos_test_mturk.synthetic import SyntheticStudy, write_synthetic_result_json
+
+SIZES: Dict[str, SyntheticStudy] = {
+  "small": SyntheticStudy(n_workers=40, n_assignments=8, n_ratings=10, n_algorithms=4, n_files=100),
+  "medium": SyntheticStudy(n_workers=400, n_assignments=12, n_ratings=16, n_algorithms=6, n_files=400, duplicate_ratings=0.02),
+  "large": SyntheticStudy(n_workers=1500, n_assignments=16, n_ratings=20, n_algorithms=8, n_files=1000, duplicate_ratings=0.02),
+}
+
+REJECTED_MASK = "rejected"
+OUTLIERS_MASK = "outliers"
+YOUNG_MASK = "young"
+
+
+@dataclass()
+class Study():
+  """the inputs of the benchmarks for one study size; they are prepared once and are not timed"""
+  json_path: Path
+  json_data: Dict[str, Any]
+  result: Result
+  data: EvaluationData
+  tmp_dir: Path
+
+
+# each benchmark prepares its inputs from the study and returns the method which is measured
+Benchmark = Callable[[Study], Callable[[], Any]]
+
+
+def clear_caches(data: EvaluationData) -> None:
+  """the methods should be measured without the results of previous runs"""
+  data.ratings_cache.clear()
+  data.merged_masks_cache.clear()
+
+
+def bench_parse_result_from_json(study: Study) -> Callable[[], Any]:
+  return lambda: parse_result_from_json(study.json_data)
+
+
+def bench_parse_evaluation_data_from_json(study: Study) -> Callable[[], Any]:
+  return lambda: parse_evaluation_data_from_json(study.json_path)
+
+
+def bench_evaluation_data_init(study: Study) -> Callable[[], Any]:
+  return lambda: EvaluationData(study.result)
+
+
+def bench_save_to_new_dir(study: Study) -> Callable[[], Any]:
+  # each run writes the whole project into another directory
+  paths = (study.tmp_dir / f"project-new-{i}" for i in count())
+  return lambda: study.data.save_to(next(paths))
+
+
+def bench_save_changed_mask(study: Study) -> Callable[[], Any]:
+  path = study.tmp_dir / "project-changed"
+  study.data.save_to(path)
+  data = EvaluationData.load(path)
+  mask = data.get_mask(REJECTED_MASK)
+
+  def method() -> Any:
+    # only the changed mask and the header are written again
+    mask.reverse()
+    data.save()
+  return method
+
+
+def bench_load(study: Study) -> Callable[[], Any]:
+  path = study.tmp_dir / "project-load"
+  study.data.save_to(path)
+  return lambda: EvaluationData.load(path)
+
+
+# projects were pickled by older versions; these are kept to compare with the results of older runs
+def bench_save_obj(study: Study) -> Callable[[], Any]:
+  path = study.tmp_dir / "data.pkl"
+  return lambda: save_obj(study.data, path)
+
+
+def bench_load_pickled(study: Study) -> Callable[[], Any]:
+  path = study.tmp_dir / "data.pkl"
+  save_obj(study.data, path)
+  return lambda: EvaluationData.load(path)
+
+
+def bench_get_ratings(study: Study) -> Callable[[], Any]:
+  def method() -> Any:
+    clear_caches(study.data)
+    return get_ratings(study.data, study.data.rating_names)
+  return method
+
+
+def bench_convert_wmask_to_rmask(study: Study) -> Callable[[], Any]:
+  factory = MaskFactory(study.data)
+  wmask = study.data.get_mask(YOUNG_MASK)
+  return lambda: factory.convert_mask_to_rmask(wmask)
+
+
+def bench_convert_amask_to_rmask(study: Study) -> Callable[[], Any]:
+  factory = MaskFactory(study.data)
+  amask = study.data.get_mask(REJECTED_MASK)
+  return lambda: factory.convert_mask_to_rmask(amask)
+
+
+def bench_convert_wmask_to_sparse_rmask(study: Study) -> Callable[[], Any]:
+  factory = MaskFactory(study.data)
+  wmask = study.data.get_mask(YOUNG_MASK)
+  return lambda: factory.convert_mask_to_sparse_rmask(wmask)
+
+
+def bench_convert_wmask_to_amask(study: Study) -> Callable[[], Any]:
+  factory = MaskFactory(study.data)
+  wmask = study.data.get_mask(YOUNG_MASK)
+  return lambda: factory.convert_mask_to_amask(wmask)
+
+
+def get_merge_benchmark(merge_method_name: str) -> Benchmark:
+  def benchmark(study: Study) -> Callable[[], Any]:
+    factory = MaskFactory(study.data)
+    masks = study.data.get_masks_from_names({REJECTED_MASK, OUTLIERS_MASK, YOUNG_MASK})
+    merge_method = getattr(factory, merge_method_name)
+
+    def method() -> Any:
+      clear_caches(study.data)
+      return merge_method(masks)
+    return method
+  return benchmark
+
+
+def get_correlations_benchmark(mode: str) -> Benchmark:
+  def benchmark(study: Study) -> Callable[[], Any]:
+    ratings = get_ratings(study.data, study.data.rating_names)
+    return lambda: get_mos_correlations(ratings, mode)
+  return benchmark
+
+
+def bench_mask_outliers_alg(study: Study) -> Callable[[], Any]:
+  ratings = get_ratings(study.data, study.data.rating_names)
+  return lambda: mask_outliers_alg(ratings, 2, np.inf)
+
+
+def get_data_benchmark(method: Callable[[EvaluationData], Any]) -> Benchmark:
+  """for the methods which use the caches of the project"""
+  def benchmark(study: Study) -> Callable[[], Any]:
+    def run() -> Any:
+      clear_caches(study.data)
+      return method(study.data)
+    return run
+  return benchmark
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+  "parse_result_from_json": bench_parse_result_from_json,
+  "parse_evaluation_data_from_json": bench_parse_evaluation_data_from_json,
+  "EvaluationData.__init__": bench_evaluation_data_init,
+  "EvaluationData.save_to (new directory)": bench_save_to_new_dir,
+  "EvaluationData.save (changed mask)": bench_save_changed_mask,
+  "EvaluationData.load": bench_load,
+  "io.save_obj (legacy pickle)": bench_save_obj,
+  "EvaluationData.load (legacy pickle)": bench_load_pickled,
+  "get_ratings": bench_get_ratings,
+  "MaskFactory.convert_mask_to_rmask (workers)": bench_convert_wmask_to_rmask,
+  "MaskFactory.convert_mask_to_rmask (assignments)": bench_convert_amask_to_rmask,
+  "MaskFactory.convert_mask_to_sparse_rmask (workers)": bench_convert_wmask_to_sparse_rmask,
+  "MaskFactory.convert_mask_to_amask (workers)": bench_convert_wmask_to_amask,
+  "MaskFactory.merge_masks_into_rmask": get_merge_benchmark("merge_masks_into_rmask"),
+  "MaskFactory.merge_masks_into_sparse_rmask": get_merge_benchmark("merge_masks_into_sparse_rmask"),
+  "MaskFactory.merge_masks_into_amask": get_merge_benchmark("merge_masks_into_amask"),
+  "MaskFactory.merge_masks_into_wmask": get_merge_benchmark("merge_masks_into_wmask"),
+  "get_mos_correlations (sentence)": get_correlations_benchmark("sentence"),
+  "get_mos_correlations (algorithm)": get_correlations_benchmark("algorithm"),
+  "get_mos_correlations (both)": get_correlations_benchmark("both"),
+  "mask_outliers_alg": bench_mask_outliers_alg,
+  "get_mos_df": get_data_benchmark(lambda data: get_mos_df(data, {REJECTED_MASK})),
+  "get_worker_algorithm_stats": get_data_benchmark(lambda data: get_worker_algorithm_stats(data, {REJECTED_MASK})),
+  "get_worker_assignment_stats": get_data_benchmark(lambda data: get_worker_assignment_stats(data, {REJECTED_MASK})),
+  "get_algorithm_sentence_stats": get_data_benchmark(lambda data: get_algorithm_sentence_stats(data, {REJECTED_MASK})),
+  "generate_approve_csv": get_data_benchmark(lambda data: generate_approve_csv(data, {REJECTED_MASK}, "Thank you!", 0.1, 0.2)),
+  "generate_reject_csv": get_data_benchmark(lambda data: generate_reject_csv(data, set(), {REJECTED_MASK}, "Sorry!")),
+  "generate_bonus_csv": get_data_benchmark(lambda data: generate_bonus_csv(data, {REJECTED_MASK, OUTLIERS_MASK}, 0.2, "Thank you!", 0.2)),
+}
+
+
+def add_masks(data: EvaluationData) -> None:
+  """adds the masks which are used by the benchmarks: one of each level"""
+  rejected = data.assignment_states == "Rejected"
+  data.add_or_update_mask(REJECTED_MASK, AssignmentsMask(rejected))
+  young = data.worker_age_groups == "18-29"
+  data.add_or_update_mask(YOUNG_MASK, WorkersMask(young))
+  ratings = get_ratings_view(data, data.rating_names)
+  factory = MaskFactory(data)
+  data.add_or_update_mask(OUTLIERS_MASK, factory.convert_ndarray_to_rmask(
+    mask_outliers_alg(ratings, 2, np.inf)))
+
+
+def create_study(settings: SyntheticStudy, tmp_dir: Path) -> Study:
+  json_path = tmp_dir / "result.json"
+  write_synthetic_result_json(settings, json_path)
+  with open(json_path, mode="r", encoding="utf-8") as file:
+    json_data = json.load(file)
+  result = parse_result_from_json(json_data)
+  data = EvaluationData(result)
+  add_masks(data)
+  return Study(json_path, json_data, result, data, tmp_dir)
+
+
+def measure(method: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+  """measures the time of each run and the peak of the memory allocated during an extra run (tracing slows down the run)"""
+  times = []
+  for _ in range(repeat):
+    gc.collect()
+    start = time.perf_counter()
+    method()
+    times.append(time.perf_counter() - start)
+
+  gc.collect()
+  tracemalloc.start()
+  try:
+    method()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+  return {
+    "times_s": times,
+    "min_s": min(times),
+    "median_s": median(times),
+    "peak_memory_bytes": peak_memory,
+  }
+
+
+def run_benchmarks(sizes: List[str], benchmark_names: List[str], repeat: int, tmp_dir: Path, seed: int = 0, log: Optional[Callable[[str], None]] = None) -> Generator[Dict[str, Any], None, None]:
+  """yields the measurements of each benchmark on each study size"""
+  for size in sizes:
+    settings = replace(SIZES[size], seed=seed)
+    study_dir = tmp_dir / size
+    study_dir.mkdir(parents=True, exist_ok=True)
+    study = create_study(settings, study_dir)
+    for name in benchmark_names:
+      if log is not None:
+        log(f"Running \"{name}\" on the {size} study ...")
+      method = BENCHMARKS[name](study)
+      measurements = measure(method, repeat)
+      yield {
+        "benchmark": name,
+        "size": size,
+        "workers": study.data.n_workers,
+        "assignments": study.data.n_assignments,
+        "ratings": study.data.n_ratings,
+        "repeat": repeat,
+        **measurements,
+      }
+    # release the study before the next one is created
+    del study
+
+
+def get_environment() -> Dict[str, Any]:
+  from importlib.metadata import version
+
+  import pandas as pd
+  return {
+    "date": datetime.now().isoformat(timespec="seconds"),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "processor": platform.processor(),
+    "tts-mos-test-mturk": version("tts-mos-test-mturk"),
+    "numpy": np.__version__,
+    "pandas": pd.__version__,
+  }
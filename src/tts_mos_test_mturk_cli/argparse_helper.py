@@ -5,13 +5,14 @@ from argparse import ArgumentTypeError
 from datetime import datetime
 from functools import partial
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, TypeVar
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, TypeVar
 
-import pandas as pd
 from ordered_set import OrderedSet
 
-from tts_mos_test_mturk.evaluation_data import EvaluationData
-from tts_mos_test_mturk.masking.masks import REVERSE_INDICATOR
+if TYPE_CHECKING:
+  import pandas as pd
+
+  from tts_mos_test_mturk.evaluation_data import EvaluationData
 
 T = TypeVar("T")
 
@@ -30,16 +31,20 @@ class ConvertToSetAction(argparse._StoreAction):
     super().__call__(parser, namespace, values, option_string)
 
 
-def parse_project(value: str) -> EvaluationData:
+def parse_project(value: str) -> "EvaluationData":
+  # numpy is imported lazily to keep the startup of the CLI fast
+  from tts_mos_test_mturk_cli.helper import load_project
   path = parse_path(value)
   try:
-    project = EvaluationData.load(path)
+    project = load_project(path)
   except Exception as ex:
     raise ArgumentTypeError("Project couldn't be parsed!") from ex
   return project
 
 
-def parse_data_frame(value: str) -> pd.DataFrame:
+def parse_data_frame(value: str) -> "pd.DataFrame":
+  # pandas is imported lazily to keep the startup of the CLI fast
+  import pandas as pd
   path = parse_path(value)
   try:
     df = pd.read_csv(path)
@@ -125,6 +130,7 @@ def parse_non_empty_or_whitespace(value: str) -> str:
 
 
 def parse_output_mask_name(value: str) -> str:
+  from tts_mos_test_mturk.masking.masks import REVERSE_INDICATOR
   value = parse_non_empty_or_whitespace(value)
   if value.startswith(REVERSE_INDICATOR):
     raise ArgumentTypeError(f"Value must not start with \"{REVERSE_INDICATOR}\"!")
@@ -1,15 +1,17 @@
 import argparse
+import json
 import logging
+import os
 import platform
 import sys
 from argparse import ArgumentParser
-from importlib.metadata import version
+from importlib import import_module
 from logging import getLogger
 from pathlib import Path
 from pkgutil import iter_modules
 from tempfile import gettempdir
 from time import perf_counter
-from typing import Callable, Generator, List, Tuple
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 
 from tts_mos_test_mturk.logging import (attach_urllib3_to_detail_logger, get_detail_logger,
                                         get_logger)
@@ -18,19 +20,75 @@ from tts_mos_test_mturk_cli.globals import APP_NAME
 from tts_mos_test_mturk_cli.logging_configuration import (configure_root_logger, get_file_logger,
                                                           init_and_return_loggers,
                                                           try_init_file_buffer_logger)
-from tts_mos_test_mturk_cli.parsers import *
 from tts_mos_test_mturk_cli.types import CLIError
 
-__version__ = version(APP_NAME)
-
 INVOKE_HANDLER_VAR = "invoke_handler"
 DEFAULT_LOGGING_BUFFER_CAP = 1000000000
+ENVIRONMENT_CACHE_PATH = Path(gettempdir()) / f"{APP_NAME}-environment.json"
+
+INIT_PARSER = "tts_mos_test_mturk_cli.parsers.init_parser"
+MASKS_PARSERS = "tts_mos_test_mturk_cli.parsers.masks_parsers"
+STATS_PARSERS = "tts_mos_test_mturk_cli.parsers.stats_parsers"
+MTURK_PARSERS = "tts_mos_test_mturk_cli.parsers.mturk_parsers"
+RUN_PARSER = "tts_mos_test_mturk_cli.parsers.run_parser"
+SERVE_PARSER = "tts_mos_test_mturk_cli.parsers.serve_parser"
+GENERATE_PARSER = "tts_mos_test_mturk_cli.parsers.generate_parser"
+
+# module and name of the method which initializes the parser of a command; the module is only imported if the command is selected
+ParserMethod = Tuple[str, str]
+Parsers = Generator[Tuple[str, str, ParserMethod], None, None]
+
+
+def get_version() -> str:
+  # importlib.metadata is imported lazily because it is slow
+  from importlib.metadata import version
+  return version(APP_NAME)
 
-Parsers = Generator[Tuple[str, str, Callable], None, None]
 
+def __getattr__(name: str) -> Any:
+  # the version is only determined on access because it is slow
+  if name == "__version__":
+    return get_version()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-Parsers = Generator[Tuple[str, str, Callable[[ArgumentParser],
-                                             Callable[..., None]]], None, None]
+
+class VersionAction(argparse._VersionAction):
+  def __call__(self, parser: ArgumentParser, namespace: argparse.Namespace, values: Any, option_string: Optional[str] = None):
+    self.version = f"%(prog)s {get_version()}"
+    super().__call__(parser, namespace, values, option_string)
+
+
+def get_environment_key() -> List[Any]:
+  # the modification times of the directories change if packages are (un)installed
+  entries = []
+  for entry in sys.path:
+    try:
+      entries.append([entry, os.stat(entry or ".").st_mtime])
+    except OSError:
+      entries.append([entry, None])
+  return [sys.version, entries]
+
+
+def get_environment() -> Dict[str, Any]:
+  """returns the version and the installed modules; scanning the modules is slow, so they are cached until sys.path changes"""
+  key = get_environment_key()
+  try:
+    cache = json.loads(ENVIRONMENT_CACHE_PATH.read_text("UTF-8"))
+    if cache["key"] == key:
+      return cache["environment"]
+  except (OSError, ValueError, KeyError, TypeError):
+    pass
+  environment = {
+    "version": get_version(),
+    "modules": sorted(p.name for p in iter_modules()),
+  }
+  try:
+    tmp_path = ENVIRONMENT_CACHE_PATH.parent / f".{ENVIRONMENT_CACHE_PATH.name}.{os.getpid()}.tmp"
+    tmp_path.write_text(json.dumps({"key": key, "environment": environment}), "UTF-8")
+    os.replace(tmp_path, ENVIRONMENT_CACHE_PATH)
+  except OSError:
+    pass
+  return environment
 
 
 def formatter(prog):
@@ -38,43 +96,47 @@ def formatter(prog):
 
 
 def get_masks_parsers() -> Parsers:
-  yield "create", "create empty mask", init_create_mask_parser
-  yield "mask-workers-by-id", "mask workers by their WorkerId", init_mask_workers_by_id_parser
-  yield "mask-workers-by-age-group", "mask workers by their age group", init_mask_workers_by_age_group_parser
-  yield "mask-workers-by-gender", "mask workers by their gender", init_mask_workers_by_gender_parser
-  yield "mask-workers-by-assignments-count", "mask workers by their count of assignments", init_mask_workers_by_assignments_count_parser
-  yield "mask-workers-by-masked-ratings-count", "mask workers by their count of masked ratings", init_workers_by_masked_ratings_count_parser
-  yield "mask-workers-by-correlation", "mask workers by their algorithm/sentence correlation", init_mask_workers_by_correlation_parser
-  yield "mask-workers-by-correlation-percent", "mask workers by their algorithm/sentence correlation (percentage-wise)", init_mask_workers_by_correlation_percent_parser
-  yield "mask-assignments-by-id", "mask assignments by their AssignmentId", init_mask_assignments_by_id_parser
-  yield "mask-assignments-by-device", "mask assignments by their listening device", get_mask_assignments_by_device_parser
-  yield "mask-assignments-by-status", "mask assignments by their status", get_mask_assignments_by_status_parser
-  yield "mask-assignments-by-time", "mask assignments by their submit time", init_mask_assignments_by_time_parser
-  yield "mask-rating-outliers", "mask outlying ratings", init_mask_rating_outliers_parser
-  yield "merge-masks", "merge masks together", init_merge_masks_parser
-  yield "reverse-mask", "reverse mask", init_reverse_masks_parser
+  yield "create", "create empty mask", (MASKS_PARSERS, "init_create_mask_parser")
+  yield "mask-workers-by-id", "mask workers by their WorkerId", (MASKS_PARSERS, "init_mask_workers_by_id_parser")
+  yield "mask-workers-by-age-group", "mask workers by their age group", (MASKS_PARSERS, "init_mask_workers_by_age_group_parser")
+  yield "mask-workers-by-gender", "mask workers by their gender", (MASKS_PARSERS, "init_mask_workers_by_gender_parser")
+  yield "mask-workers-by-assignments-count", "mask workers by their count of assignments", (MASKS_PARSERS, "init_mask_workers_by_assignments_count_parser")
+  yield "mask-workers-by-masked-ratings-count", "mask workers by their count of masked ratings", (MASKS_PARSERS, "init_workers_by_masked_ratings_count_parser")
+  yield "mask-workers-by-correlation", "mask workers by their algorithm/sentence correlation", (MASKS_PARSERS, "init_mask_workers_by_correlation_parser")
+  yield "mask-workers-by-correlation-percent", "mask workers by their algorithm/sentence correlation (percentage-wise)", (MASKS_PARSERS, "init_mask_workers_by_correlation_percent_parser")
+  yield "mask-assignments-by-id", "mask assignments by their AssignmentId", (MASKS_PARSERS, "init_mask_assignments_by_id_parser")
+  yield "mask-assignments-by-device", "mask assignments by their listening device", (MASKS_PARSERS, "get_mask_assignments_by_device_parser")
+  yield "mask-assignments-by-status", "mask assignments by their status", (MASKS_PARSERS, "get_mask_assignments_by_status_parser")
+  yield "mask-assignments-by-time", "mask assignments by their submit time", (MASKS_PARSERS, "init_mask_assignments_by_time_parser")
+  yield "mask-rating-outliers", "mask outlying ratings", (MASKS_PARSERS, "init_mask_rating_outliers_parser")
+  yield "merge-masks", "merge masks together", (MASKS_PARSERS, "init_merge_masks_parser")
+  yield "reverse-mask", "reverse mask", (MASKS_PARSERS, "init_reverse_masks_parser")
 
 
 def get_stats_parsers() -> Parsers:
-  yield "print-mos", "print MOS and CI95", init_print_mos_parser
-  yield "print-masking-stats", "print masking statistics", init_print_masking_stats_parser
-  yield "print-worker-stats", "print worker statistics for each algorithm", init_print_worker_stats_parser
-  yield "print-assignment-stats", "print assignment statistics for each worker", init_print_assignment_stats_parser
-  yield "print-sentence-stats", "print sentence statistics for each algorithm", init_print_sentence_stats_parser
-  yield "print-data", "print all data points", init_print_data_parser
+  yield "print-mos", "print MOS and CI95", (STATS_PARSERS, "init_print_mos_parser")
+  yield "print-masking-stats", "print masking statistics", (STATS_PARSERS, "init_print_masking_stats_parser")
+  yield "print-worker-stats", "print worker statistics for each algorithm", (STATS_PARSERS, "init_print_worker_stats_parser")
+  yield "print-assignment-stats", "print assignment statistics for each worker", (STATS_PARSERS, "init_print_assignment_stats_parser")
+  yield "print-sentence-stats", "print sentence statistics for each algorithm", (STATS_PARSERS, "init_print_sentence_stats_parser")
+  yield "print-data", "print all data points", (STATS_PARSERS, "init_print_data_parser")
 
 
 def get_mturk_parsers() -> Parsers:
-  yield "prepare-approval", "generate approval file", init_prepare_approval_parser
-  yield "prepare-rejection", "generate rejection file", init_prepare_rejection_parser
-  yield "prepare-bonus-payment", "generate bonus payment file", init_prepare_bonus_payment_parser
+  yield "prepare-approval", "generate approval file", (MTURK_PARSERS, "init_prepare_approval_parser")
+  yield "prepare-rejection", "generate rejection file", (MTURK_PARSERS, "init_prepare_rejection_parser")
+  yield "prepare-bonus-payment", "generate bonus payment file", (MTURK_PARSERS, "init_prepare_bonus_payment_parser")
 
 
 def get_parsers():
-  yield "init", "initialize project from .json-file", init_init_project_parser
+  yield "init", "initialize project from .json-file", (INIT_PARSER, "init_init_project_parser")
+  yield "append", "append results of a new batch from .json-file", (INIT_PARSER, "init_append_results_parser")
   yield "masks", "masks commands", list(get_masks_parsers())
   yield "stats", "stats commands", list(get_stats_parsers())
   yield "mturk", "mturk commands", list(get_mturk_parsers())
+  yield "run", "run multiple commands from a pipeline file", (RUN_PARSER, "init_run_pipeline_parser")
+  yield "serve", "serve statistics and commands over a local JSON API", (SERVE_PARSER, "init_serve_parser")
+  yield "generate", "generate .json-file of a synthetic study", (GENERATE_PARSER, "init_generate_result_parser")
 
 
 def print_features():
@@ -100,13 +162,30 @@ def add_logging_group(parser: ArgumentParser) -> None:
                              help="include debugging information in log")
 
 
-def _init_parser():
+def get_selected_commands(args: List[str]) -> List[str]:
+  # the commands precede the arguments of the selected command
+  return [arg for arg in args if not arg.startswith("-")][:2]
+
+
+def init_method_parser(method_parser: ArgumentParser, method: ParserMethod) -> None:
+  module_name, method_name = method
+  init_method = getattr(import_module(module_name), method_name)
+  invoke_method = init_method(method_parser)
+  method_parser.set_defaults(**{
+    INVOKE_HANDLER_VAR: invoke_method,
+  })
+  add_logging_group(method_parser)
+
+
+def _init_parser(args: Optional[List[str]] = None):
+  """initializes the parser; if args are given, only the parser of the selected command is initialized (and its module imported)"""
   main_parser = ArgumentParser(
     formatter_class=formatter,
     description="CLI to evaluate text-to-speech MOS studies done on MTurk.",
   )
-  main_parser.add_argument('-v', '--version', action='version', version='%(prog)s ' + __version__)
+  main_parser.add_argument('-v', '--version', action=VersionAction)
   subparsers = main_parser.add_subparsers(help="description")
+  selected_commands = None if args is None else get_selected_commands(args)
 
   parsers = get_parsers()
   for parser_name, help_str, methods in parsers:
@@ -117,22 +196,16 @@ def _init_parser():
       for command, description, method in methods:
         method_parser = subparsers_of_subparser.add_parser(
           command, help=description, formatter_class=formatter)
-        invoke_method = method(method_parser)
-        method_parser.set_defaults(**{
-          INVOKE_HANDLER_VAR: invoke_method,
-        })
-        add_logging_group(method_parser)
+        if selected_commands is None or selected_commands == [parser_name, command]:
+          init_method_parser(method_parser, method)
     else:
       command = parser_name
       description = help_str
       method = methods
       method_parser = subparsers.add_parser(
         command, help=description, formatter_class=formatter)
-      invoke_method = method(method_parser)
-      method_parser.set_defaults(**{
-        INVOKE_HANDLER_VAR: invoke_method,
-      })
-      add_logging_group(method_parser)
+      if selected_commands is None or selected_commands[:1] == [command]:
+        init_method_parser(method_parser, method)
   return main_parser
 
 
@@ -163,7 +236,7 @@ def parse_args(args: List[str]) -> None:
   if local_debugging:
     root_logger.debug(f"Received arguments: {str(args)}")
 
-  parser = _init_parser()
+  parser = _init_parser(args)
 
   try:
     ns = parser.parse_args(args)
@@ -192,9 +265,10 @@ def parse_args(args: List[str]) -> None:
   flogger = get_file_logger()
   if not local_debugging:
     sys_version = sys.version.replace('\n', '')
-    flogger.debug(f"CLI version: {__version__}")
+    environment = get_environment()
+    flogger.debug(f"CLI version: {environment['version']}")
     flogger.debug(f"Python version: {sys_version}")
-    flogger.debug("Modules: %s", ', '.join(sorted(p.name for p in iter_modules())))
+    flogger.debug("Modules: %s", ', '.join(environment["modules"]))
 
     my_system = platform.uname()
     flogger.debug(f"System: {my_system.system}")
@@ -12,7 +12,7 @@ def add_req_ratings_argument(parser: ArgumentParser) -> None:
 
 def add_req_project_argument(parser: ArgumentParser) -> None:
   parser.add_argument("project", type=parse_project, metavar="PROJECT-PATH",
-                      help="project file (.pkl)")
+                      help="project directory")
 
 
 def add_opt_masks_argument(parser: ArgumentParser) -> None:
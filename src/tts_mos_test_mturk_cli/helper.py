@@ -1,16 +1,20 @@
 import json
 import os
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Generator
+from typing import TYPE_CHECKING, Dict, Generator, List, Optional, Tuple
+from typing import OrderedDict as ODType
 
 import numpy as np
-import pandas as pd
 
 from tts_mos_test_mturk.evaluation_data import EvaluationData
 from tts_mos_test_mturk_cli.globals import DISPLAY_PRECISION
-from tts_mos_test_mturk_cli.logging_configuration import get_cli_logger
+from tts_mos_test_mturk_cli.logging_configuration import get_cli_logger, get_file_logger
 from tts_mos_test_mturk_cli.types import CLIError
 
+if TYPE_CHECKING:
+  import pandas as pd
+
 
 def get_all_files_in_all_subfolders(directory: Path) -> Generator[Path, None, None]:
   for root, _, files in os.walk(directory):
@@ -19,8 +23,73 @@ def get_all_files_in_all_subfolders(directory: Path) -> Generator[Path, None, No
       yield file_path
 
 
+# projects of the running pipeline (see "run" and "serve") by their absolute path; they are loaded once and saved after the last command or on request
+__pipeline_projects: Optional[ODType[Path, EvaluationData]] = None
+__changed_pipeline_projects: ODType[Path, EvaluationData] = OrderedDict()
+
+
+def start_pipeline() -> None:
+  global __pipeline_projects
+  assert __pipeline_projects is None
+  __pipeline_projects = OrderedDict()
+  __changed_pipeline_projects.clear()
+
+
+def stop_pipeline() -> List[EvaluationData]:
+  """stops the pipeline and returns the projects which need to be saved"""
+  global __pipeline_projects
+  assert __pipeline_projects is not None
+  __pipeline_projects = None
+  return pop_changed_projects()
+
+
+def get_pipeline_projects() -> List[Tuple[EvaluationData, bool]]:
+  """returns the loaded projects of the pipeline and whether they were changed"""
+  assert __pipeline_projects is not None
+  return [
+    (project, path in __changed_pipeline_projects)
+    for path, project in __pipeline_projects.items()
+  ]
+
+
+def pop_changed_projects(path: Optional[Path] = None) -> List[EvaluationData]:
+  """returns the changed projects (or only the one at path) which need to be saved and marks them as unchanged"""
+  if path is None:
+    result = list(__changed_pipeline_projects.values())
+    __changed_pipeline_projects.clear()
+    return result
+  key = path.absolute()
+  if key not in __changed_pipeline_projects:
+    return []
+  return [__changed_pipeline_projects.pop(key)]
+
+
+def unload_project(path: Path) -> bool:
+  """removes the project from the pipeline without saving it, i.e., it is loaded again on the next access"""
+  assert __pipeline_projects is not None
+  key = path.absolute()
+  __changed_pipeline_projects.pop(key, None)
+  return __pipeline_projects.pop(key, None) is not None
+
+
+def load_project(path: Path) -> EvaluationData:
+  if __pipeline_projects is None:
+    return EvaluationData.load(path)
+  key = path.absolute()
+  if key not in __pipeline_projects:
+    __pipeline_projects[key] = EvaluationData.load(path)
+  return __pipeline_projects[key]
+
+
 def save_project(project: EvaluationData):
   logger = get_cli_logger()
+  if __pipeline_projects is not None:
+    # the project is saved after the last command of the pipeline or on request
+    key = project.file_path.absolute()
+    __pipeline_projects[key] = project
+    __changed_pipeline_projects[key] = project
+    get_file_logger().debug(f"Project at \"{key}\" will be saved later.")
+    return
   try:
     project.save()
   except Exception as ex:
@@ -28,7 +97,9 @@ def save_project(project: EvaluationData):
   logger.info(f"Updated project at: \"{project.file_path.absolute()}\"")
 
 
-def log_full_df(df: pd.DataFrame) -> None:
+def log_full_df(df: "pd.DataFrame") -> None:
+  # pandas is imported lazily to keep the startup of the CLI fast
+  import pandas as pd
   logger = get_cli_logger()
   with pd.option_context(
     'display.max_rows', None,
@@ -38,7 +109,7 @@ def log_full_df(df: pd.DataFrame) -> None:
     logger.info(f"\n{df.to_string(index=False)}")
 
 
-def save_csv(path: Path, df: pd.DataFrame, output_name: str = "output") -> None:
+def save_csv(path: Path, df: "pd.DataFrame", output_name: str = "output") -> None:
   logger = get_cli_logger()
   try:
     df.to_csv(path, index=False)
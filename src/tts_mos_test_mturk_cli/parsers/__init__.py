@@ -1,4 +0,0 @@
-from tts_mos_test_mturk_cli.parsers.init_parser import *
-from tts_mos_test_mturk_cli.parsers.masks_parsers import *
-from tts_mos_test_mturk_cli.parsers.mturk_parsers import *
-from tts_mos_test_mturk_cli.parsers.stats_parsers import *
@@ -0,0 +1,62 @@
+from argparse import ArgumentParser, Namespace
+
+from tts_mos_test_mturk.synthetic import SyntheticStudy, validate_study, write_synthetic_result_json
+from tts_mos_test_mturk_cli.argparse_helper import (ConvertToOrderedSetAction, parse_integer,
+                                                    parse_non_empty_or_whitespace, parse_path,
+                                                    parse_percent, parse_positive_integer)
+from tts_mos_test_mturk_cli.logging_configuration import get_cli_logger
+from tts_mos_test_mturk_cli.types import CLIError
+
+
+def init_generate_result_parser(parser: ArgumentParser):
+  default = SyntheticStudy()
+  parser.description = "Generate the results (.json-file) of a synthetic study with random votes, e.g., for benchmarking. The file is written while it is generated, therefore also very large studies can be generated. The same arguments and seed generate the same file."
+  parser.add_argument("output", type=parse_path, metavar="OUTPUT-RESULT-JSON",
+                      help="output path of the results (.json-file)")
+  parser.add_argument("--workers", type=parse_positive_integer, metavar="N",
+                      help="count of workers", default=default.n_workers)
+  parser.add_argument("--assignments", type=parse_positive_integer, metavar="N",
+                      help="count of assignments of each worker", default=default.n_assignments)
+  parser.add_argument("--ratings", type=parse_positive_integer, metavar="N",
+                      help="count of ratings of each assignment", default=default.n_ratings)
+  parser.add_argument("--algorithms", type=parse_positive_integer, metavar="N",
+                      help="count of algorithms", default=default.n_algorithms)
+  parser.add_argument("--files", type=parse_positive_integer, metavar="N",
+                      help="count of files", default=default.n_files)
+  parser.add_argument("--rating-names", type=parse_non_empty_or_whitespace, metavar="RATING-NAME", nargs="+",
+                      help="names of the ratings", default=default.rating_names, action=ConvertToOrderedSetAction)
+  parser.add_argument("--duplicates", type=parse_percent, metavar="PERCENT",
+                      help="percentage of ratings which rate an algorithm/file combination again that the worker rated already in an earlier assignment", default=default.duplicate_ratings * 100)
+  parser.add_argument("--devices", type=parse_non_empty_or_whitespace, metavar="DEVICE", nargs="+",
+                      help="listening devices", default=default.devices, action=ConvertToOrderedSetAction)
+  parser.add_argument("--states", type=parse_non_empty_or_whitespace, metavar="STATUS", nargs="+",
+                      help="assignment states", default=default.states, action=ConvertToOrderedSetAction)
+  parser.add_argument("--seed", type=parse_integer, metavar="SEED",
+                      help="seed of the random generator", default=default.seed)
+
+  def main(ns: Namespace) -> None:
+    study = SyntheticStudy(
+      n_workers=ns.workers,
+      n_assignments=ns.assignments,
+      n_ratings=ns.ratings,
+      n_algorithms=ns.algorithms,
+      n_files=ns.files,
+      rating_names=tuple(ns.rating_names),
+      duplicate_ratings=ns.duplicates / 100,
+      devices=tuple(ns.devices),
+      states=tuple(ns.states),
+      seed=ns.seed,
+    )
+    try:
+      validate_study(study)
+    except ValueError as ex:
+      raise CLIError(f"Study couldn't be generated! {ex.args[0]}") from ex
+
+    logger = get_cli_logger()
+    try:
+      write_synthetic_result_json(study, ns.output)
+    except Exception as ex:
+      raise CLIError(f"Results couldn't be written to \"{ns.output.absolute()}\"!") from ex
+    logger.info(f"Generated {study.n_workers} workers, {study.n_workers * study.n_assignments} assignments and {len(study.rating_names)} x {study.n_workers * study.n_assignments * study.n_ratings} ratings for {study.n_algorithms} algorithms and {study.n_files} files.")
+    logger.info(f"Written results to: \"{ns.output.absolute()}\"")
+  return main
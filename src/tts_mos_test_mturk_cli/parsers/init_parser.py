@@ -1,25 +1,51 @@
 from argparse import ArgumentParser, Namespace
 
-from tts_mos_test_mturk.evaluation_data import EvaluationData
-from tts_mos_test_mturk.result import parse_result_from_json
-from tts_mos_test_mturk_cli.argparse_helper import parse_json, parse_path
+from tts_mos_test_mturk.result_json import parse_evaluation_data_from_json
+from tts_mos_test_mturk_cli.argparse_helper import parse_existing_file, parse_path
+from tts_mos_test_mturk_cli.default_args import add_req_project_argument
 from tts_mos_test_mturk_cli.helper import save_project
 from tts_mos_test_mturk_cli.logging_configuration import get_cli_logger
+from tts_mos_test_mturk_cli.types import CLIError
 
 
 def init_init_project_parser(parser: ArgumentParser):
   parser.description = "Initialize a project from the ground truth and batch results."
-  parser.add_argument("result_json", type=parse_json, metavar="RESULT-JSON",
+  parser.add_argument("result_json", type=parse_existing_file, metavar="RESULT-JSON",
                       help="path containing the results (.json-file)")
   parser.add_argument("output", type=parse_path, metavar="OUTPUT-PROJECT-PATH",
-                      help="output project file (.pkl)")
+                      help="output project directory")
 
   def main(ns: Namespace) -> None:
-    result = parse_result_from_json(ns.result_json)
-    data = EvaluationData(result)
+    try:
+      data = parse_evaluation_data_from_json(ns.result_json)
+    except ValueError as ex:
+      raise CLIError(f"Results couldn't be parsed! {ex.args[0]}") from ex
     data.file_path = ns.output
     logger = get_cli_logger()
     logger.info(f"Parsed {data.n_workers} workers, {data.n_assignments} assignments and {len(data.rating_names)} x {data.n_ratings} ratings for {data.n_algorithms} algorithms and {data.n_files} files.")
 
     save_project(data)
   return main
+
+
+def init_append_results_parser(parser: ArgumentParser):
+  parser.description = "Append the results of a new batch to a project. Existing masks are kept and don't mask the new workers, assignments and ratings."
+  add_req_project_argument(parser)
+  parser.add_argument("result_json", type=parse_existing_file, metavar="RESULT-JSON",
+                      help="path containing the results of the new batch (.json-file)")
+
+  def main(ns: Namespace) -> None:
+    try:
+      batch = parse_evaluation_data_from_json(ns.result_json)
+    except ValueError as ex:
+      raise CLIError(f"Results couldn't be parsed! {ex.args[0]}") from ex
+    try:
+      ns.project.append(batch)
+    except ValueError as ex:
+      raise CLIError(f"Results couldn't be appended! {ex.args[0]}") from ex
+    logger = get_cli_logger()
+    logger.info(f"Appended {batch.n_workers} workers, {batch.n_assignments} assignments and {len(batch.rating_names)} x {batch.n_ratings} ratings for {batch.n_algorithms} algorithms and {batch.n_files} files.")
+    logger.info(f"The project contains now {ns.project.n_workers} workers, {ns.project.n_assignments} assignments and {len(ns.project.rating_names)} x {ns.project.n_ratings} ratings for {ns.project.n_algorithms} algorithms and {ns.project.n_files} files.")
+
+    save_project(ns.project)
+  return main
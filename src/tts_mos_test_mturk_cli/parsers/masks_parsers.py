@@ -4,21 +4,7 @@ from datetime import datetime
 from typing import cast
 
 from tts_mos_test_mturk.evaluation_data import EvaluationData
-from tts_mos_test_mturk.masking.age_group_mask import mask_workers_by_age_group
-from tts_mos_test_mturk.masking.assignment_count_mask import mask_workers_by_assignment_count
-from tts_mos_test_mturk.masking.assignment_id_mask import mask_assignments_by_id
-from tts_mos_test_mturk.masking.gender_mask import mask_workers_by_gender
-from tts_mos_test_mturk.masking.listening_device_mask import mask_assignments_by_listening_device
 from tts_mos_test_mturk.masking.mask_factory import MaskFactory
-from tts_mos_test_mturk.masking.masked_count_mask import mask_ratings_by_masked_count
-from tts_mos_test_mturk.masking.merge import merge_masks
-from tts_mos_test_mturk.masking.outlier_mask import mask_outlying_ratings
-from tts_mos_test_mturk.masking.reverse import reverse_mask
-from tts_mos_test_mturk.masking.state_mask import mask_assignments_by_state
-from tts_mos_test_mturk.masking.time_mask import mask_assignments_by_time
-from tts_mos_test_mturk.masking.worker_correlation_mask import (mask_workers_by_correlation,
-                                                                mask_workers_by_correlation_percent)
-from tts_mos_test_mturk.masking.worker_id_mask import mask_workers_by_id
 from tts_mos_test_mturk_cli.argparse_helper import (ConvertToSetAction, parse_datetime,
                                                     parse_non_empty_or_whitespace,
                                                     parse_non_negative_float,
@@ -32,6 +18,8 @@ from tts_mos_test_mturk_cli.validation import (ensure_assignments_exists, ensure
                                                ensure_masks_exist, ensure_ratings_exist,
                                                ensure_workers_exist)
 
+# the masking modules are imported in the handlers to keep the startup of the CLI fast
+
 
 def get_mask_assignments_by_device_parser(parser: ArgumentParser):
   parser.description = "Mask assignments by their listening devices."
@@ -43,6 +31,7 @@ def get_mask_assignments_by_device_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.listening_device_mask import mask_assignments_by_listening_device
     ensure_masks_exist(ns.project, ns.masks)
     mask_assignments_by_listening_device(ns.project, ns.masks, ns.devices, ns.output_mask)
 
@@ -61,6 +50,7 @@ def get_mask_assignments_by_status_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.state_mask import mask_assignments_by_state
     ensure_masks_exist(ns.project, ns.masks)
     mask_assignments_by_state(ns.project, ns.masks, ns.states, ns.output_mask)
 
@@ -81,6 +71,7 @@ def init_mask_assignments_by_time_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.time_mask import mask_assignments_by_time
     ensure_masks_exist(ns.project, ns.masks)
     mask_assignments_by_time(ns.project, ns.masks, ns.from_time, ns.to_time, ns.output_mask)
 
@@ -102,6 +93,7 @@ def init_mask_rating_outliers_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.outlier_mask import mask_outlying_ratings
     ensure_masks_exist(ns.project, ns.masks)
     ensure_ratings_exist(ns.project, ns.ratings)
     mask_outlying_ratings(ns.project, ns.masks, ns.from_threshold,
@@ -126,6 +118,7 @@ def init_workers_by_masked_ratings_count_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.masked_count_mask import mask_ratings_by_masked_count
     ensure_masks_exist(ns.project, ns.masks)
     mask_ratings_by_masked_count(ns.project, ns.masks, ns.ref_masks,
                                  ns.from_percent / 100, ns.to_percent / 100, ns.output_mask)
@@ -147,6 +140,7 @@ def init_mask_workers_by_assignments_count_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.assignment_count_mask import mask_workers_by_assignment_count
     ensure_masks_exist(ns.project, ns.masks)
     mask_workers_by_assignment_count(
       ns.project, ns.masks, ns.from_count, ns.to_count, ns.output_mask)
@@ -166,6 +160,7 @@ def init_mask_workers_by_id_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.worker_id_mask import mask_workers_by_id
     ensure_masks_exist(ns.project, ns.masks)
     ensure_workers_exist(ns.project, ns.worker_ids)
     mask_workers_by_id(
@@ -186,6 +181,7 @@ def init_mask_assignments_by_id_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.assignment_id_mask import mask_assignments_by_id
     ensure_masks_exist(ns.project, ns.masks)
     ensure_assignments_exists(ns.project, ns.assignment_ids)
     mask_assignments_by_id(
@@ -230,6 +226,7 @@ def init_mask_workers_by_age_group_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.age_group_mask import mask_workers_by_age_group
     ensure_masks_exist(ns.project, ns.masks)
     # maybe not useful to check
     # ensure_age_groups_exist(ns.project, ns.age_groups)
@@ -250,6 +247,7 @@ def init_mask_workers_by_gender_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.gender_mask import mask_workers_by_gender
     ensure_masks_exist(ns.project, ns.masks)
     # maybe not useful to check
     # ensure_genders_exist(ns.project, ns.age_groups)
@@ -269,6 +267,7 @@ def init_merge_masks_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.merge import merge_masks
     ensure_masks_exist(ns.project, ns.masks)
     # maybe not useful to check
     # ensure_genders_exist(ns.project, ns.age_groups)
@@ -289,6 +288,7 @@ def init_reverse_masks_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.reverse import reverse_mask
     ensure_mask_exists(ns.project, ns.mask)
     reverse_mask(ns.project, ns.mask, ns.output_mask)
 
@@ -313,6 +313,7 @@ def init_mask_workers_by_correlation_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.worker_correlation_mask import mask_workers_by_correlation
     ensure_masks_exist(ns.project, ns.masks)
     ensure_ratings_exist(ns.project, ns.ratings)
     mask_workers_by_correlation(ns.project, ns.masks, ns.from_threshold,
@@ -339,6 +340,7 @@ def init_mask_workers_by_correlation_percent_parser(parser: ArgumentParser):
   add_opt_dry_argument(parser)
 
   def main(ns: Namespace) -> None:
+    from tts_mos_test_mturk.masking.worker_correlation_mask import mask_workers_by_correlation_percent
     ensure_masks_exist(ns.project, ns.masks)
     ensure_ratings_exist(ns.project, ns.ratings)
     mask_workers_by_correlation_percent(ns.project, ns.masks, ns.from_percent / 100,
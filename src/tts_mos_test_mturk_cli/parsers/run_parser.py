@@ -0,0 +1,104 @@
+import io
+import shlex
+import sys
+from argparse import ArgumentParser, Namespace
+from collections import OrderedDict
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Callable, List, Tuple, cast
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk_cli.argparse_helper import parse_path
+from tts_mos_test_mturk_cli.default_args import add_opt_dry_argument
+from tts_mos_test_mturk_cli.helper import save_project, start_pipeline, stop_pipeline
+from tts_mos_test_mturk_cli.logging_configuration import get_cli_logger
+from tts_mos_test_mturk_cli.types import CLIError
+
+STDIN_PATH = Path("-")
+NOT_NESTABLE_COMMANDS = {"run", "serve"}
+
+
+def read_pipeline(path: Path) -> List[Tuple[int, List[str]]]:
+  """returns the line number and the arguments of each command; empty lines and comments (#) are skipped"""
+  try:
+    if path == STDIN_PATH:
+      lines = sys.stdin.read().splitlines()
+    else:
+      lines = path.read_text("utf8").splitlines()
+  except Exception as ex:
+    raise CLIError(f"Pipeline couldn't be read from \"{path.absolute()}\"!") from ex
+
+  result = []
+  for line_nr, line in enumerate(lines, start=1):
+    try:
+      args = shlex.split(line, comments=True)
+    except ValueError as ex:
+      raise CLIError(f"Line {line_nr} of the pipeline couldn't be parsed! {ex.args[0]}") from ex
+    if len(args) > 0:
+      result.append((line_nr, args))
+  return result
+
+
+def parse_command(args: List[str]) -> Tuple[Callable[[Namespace], None], Namespace]:
+  # the CLI module is loaded already
+  from tts_mos_test_mturk_cli.cli import INVOKE_HANDLER_VAR, _init_parser
+
+  parser = _init_parser(args)
+  output = io.StringIO()
+  try:
+    with redirect_stdout(output), redirect_stderr(output):
+      ns = parser.parse_args(args)
+  except SystemExit as ex:
+    lines = output.getvalue().strip().splitlines()
+    message = lines[-1] if len(lines) > 0 else ""
+    raise CLIError(f"Command is invalid! {message}".strip()) from ex
+  if not hasattr(ns, INVOKE_HANDLER_VAR):
+    raise CLIError("No command was given!")
+  invoke_handler = getattr(ns, INVOKE_HANDLER_VAR)
+  delattr(ns, INVOKE_HANDLER_VAR)
+  return invoke_handler, ns
+
+
+def run_command(args: List[str]) -> None:
+  """runs a command on the projects of the pipeline"""
+  if args[0] in NOT_NESTABLE_COMMANDS:
+    raise CLIError(f"Command \"{args[0]}\" can't be nested!")
+  invoke_handler, ns = parse_command(args)
+  project = getattr(ns, "project", None)
+  is_dry = getattr(ns, "dry", False) and isinstance(project, EvaluationData)
+  if is_dry:
+    # the project is shared with the following commands, therefore the masks are restored
+    masks = OrderedDict(cast(EvaluationData, project).masks)
+  try:
+    invoke_handler(ns)
+  finally:
+    if is_dry:
+      project.masks = masks
+
+
+def init_run_pipeline_parser(parser: ArgumentParser):
+  parser.description = "Run the commands of a pipeline one after another, whereby each project is loaded only once and saved after the last command. Each line of the pipeline contains one command with its arguments like it would be passed to mos-cli; empty lines and comments (#) are ignored. If a command fails, no project is saved."
+  parser.add_argument("pipeline", type=parse_path, metavar="PIPELINE",
+                      help="path to the pipeline file; use - to read it from stdin")
+  add_opt_dry_argument(parser)
+
+  def main(ns: Namespace) -> None:
+    commands = read_pipeline(ns.pipeline)
+    logger = get_cli_logger()
+
+    start_pipeline()
+    try:
+      for line_nr, args in commands:
+        logger.info(f"Running line {line_nr}: {shlex.join(args)}")
+        try:
+          run_command(args)
+        except CLIError as ex:
+          raise CLIError(f"Command in line {line_nr} of the pipeline failed! {ex.args[0]}") from ex
+    finally:
+      projects = stop_pipeline()
+
+    logger.info(f"Ran {len(commands)} commands.")
+    if not ns.dry:
+      for project in projects:
+        save_project(project)
+  return main
@@ -0,0 +1,239 @@
+import json
+import logging
+from argparse import ArgumentParser, Namespace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from logging import LogRecord
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Set, Tuple, Union
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from tts_mos_test_mturk.df_generation import generate_ground_truth_table, get_mos_df
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.statistics.algorithm_sentence_stats import get_algorithm_sentence_stats
+from tts_mos_test_mturk.statistics.algorithm_worker_stats import get_worker_algorithm_stats
+from tts_mos_test_mturk.statistics.worker_assignment_stats import get_worker_assignment_stats
+from tts_mos_test_mturk_cli.argparse_helper import (parse_non_empty_or_whitespace,
+                                                    parse_non_negative_integer, parse_path)
+from tts_mos_test_mturk_cli.helper import (get_pipeline_projects, load_project, pop_changed_projects,
+                                           start_pipeline, stop_pipeline, unload_project)
+from tts_mos_test_mturk_cli.logging_configuration import get_cli_logger, get_file_logger
+from tts_mos_test_mturk_cli.parsers.run_parser import run_command
+from tts_mos_test_mturk_cli.types import CLIError
+from tts_mos_test_mturk_cli.validation import ensure_masks_exist
+
+# the response is encoded to JSON unless it is encoded already
+Response = Union[Dict[str, Any], bytes]
+
+STATS: Dict[str, Callable[[EvaluationData, Set[str]], pd.DataFrame]] = {
+  "mos": lambda data, masks: pd.DataFrame.from_records(get_mos_df(data, masks)),
+  "worker-stats": get_worker_algorithm_stats,
+  "assignment-stats": get_worker_assignment_stats,
+  "sentence-stats": get_algorithm_sentence_stats,
+  "data": generate_ground_truth_table,
+}
+
+# encoded responses of the statistics by name, project path and masks; they are cleared if a command
+# is run or a project is reloaded
+__stats_cache: Dict[Tuple[str, Path, FrozenSet[str]], bytes] = {}
+
+
+class MessagesHandler(logging.Handler):
+  def __init__(self) -> None:
+    super().__init__()
+    self.messages: List[str] = []
+
+  def emit(self, record: LogRecord) -> None:
+    self.messages.append(record.getMessage())
+
+
+def get_str(body: Dict[str, Any], key: str) -> str:
+  value = body.get(key)
+  if not isinstance(value, str) or value.strip() == "":
+    raise CLIError(f"\"{key}\" needs to be a non-empty string!")
+  return value
+
+
+def get_str_list(body: Dict[str, Any], key: str) -> List[str]:
+  value = body.get(key, [])
+  if not isinstance(value, list) or not all(isinstance(x, str) for x in value):
+    raise CLIError(f"\"{key}\" needs to be a list of strings!")
+  return value
+
+
+def get_project(body: Dict[str, Any]) -> EvaluationData:
+  path = Path(get_str(body, "project"))
+  try:
+    return load_project(path)
+  except Exception as ex:
+    raise CLIError(f"Project \"{path.absolute()}\" couldn't be loaded!") from ex
+
+
+def get_project_info(project: EvaluationData, changed: bool) -> Response:
+  return {
+    "project": str(project.file_path.absolute()),
+    "changed": changed,
+    "workers": project.n_workers,
+    "assignments": project.n_assignments,
+    "ratings": project.n_ratings,
+    "masks": list(project.masks.keys()),
+  }
+
+
+def get_projects(body: Dict[str, Any]) -> Response:
+  return {
+    "projects": [get_project_info(project, changed) for project, changed in get_pipeline_projects()],
+  }
+
+
+def reload_project(body: Dict[str, Any]) -> Response:
+  """discards the changes of the project and loads it again"""
+  unload_project(Path(get_str(body, "project")))
+  __stats_cache.clear()
+  project = get_project(body)
+  return get_project_info(project, False)
+
+
+def flush_projects(body: Dict[str, Any]) -> Response:
+  """saves the changed projects or only the given one"""
+  path = Path(get_str(body, "project")) if "project" in body else None
+  projects = pop_changed_projects(path)
+  for project in projects:
+    try:
+      project.save()
+    except Exception as ex:
+      raise CLIError(f"Project couldn't be saved to \"{project.file_path.absolute()}\"!") from ex
+  return {
+    "saved": [str(project.file_path.absolute()) for project in projects],
+  }
+
+
+def run_command_request(body: Dict[str, Any]) -> Response:
+  """runs a command of the CLI on the loaded projects and returns its log"""
+  args = get_str_list(body, "args")
+  if len(args) == 0:
+    raise CLIError("\"args\" must not be empty!")
+  handler = MessagesHandler()
+  logger = get_cli_logger()
+  logger.addHandler(handler)
+  try:
+    run_command(args)
+  finally:
+    logger.removeHandler(handler)
+    # the command could have changed any project
+    __stats_cache.clear()
+  return {
+    "log": handler.messages,
+  }
+
+
+def get_stats(name: str, body: Dict[str, Any]) -> Response:
+  project = get_project(body)
+  masks = set(get_str_list(body, "masks"))
+  # also cached statistics are only returned for existing masks
+  ensure_masks_exist(project, masks)
+  key = (name, project.file_path.absolute(), frozenset(masks))
+  if key not in __stats_cache:
+    df = STATS[name](project, masks)
+    rows = df.to_json(orient="records", double_precision=15)
+    __stats_cache[key] = f"{{\"rows\": {rows}}}".encode("utf8")
+  return __stats_cache[key]
+
+
+GET_ROUTES: Dict[str, Callable[[Dict[str, Any]], Response]] = {
+  "/projects": get_projects,
+}
+
+POST_ROUTES: Dict[str, Callable[[Dict[str, Any]], Response]] = {
+  "/reload": reload_project,
+  "/flush": flush_projects,
+  "/command": run_command_request,
+}
+for stats_name in STATS:
+  POST_ROUTES[f"/stats/{stats_name}"] = lambda body, name=stats_name: get_stats(name, body)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+  def do_GET(self) -> None:
+    self.__handle(GET_ROUTES)
+
+  def do_POST(self) -> None:
+    self.__handle(POST_ROUTES)
+
+  def __handle(self, routes: Dict[str, Callable[[Dict[str, Any]], Response]]) -> None:
+    path = urlparse(self.path).path
+    if path not in routes:
+      self.__send(HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint \"{path}\"!"})
+      return
+    flogger = get_file_logger()
+    try:
+      body = self.__read_body()
+      response = routes[path](body)
+    except CLIError as error:
+      flogger.debug(error, exc_info=True)
+      self.__send(HTTPStatus.BAD_REQUEST, {"error": error.args[0]})
+      return
+    except Exception as exception:
+      flogger.debug(exception, exc_info=True)
+      self.__send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Unexpected error occurred!"})
+      return
+    self.__send(HTTPStatus.OK, response)
+
+  def __read_body(self) -> Dict[str, Any]:
+    length = int(self.headers.get("Content-Length") or 0)
+    if length == 0:
+      return {}
+    try:
+      body = json.loads(self.rfile.read(length))
+    except ValueError as ex:
+      raise CLIError("Request body is no valid JSON!") from ex
+    if not isinstance(body, dict):
+      raise CLIError("Request body needs to be a JSON object!")
+    return body
+
+  def __send(self, status: HTTPStatus, response: Response) -> None:
+    content = response if isinstance(response, bytes) else json.dumps(response).encode("utf8")
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(content)))
+    self.end_headers()
+    self.wfile.write(content)
+
+  def log_message(self, format: str, *args: Any) -> None:
+    get_file_logger().debug(f"{self.address_string()} - {format % args}")
+
+
+def init_serve_parser(parser: ArgumentParser):
+  parser.description = (
+    "Serve the statistics and commands over a local HTTP JSON API, whereby the loaded projects and "
+    "their caches stay in memory. Changes of commands are only saved on request. Endpoints: "
+    "GET /projects; POST /reload {\"project\"}, /flush {[\"project\"]}, /command {\"args\"} and "
+    f"/stats/{{{','.join(STATS)}}} {{\"project\", [\"masks\"]}}."
+  )
+  parser.add_argument("projects", type=parse_path, nargs="*", metavar="PROJECT-PATH",
+                      help="load these projects at start")
+  parser.add_argument("--host", type=parse_non_empty_or_whitespace, metavar="HOST",
+                      help="address to listen on", default="127.0.0.1")
+  parser.add_argument("--port", type=parse_non_negative_integer, metavar="PORT",
+                      help="port to listen on (0 selects a free port)", default=8000)
+
+  def main(ns: Namespace) -> None:
+    logger = get_cli_logger()
+    start_pipeline()
+    try:
+      for path in ns.projects:
+        get_project({"project": str(path)})
+      with HTTPServer((ns.host, ns.port), RequestHandler) as server:
+        host, port = server.server_address[:2]
+        logger.info(f"Serving on http://{host}:{port}/ (press CTRL+C to quit)")
+        try:
+          server.serve_forever()
+        except KeyboardInterrupt:
+          pass
+    finally:
+      projects = stop_pipeline()
+    for project in projects:
+      logger.warning(f"Changes of the project at \"{project.file_path.absolute()}\" were not saved!")
+  return main
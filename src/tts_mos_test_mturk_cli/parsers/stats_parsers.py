@@ -7,7 +7,7 @@ from tts_mos_test_mturk.statistics.algorithm_sentence_stats import get_algorithm
 from tts_mos_test_mturk.statistics.algorithm_worker_stats import get_worker_algorithm_stats
 from tts_mos_test_mturk.statistics.update_stats import print_stats
 from tts_mos_test_mturk.statistics.worker_assignment_stats import get_worker_assignment_stats
-from tts_mos_test_mturk_cli.argparse_helper import get_optional, parse_path
+from tts_mos_test_mturk_cli.argparse_helper import get_optional, parse_path, parse_positive_integer
 from tts_mos_test_mturk_cli.default_args import add_opt_masks_argument, add_req_project_argument
 from tts_mos_test_mturk_cli.helper import log_full_df, save_csv
 from tts_mos_test_mturk_cli.validation import ensure_masks_exist
@@ -59,10 +59,12 @@ def init_print_mos_parser(parser: ArgumentParser):
   add_opt_masks_argument(parser)
   add_opt_output_argument(parser)
   add_silent_argument(parser)
+  parser.add_argument("-j", "--jobs", type=parse_positive_integer, metavar="N",
+                      help="count of processes which calculate the statistics of the algorithms in parallel", default=1)
 
   def main(ns: Namespace) -> None:
     ensure_masks_exist(ns.project, ns.masks)
-    result = get_mos_df(ns.project, ns.masks)
+    result = get_mos_df(ns.project, ns.masks, ns.jobs)
     result_df = pd.DataFrame.from_records(result)
 
     if not ns.silent:
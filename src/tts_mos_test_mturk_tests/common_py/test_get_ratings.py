@@ -1,81 +1,87 @@
-# from collections import OrderedDict
-# from datetime import datetime
-
-# import numpy as np
-# from ordered_set import OrderedSet
-
-# from tts_mos_test_mturk.common import get_ratings
-# from tts_mos_test_mturk.evaluation_data import EvaluationData
-# from tts_mos_test_mturk.result import Assignment, Result, Worker
-
-
-# def test_get_first_rating():
-#   r = Result(
-#     algorithms=OrderedSet(["alg1", "alg2"]),
-#     files=OrderedSet(["file1", "file2"]),
-#     workers=OrderedDict([
-#       ("worker1", Worker(
-#         age_group="18-29",
-#         gender="male",
-#         assignments=OrderedDict([
-#           ("assignment1", Assignment(
-#             device="headphone",
-#             state="Pending",
-#             worktime=30,
-#             comments="",
-#             hit_id="hit1",
-#             time=datetime.now(),
-#             ratings=OrderedDict([
-#               (("alg1", "file1"), OrderedDict([
-#                 ("naturalness", 5),
-#                 ("intelligibility", 3),
-#               ])),
-#               (("alg2", "file2"), OrderedDict([
-#                 ("naturalness", 4),
-#                 ("intelligibility", 2),
-#               ])),
-#             ])
-#           )),
-#           ("assignment2", Assignment(
-#             device="headphone",
-#             state="Pending",
-#             worktime=30,
-#             comments="",
-#             hit_id="hit2",
-#             time=datetime.now(),
-#             ratings=OrderedDict([
-#               (("alg1", "file2"), OrderedDict([
-#                 ("naturalness", 5),
-#                 ("intelligibility", 3),
-#               ])),
-#               (("alg2", "file2"), OrderedDict([
-#                 ("naturalness", 3),  # duplicate -> (3 + 4) / 2 = 3.5
-#                 ("intelligibility", 2),
-#               ])),
-#             ])
-#           ))
-#         ])
-#       ))
-#     ])
-#   )
-
-#   data = EvaluationData(r)
-#   result = get_ratings(data, {"naturalness"})
-
-#   assert_result = np.array(
-#     # worker1
-#     [
-#       # alg1
-#       [
-#         # file1, file2
-#         [5.0, 5.0]
-#       ],
-#       # alg2
-#       [
-#         # file1, file2
-#         [np.nan, 3.5]
-#       ]
-#     ]
-#   )
-
-#   np.testing.assert_array_equal(assert_result, result)
+import datetime
+
+import numpy as np
+
+from tts_mos_test_mturk.common import get_ratings
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk_tests.helper import get_assignment, get_result, get_worker
+
+_ = np.nan
+
+
+def get_data(ratings_per_assignment: list) -> EvaluationData:
+  assignments = {
+    f"assignment{a_i}": get_assignment({
+      (alg_name, file_name): dict(votes)
+      for alg_name, file_name, votes in ratings
+    }, time=datetime.datetime(2023, 1, 1))
+    for a_i, ratings in enumerate(ratings_per_assignment)
+  }
+  return EvaluationData(get_result({"worker1": get_worker(assignments)}))
+
+
+def test_duplicate_ratings_are_averaged():
+  data = get_data([
+    [
+      ("alg1", "file1", [("naturalness", 5), ("intelligibility", 3)]),
+      ("alg2", "file2", [("naturalness", 4), ("intelligibility", 2)]),
+    ],
+    [
+      ("alg1", "file2", [("naturalness", 5), ("intelligibility", 3)]),
+      ("alg2", "file2", [("naturalness", 3), ("intelligibility", 2)]),
+    ],
+  ])
+
+  result = get_ratings(data, {"naturalness"})
+
+  np.testing.assert_array_equal(result, [
+    [
+      [5, 5],
+    ],
+    [
+      [_, 3.5],
+    ],
+  ])
+  assert result.dtype == np.float32
+
+
+def test_mean_of_rating_names():
+  data = get_data([
+    [
+      ("alg1", "file1", [("naturalness", 5), ("intelligibility", 2)]),
+    ],
+  ])
+
+  result = get_ratings(data, {"naturalness", "intelligibility"})
+
+  np.testing.assert_array_equal(result, [
+    [
+      [3.5, _],
+    ],
+    [
+      [_, _],
+    ],
+  ])
+
+
+def test_equals_mean_per_cell():
+  rng = np.random.default_rng(1234)
+  cells = [(alg, file) for alg in ("alg1", "alg2") for file in ("file1", "file2")]
+  ratings_per_assignment = []
+  expected_votes = {}
+  for _ in range(5):
+    ratings = []
+    for alg_i in rng.choice(len(cells), size=3, replace=False):
+      alg_name, file_name = cells[alg_i]
+      votes = [("naturalness", int(rng.integers(1, 6))), ("intelligibility", float(rng.integers(1, 11)) / 2)]
+      ratings.append((alg_name, file_name, votes))
+      expected_votes.setdefault((alg_name, file_name), []).append(np.mean([v for _, v in votes]))
+    ratings_per_assignment.append(ratings)
+  data = get_data(ratings_per_assignment)
+
+  result = get_ratings(data, {"naturalness", "intelligibility"})
+
+  for (alg_name, file_name), votes in expected_votes.items():
+    alg_i = data.algorithms.get_loc(alg_name)
+    file_i = data.files.get_loc(file_name)
+    assert result[alg_i, 0, file_i] == np.float32(np.mean(votes))
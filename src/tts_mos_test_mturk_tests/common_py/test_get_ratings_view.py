@@ -0,0 +1,48 @@
+import pickle
+
+import numpy as np
+
+from tts_mos_test_mturk.common import get_ratings, get_ratings_view
+from tts_mos_test_mturk_tests.common_py.test_get_ratings import get_data
+
+
+def get_default_data():
+  return get_data([
+    [
+      ("alg1", "file1", [("naturalness", 5), ("intelligibility", 3)]),
+      ("alg2", "file2", [("naturalness", 4), ("intelligibility", 2)]),
+    ],
+  ])
+
+
+def test_returns_cached_read_only_tensor():
+  data = get_default_data()
+
+  result1 = get_ratings_view(data, {"naturalness", "intelligibility"})
+  result2 = get_ratings_view(data, {"intelligibility", "naturalness"})
+
+  assert result1 is result2
+  assert not result1.flags.writeable
+  assert list(data.ratings_cache.keys()) == [frozenset(("naturalness", "intelligibility"))]
+
+
+def test_get_ratings_returns_writable_copy():
+  data = get_default_data()
+
+  result = get_ratings(data, {"naturalness"})
+  result[0, 0, 0] = np.nan
+
+  assert result.flags.writeable
+  assert get_ratings_view(data, {"naturalness"})[0, 0, 0] == 5
+
+
+def test_cache_is_not_pickled():
+  data = get_default_data()
+  get_ratings_view(data, {"naturalness"})
+
+  result = pickle.loads(pickle.dumps(data))
+
+  assert len(data.ratings_cache) == 1
+  assert result.ratings_cache == {}
+  np.testing.assert_array_equal(get_ratings_view(result, {"naturalness"}),
+                                get_ratings_view(data, {"naturalness"}))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from tts_mos_test_mturk.correlations import get_corrcoef, get_corrcoefs
+
+_ = np.nan
+
+
+def test_equals_get_corrcoef():
+  X = np.array([
+    [1, 2, _, _, 4],
+    [1, 2, 3, 4, 5],
+    [1, _, _, _, _],
+    [1, 1, 1, 1, 1],
+    [2, 3, 1, 4, 4],
+    [_, _, _, _, _],
+    [1, 2, 3, 4, 5],
+  ])
+  Y = np.array([
+    [_, 1, 3, _, 5],
+    [5, 4, 3, 2, 1],
+    [1, 2, 3, 4, 5],
+    [1, 2, 3, 4, 5],
+    [1, 1, 1, 1, 1],
+    [1, 2, 3, 4, 5],
+    [_, _, 2, 2, 3],
+  ])
+
+  result = get_corrcoefs(X, Y)
+
+  for i in range(len(X)):
+    expected = get_corrcoef(np.array([X[i], Y[i]]))
+    if np.isnan(expected):
+      assert np.isnan(result[i])
+    else:
+      assert result[i] == pytest.approx(expected)
+
+
+def test_empty__returns_empty():
+  result = get_corrcoefs(np.empty((0, 3)), np.empty((0, 3)))
+  assert result.shape == (0,)
+
+
+def test_no_columns__returns_nan():
+  result = get_corrcoefs(np.empty((2, 0)), np.empty((2, 0)))
+  assert np.isnan(result).all()
@@ -0,0 +1,57 @@
+import numpy as np
+
+from tts_mos_test_mturk.correlations import (get_algorithm_mos_correlation,
+                                             get_algorithm_mos_correlations,
+                                             get_sentence_mos_correlation_3dim,
+                                             get_sentence_mos_correlations_3dim)
+
+
+def get_random_ratings(n_algorithms: int, n_workers: int, n_files: int, nan_percent: float) -> np.ndarray:
+  rng = np.random.default_rng(1234)
+  ratings = rng.integers(1, 6, size=(n_algorithms, n_workers, n_files)).astype(np.float64)
+  ratings[rng.random(ratings.shape) < nan_percent] = np.nan
+  # worker that didn't rate anything
+  ratings[:, 0, :] = np.nan
+  # worker that always rated the same
+  ratings[:, 1, :] = 3
+  return ratings
+
+
+def test_sentence__equals_single_worker_calculation():
+  ratings = get_random_ratings(3, 40, 20, 0.8)
+
+  result = get_sentence_mos_correlations_3dim(ratings)
+
+  expected = [
+    get_sentence_mos_correlation_3dim(worker_i, ratings)
+    for worker_i in range(ratings.shape[1])
+  ]
+  np.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-12)
+  assert np.isnan(result[0])
+  assert np.isnan(result[1])
+
+
+def test_algorithm__equals_single_worker_calculation():
+  ratings = get_random_ratings(4, 40, 20, 0.7)
+
+  result = get_algorithm_mos_correlations(ratings)
+
+  expected = [
+    get_algorithm_mos_correlation(worker_i, ratings)
+    for worker_i in range(ratings.shape[1])
+  ]
+  np.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-12)
+  assert np.isnan(result[0])
+  assert np.isnan(result[1])
+
+
+def test_more_workers_than_block_size():
+  ratings = get_random_ratings(2, 600, 10, 0.9)
+
+  result = get_sentence_mos_correlations_3dim(ratings)
+
+  expected = [
+    get_sentence_mos_correlation_3dim(worker_i, ratings)
+    for worker_i in (299, 599)
+  ]
+  np.testing.assert_allclose(result[[299, 599]], expected, rtol=1e-10, atol=1e-12)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from tts_mos_test_mturk.correlations import (get_algorithm_mos_correlations,
+                                             get_sentence_mos_correlations_3dim,
+                                             get_worker_correlations,
+                                             get_worker_mos_correlations)
+
+
+def get_random_ratings() -> np.ndarray:
+  rng = np.random.default_rng(1234)
+  ratings = rng.integers(1, 6, size=(3, 10, 8)).astype(np.float64)
+  ratings[rng.random(ratings.shape) < 0.5] = np.nan
+  # worker that didn't rate anything
+  ratings[:, 0, :] = np.nan
+  return ratings
+
+
+def test_component():
+  ratings = get_random_ratings()
+
+  result = get_worker_correlations(ratings)
+
+  np.testing.assert_array_equal(result.sentence, get_sentence_mos_correlations_3dim(ratings))
+  np.testing.assert_array_equal(result.algorithm, get_algorithm_mos_correlations(ratings))
+  np.testing.assert_array_equal(result.both, get_worker_mos_correlations(ratings))
+  np.testing.assert_array_equal(result.n_ratings, np.sum(~np.isnan(ratings), axis=(0, 2)))
+  assert result.n_ratings[0] == 0
+  assert np.isnan(result.both[0])
+
+
+def test_get__returns_vector_of_mode():
+  ratings = get_random_ratings()
+
+  result = get_worker_correlations(ratings)
+
+  assert result.get("sentence") is result.sentence
+  assert result.get("algorithm") is result.algorithm
+  assert result.get("both") is result.both
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from tts_mos_test_mturk.correlations import get_worker_mos_correlations
 
@@ -42,11 +43,11 @@ def test_component():
 
   r = get_worker_mos_correlations(ratings)
 
-  assert r[0] == 0.39630561749956444
-  assert r[1] == 0.6054909989887703
-  assert r[2] == 0.8693238858358626
-  assert r[3] == 0.4704998146752205
-  assert r[4] == 1.0
+  assert r[0] == pytest.approx(0.39630561749956444)
+  assert r[1] == pytest.approx(0.6054909989887703)
+  assert r[2] == pytest.approx(0.8693238858358626)
+  assert r[3] == pytest.approx(0.4704998146752205)
+  assert r[4] == pytest.approx(1.0)
   assert np.isnan(r[5])
   assert len(r) == 6
 
@@ -63,10 +64,10 @@ def test_one_algorithm_return_nan_for_each_worker():
 
   r = get_worker_mos_correlations(ratings)
 
-  assert r[0] == -0.49999999999999994
-  assert r[1] == 0.5000000000000001
-  assert r[2] == 0.5000000000000001
-  assert r[3] == -0.5000000000000001
+  assert r[0] == pytest.approx(-0.49999999999999994)
+  assert r[1] == pytest.approx(0.5000000000000001)
+  assert r[2] == pytest.approx(0.5000000000000001)
+  assert r[3] == pytest.approx(-0.5000000000000001)
   assert len(r) == 4
 
 
@@ -103,8 +104,8 @@ def test_positive_correlation():
 
   r = get_worker_mos_correlations(ratings)
 
-  assert r[0] == 0.9122424289477238
-  assert r[1] == 0.9122424289477238
+  assert r[0] == pytest.approx(0.9122424289477238)
+  assert r[1] == pytest.approx(0.9122424289477238)
   assert len(r) == 2
 
 
@@ -122,8 +123,8 @@ def test_negative_correlation():
 
   r = get_worker_mos_correlations(ratings)
 
-  assert r[0] == -0.949719013397517
-  assert r[1] == -0.9497190133975169
+  assert r[0] == pytest.approx(-0.949719013397517)
+  assert r[1] == pytest.approx(-0.9497190133975169)
   assert len(r) == 2
 
 
@@ -143,9 +144,9 @@ def test_one_negative_two_positive_correlation():
 
   r = get_worker_mos_correlations(ratings)
 
-  assert r[0] == -0.9444444444444444
-  assert r[1] == 0.6012739367083666
-  assert r[2] == 0.7434322477800739
+  assert r[0] == pytest.approx(-0.9444444444444444)
+  assert r[1] == pytest.approx(0.6012739367083666)
+  assert r[2] == pytest.approx(0.7434322477800739)
   assert len(r) == 3
 
 
@@ -170,7 +171,7 @@ def test_one_almost_zero_two_negative_correlation():
 
   r = get_worker_mos_correlations(ratings)
 
-  assert r[0] == -0.6545894593638613
-  assert r[1] == -0.8608101960290726
-  assert r[2] == 0.06741998624632421
+  assert r[0] == pytest.approx(-0.6545894593638613)
+  assert r[1] == pytest.approx(-0.8608101960290726)
+  assert r[2] == pytest.approx(0.06741998624632421)
   assert len(r) == 3
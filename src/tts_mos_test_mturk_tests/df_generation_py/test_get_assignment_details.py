@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import numpy as np
+
+from tts_mos_test_mturk.df_generation import get_assignment_details
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk_tests.helper import get_example_data
+
+
+def test_component():
+  data = get_example_data()
+
+  result = get_assignment_details(data, np.array([1, 0]))
+
+  assert result == [
+    {
+      "WorkerId": "worker1",
+      "AssignmentId": "assignment1",
+      "Gender": "male",
+      "AgeGroup": "18-29",
+      "HITId": "hit1",
+      "Device": "headphone",
+      "State": "Approved",
+      "Time": "13.07.2023 05:08:04",
+    },
+    {
+      "WorkerId": "worker2",
+      "AssignmentId": "assignment2",
+      "Gender": "female",
+      "AgeGroup": "30-39",
+      "HITId": "hit2",
+      "Device": "laptop",
+      "State": "Submitted",
+      "Time": "14.07.2023 00:00:00",
+    },
+  ]
+
+
+def test_loaded_project__result_is_not_created(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+  data = EvaluationData.load(path)
+
+  get_assignment_details(data, np.array([0, 1]))
+
+  assert data._EvaluationData__result is None
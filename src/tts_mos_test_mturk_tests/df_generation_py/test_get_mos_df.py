@@ -0,0 +1,57 @@
+import datetime
+
+import pandas as pd
+
+from tts_mos_test_mturk.df_generation import ALL_CELL_CONTENT, get_mos_df
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk_tests.helper import get_assignment, get_result, get_worker
+
+
+def get_data() -> EvaluationData:
+  algorithms = ["alg1", "alg2", "alg3"]
+  files = ["file1", "file2", "file3"]
+  workers = {}
+  for w_i, (gender, age_group) in enumerate([("male", "18-29"), ("female", "18-29"), ("female", "30-39"), ("male", "30-39")]):
+    ratings = {}
+    for a_i, alg in enumerate(algorithms):
+      for f_i, file in enumerate(files):
+        if (w_i + a_i + f_i) % 3 != 0:
+          ratings[(alg, file)] = {
+            "naturalness": (w_i + 2 * a_i + f_i) % 5 + 1,
+            "intelligibility": (w_i * a_i + f_i) % 5 + 1,
+          }
+    workers[f"worker{w_i}"] = get_worker({
+      f"assignment{w_i}": get_assignment(ratings, device="laptop", hit_id=f"hit{w_i}", time=datetime.datetime(2023, 7, 13)),
+    }, age_group=age_group, gender=gender)
+  result = get_result(workers, algorithms, files)
+  data = EvaluationData(result)
+  wmask = MaskFactory(data).get_wmask()
+  wmask.mask_indices(2)
+  data.add_or_update_mask("wmask", wmask)
+  return data
+
+
+def test_all_workers_row():
+  data = get_data()
+
+  result = get_mos_df(data, {"wmask"})
+
+  rows = [
+    row for row in result
+    if row["Rating"] == "naturalness" and row["Algorithm"] == "alg1"
+    and row["Gender"] == ALL_CELL_CONTENT and row["AgeGroup"] == ALL_CELL_CONTENT
+  ]
+  assert len(rows) == 1
+  assert rows[0]["#Workers (all)"] == 4
+  assert rows[0]["#Workers"] == 3
+  assert rows[0]["#Ratings (all)"] == 8
+
+
+def test_multiple_jobs__returns_same_rows_in_same_order():
+  data = get_data()
+
+  expected = get_mos_df(data, {"wmask"})
+  result = get_mos_df(data, {"wmask"}, n_jobs=3)
+
+  pd.testing.assert_frame_equal(pd.DataFrame.from_records(result), pd.DataFrame.from_records(expected))
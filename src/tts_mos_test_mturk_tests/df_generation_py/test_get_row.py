@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from mean_opinion_score import get_ci95, get_ci95_default, get_mos
+
+from tts_mos_test_mturk.df_generation import get_row
+
+
+def get_ratings() -> np.ndarray:
+  rng = np.random.default_rng(1234)
+  ratings = rng.integers(1, 6, size=(2, 12, 8)).astype(np.float32)
+  ratings[rng.random(ratings.shape) < 0.6] = np.nan
+  return ratings
+
+
+@pytest.mark.parametrize("windices", [
+  np.array([3]),
+  np.array([0, 4, 5, 11]),
+  np.arange(12),
+  np.arange(12) % 3 == 0,
+  None,
+])
+def test_equals_statistics_of_full_matrix(windices):
+  ratings = get_ratings()
+  ratings_masked = ratings.copy()
+  ratings_masked[:, 1, :] = np.nan
+
+  Z = ratings_masked[1]
+  result = get_row(OrderedDict(), Z, ~np.isnan(Z), np.sum(~np.isnan(ratings[1])), 2, windices)
+
+  # the other workers are masked
+  Z = ratings_masked[1].copy()
+  if windices is not None:
+    other_workers = np.setdiff1d(np.arange(12), np.arange(12)[windices])
+    Z[other_workers] = np.nan
+  sentence_counts = np.sum(~np.isnan(Z), axis=0)
+  assert result["MOS"] == pytest.approx(get_mos(Z))
+  assert result["CI95"] == pytest.approx(get_ci95(Z), nan_ok=True)
+  assert result["CI95 (default)"] == pytest.approx(get_ci95_default(Z))
+  assert result["STD"] == pytest.approx(np.nanstd(Z))
+  assert result["Min. #Ratings per Sentence"] == np.min(sentence_counts)
+  assert result["Max. #Ratings per Sentence"] == np.max(sentence_counts)
+  assert result["Avg. #Ratings per Sentence"] == np.mean(sentence_counts)
+  assert result["#Workers"] == np.sum(np.any(~np.isnan(Z), axis=1))
+  assert result["#Workers (all)"] == 12
+  assert result["#Ratings"] == np.sum(~np.isnan(Z))
+  assert result["#Ratings (all)"] == np.sum(~np.isnan(ratings[1]))
+
+
+def test_does_not_change_ratings():
+  ratings = get_ratings()
+  Z = ratings[0].copy()
+
+  get_row(OrderedDict(), Z, ~np.isnan(Z), 0, 2, np.array([0, 1]))
+
+  np.testing.assert_array_equal(Z, ratings[0])
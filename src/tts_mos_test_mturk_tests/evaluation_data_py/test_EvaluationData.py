@@ -1,82 +1,72 @@
-# import numpy as np
-# from ordered_set import OrderedSet
-# from pandas import DataFrame
-
-# from tts_mos_test_mturk.common import get_ratings
-# from tts_mos_test_mturk.evaluation_data import EvaluationData
-# from tts_mos_test_mturk.result import parse_result_from_json
-
-# _ = np.nan
-
-
-# def test_component():
-#   gt_df = DataFrame([
-#       ["url1", "alg1", "file1"],
-#       ["url2", "alg1", "file2"],
-#       ["url3", "alg2", "file1"],
-#       ["url4", "alg2", "file2"],
-#       ["url5", "alg3", "file3"],
-#     ],
-#     columns=[
-#       "audio_url", "algorithm", "file"
-#     ]
-#   )
-
-#   res_df = DataFrame([
-#       [
-#         "hit0", "assignment0", "worker00", "Approved", "37",
-#         "url1", "url2",
-#         "comment",
-#         False, False, True, False,  # Listening type
-#         True, False, False, False, False,  # MOS url1
-#         False, False, False, False, True,  # MOS url2
-#       ],
-#       [
-#         "hit1", "assignment1", "worker01", "Approved", "38",
-#         "url3", "url4",
-#         "comment",
-#         False, False, False, True,  # Listening type
-#         False, True, False, False, False,  # MOS url1
-#         False, False, True, False, False,  # MOS url2
-#       ],
-#     ],
-#     columns=[
-#       "HITId", "AssignmentId", "WorkerId", "AssignmentStatus", "WorkTimeInSeconds",
-#       "Input.audio_url_0", "Input.audio_url_1",
-#       "Answer.comments",
-#       "Answer.listening-type.over-the-ear", "Answer.listening-type.in-ear", "Answer.listening-type.desktop", "Answer.listening-type.laptop",
-#       "Answer.0-mos-rating.1", "Answer.0-mos-rating.2", "Answer.0-mos-rating.3", "Answer.0-mos-rating.4", "Answer.0-mos-rating.5",
-#       "Answer.1-mos-rating.1", "Answer.1-mos-rating.2", "Answer.1-mos-rating.3", "Answer.1-mos-rating.4", "Answer.1-mos-rating.5",
-#     ]
-#   )
-
-#   result = convert_to_json(res_df, gt_df)
-#   r = parse_result_from_json(result)
-#   data = EvaluationData(r)
-
-#   assert data.n_workers == 2
-#   assert data.workers == OrderedSet(("worker00", "worker01"))
-
-#   assert data.n_algorithms == 3
-#   assert data.algorithms == OrderedSet(("alg1", "alg2", "alg3"))
-
-#   assert data.n_files == 3
-#   assert data.files == OrderedSet(("file1", "file2", "file3"))
-
-#   assert data.n_assignments == 2
-#   assert data.assignments == OrderedSet(("assignment0", "assignment1"))
-
-#   np.testing.assert_equal(get_ratings(data), [
-#     [
-#       [1, 5, _],
-#       [_, _, _],
-#     ],
-#     [
-#       [_, _, _],
-#       [2, 3, _],
-#     ],
-#     [
-#       [_, _, _],
-#       [_, _, _],
-#     ],
-#   ])
+import numpy as np
+from ordered_set import OrderedSet
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.result import Result
+from tts_mos_test_mturk_tests.helper import get_example_result
+
+_ = np.nan
+
+
+def get_result() -> Result:
+  return get_example_result(with_worker_without_assignments=False)
+
+
+def test_columns():
+  data = EvaluationData(get_result())
+
+  assert data.n_ratings == 3
+  assert data.rating_names == OrderedSet(("naturalness", "intelligibility"))
+  np.testing.assert_array_equal(data.rating_workers, [0, 0, 1])
+  np.testing.assert_array_equal(data.rating_assignments, [0, 0, 1])
+  np.testing.assert_array_equal(data.rating_algorithms, [1, 0, 0])
+  np.testing.assert_array_equal(data.rating_files, [0, 1, 0])
+  np.testing.assert_array_equal(data.votes, [
+    [5, 3],
+    [4, _],
+    [2.5, 1],
+  ])
+  np.testing.assert_array_equal(data.assignment_workers, [0, 1])
+  np.testing.assert_array_equal(data.rated_cells, [1, 2, 4])
+  np.testing.assert_array_equal(data.rated_cell_assignments, [0, 1, 0])
+  np.testing.assert_array_equal(data.rated_cell_workers, [0, 1, 0])
+  np.testing.assert_array_equal(data.assignment_times, np.array(
+    ["2023-07-13T05:08:04", "2023-07-14T00:00:00"], dtype="datetime64[s]"))
+
+
+def test_column_dtypes():
+  data = EvaluationData(get_result())
+
+  assert data.rating_workers.dtype == np.int32
+  assert data.rating_assignments.dtype == np.int32
+  assert data.rating_algorithms.dtype == np.int32
+  assert data.rating_files.dtype == np.int32
+  assert data.votes.dtype == np.float32
+  assert data.rated_cell_assignments.dtype == np.int32
+  assert data.rated_cell_workers.dtype == np.int32
+
+
+def test_setstate__old_project__creates_columns():
+  data = EvaluationData(get_result())
+  state = data.__getstate__()
+  for column in ("rating_workers", "rated_cells", "rated_cell_assignments", "rated_cell_workers", "assignment_device_codes"):
+    del state[column]
+
+  result = EvaluationData.__new__(EvaluationData)
+  result.__setstate__(state)
+
+  np.testing.assert_array_equal(result.rated_cell_assignments, data.rated_cell_assignments)
+  np.testing.assert_array_equal(result.rated_cell_workers, data.rated_cell_workers)
+  assert result.ratings_cache == {}
+
+
+def test_categorical_columns():
+  data = EvaluationData(get_result())
+
+  np.testing.assert_array_equal(data.devices, ["headphone", "laptop"])
+  np.testing.assert_array_equal(data.assignment_device_codes, [0, 1])
+  assert data.assignment_device_codes.dtype == np.uint8
+  np.testing.assert_array_equal(data.assignment_devices, ["headphone", "laptop"])
+  np.testing.assert_array_equal(data.genders, ["female", "male"])
+  np.testing.assert_array_equal(data.worker_gender_codes, [1, 0])
+  np.testing.assert_array_equal(data.worker_genders, ["male", "female"])
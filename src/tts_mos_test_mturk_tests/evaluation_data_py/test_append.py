@@ -0,0 +1,117 @@
+import datetime
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from ordered_set import OrderedSet
+
+from tts_mos_test_mturk.common import get_ratings
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.masking.masks import AssignmentsMask, RatingsMask, WorkersMask
+from tts_mos_test_mturk.result import Result
+from tts_mos_test_mturk_tests.helper import (get_assignment, get_example_data, get_example_result,
+                                             get_result, get_worker)
+
+ASSIGNMENT3 = get_assignment({
+  ("alg3", "file3"): {"naturalness": 1, "quality": 2},
+}, device="laptop", state="Submitted", hit_id="hit3", time=datetime.datetime(2023, 7, 15, 1, 2, 3))
+
+ASSIGNMENT4 = get_assignment({
+  ("alg1", "file1"): {"naturalness": 3},
+  ("alg3", "file1"): {"intelligibility": 4.5},
+}, hit_id="hit3", time=datetime.datetime(2023, 7, 16, 0, 0, 0))
+
+
+def get_batch() -> EvaluationData:
+  result = get_result({
+    "worker4": get_worker({"assignment3": ASSIGNMENT3}, age_group="30-39", gender="female"),
+    # the gender differs, the existing one is kept
+    "worker1": get_worker({"assignment4": ASSIGNMENT4}, gender="female"),
+  }, algorithms=["alg3", "alg1"], files=["file3", "file1"])
+  return EvaluationData(result)
+
+
+def get_expected_result() -> Result:
+  result = get_example_result()
+  result.algorithms.add("alg3")
+  result.files.add("file3")
+  result.workers["worker1"].assignments["assignment4"] = ASSIGNMENT4
+  result.workers["worker4"] = get_worker({"assignment3": ASSIGNMENT3}, age_group="30-39", gender="female")
+  return result
+
+
+def test_appends_codes_and_ratings():
+  data = get_example_data()
+
+  data.append(get_batch())
+
+  assert data.algorithms == OrderedSet(["alg1", "alg2", "alg3"])
+  assert data.files == OrderedSet(["file1", "file2", "file3"])
+  assert data.workers == OrderedSet(["worker1", "worker2", "worker3", "worker4"])
+  assert data.assignments == OrderedSet(["assignment1", "assignment2", "assignment3", "assignment4"])
+  assert data.rating_names == OrderedSet(["naturalness", "intelligibility", "quality"])
+  assert data.n_ratings == 6
+  assert data.worker_data == get_expected_result().workers
+  expected = EvaluationData(get_expected_result())
+  for rating_names in ({"naturalness"}, {"intelligibility"}, {"quality"}):
+    np.testing.assert_array_equal(get_ratings(data, rating_names), get_ratings(expected, rating_names))
+
+
+def test_masks_are_grown_with_unmasked_entries():
+  data = get_example_data()
+  data.add_or_update_mask("amask", AssignmentsMask(np.array([True, False])))
+
+  data.append(get_batch())
+
+  assert data.masks["wmask"].mask.tolist() == [False, True, False, False]
+  assert data.masks["amask"].mask.tolist() == [True, False, False, False]
+  rmask = data.masks["rmask"]
+  assert isinstance(rmask, RatingsMask)
+  assert rmask.mask.shape == (3, 4, 3)
+  assert np.flatnonzero(rmask.mask).tolist() == [np.ravel_multi_index((0, 0, 1), (3, 4, 3))]
+
+
+def test_duplicate_assignment__raises_error():
+  data = get_example_data()
+  batch = get_example_result()
+  del batch.workers["worker2"]
+
+  with pytest.raises(ValueError):
+    data.append(EvaluationData(batch))
+
+  assert data.n_assignments == 2
+
+
+def test_loaded_project__saved_again(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+  data = EvaluationData.load(path)
+
+  data.append(get_batch())
+  data.save()
+  result = EvaluationData.load(path)
+
+  assert result.workers == data.workers
+  assert result.n_ratings == 6
+  np.testing.assert_array_equal(result.votes, data.votes)
+  np.testing.assert_array_equal(result.rated_cells, data.rated_cells)
+  assert isinstance(result.masks["wmask"], WorkersMask)
+  assert result.masks["wmask"].mask.tolist() == [False, True, False, False]
+  assert result.worker_data == get_expected_result().workers
+  assert len(list((path / "masks").iterdir())) == 2
+
+
+def test_loaded_project__columns_saved_in_new_directory(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+  header = json.loads((path / "header.json").read_text())
+  data = EvaluationData.load(path)
+
+  data.append(get_batch())
+  data.save()
+  new_header = json.loads((path / "header.json").read_text())
+
+  # the old header references the old columns until the new header is written
+  assert new_header["columns"] != header["columns"]
+  assert sorted(p.name for p in path.iterdir()) == sorted([new_header["columns"], "header.json", "masks"])
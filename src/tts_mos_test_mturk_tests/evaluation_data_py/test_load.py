@@ -0,0 +1,190 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+from tts_mos_test_mturk.evaluation_data import (CATEGORICAL_COLUMNS, PROJECT_FORMAT_VERSION,
+                                                EvaluationData)
+from tts_mos_test_mturk.io import save_obj
+from tts_mos_test_mturk.masking.masks import RatingsMask, WorkersMask
+from tts_mos_test_mturk_tests.helper import get_example_data, get_example_result
+
+
+def assert_equal(data: EvaluationData, result: EvaluationData) -> None:
+  assert result.workers == data.workers
+  assert result.assignments == data.assignments
+  assert result.algorithms == data.algorithms
+  assert result.files == data.files
+  assert result.rating_names == data.rating_names
+  assert result.n_ratings == data.n_ratings
+  np.testing.assert_array_equal(result.votes, data.votes)
+  np.testing.assert_array_equal(result.rated_cells, data.rated_cells)
+  np.testing.assert_array_equal(result.assignment_times, data.assignment_times)
+  assert list(result.masks.keys()) == list(data.masks.keys())
+  for mask_name, mask in data.masks.items():
+    assert type(result.masks[mask_name]) is type(mask)
+    np.testing.assert_array_equal(result.masks[mask_name].mask, mask.mask)
+  assert result.worker_data == get_example_result().workers
+
+
+def write_string_columns(path: Path, header: Dict[str, Any], data: EvaluationData) -> None:
+  # columns of format version 1 and 2
+  (path / header.pop("columns")).rename(path / "columns")
+  for column, (codes_column, categories_column) in CATEGORICAL_COLUMNS.items():
+    np.save(path / "columns" / f"{column}.npy", getattr(data, column))
+    (path / "columns" / f"{codes_column}.npy").unlink()
+    (path / "columns" / f"{categories_column}.npy").unlink()
+
+
+def test_save_to__load__returns_same_project(tmp_path: Path):
+  data = get_example_data()
+  path = tmp_path / "project"
+
+  data.save_to(path)
+  result = EvaluationData.load(path)
+
+  assert (path / "header.json").is_file()
+  assert result.file_path == path
+  assert isinstance(result.votes, np.memmap)
+  assert_equal(data, result)
+
+
+def test_loaded_mask_changed__file_is_unchanged(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+
+  result = EvaluationData.load(path)
+  result.masks["wmask"].mask_indices(0)
+
+  assert EvaluationData.load(path).masks["wmask"].mask.tolist() == [False, True, False]
+
+
+def test_save__removed_and_added_masks(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+
+  result = EvaluationData.load(path)
+  del result.masks["wmask"]
+  result.add_or_update_mask("wmask2", WorkersMask(np.array([True, False, True])))
+  result.save()
+  result = EvaluationData.load(path)
+
+  assert list(result.masks.keys()) == ["rmask", "wmask2"]
+  assert isinstance(result.masks["rmask"], RatingsMask)
+  assert result.masks["wmask2"].mask.tolist() == [True, False, True]
+  assert len(list((path / "masks").iterdir())) == 2
+
+
+def test_save__writes_only_changed_masks(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+  header = json.loads((path / "header.json").read_text())
+  columns_mtimes = {p.name: p.stat().st_mtime_ns for p in (path / header["columns"]).iterdir()}
+
+  result = EvaluationData.load(path)
+  result.add_or_update_mask("wmask", WorkersMask(np.array([True, True, False])))
+  result.add_or_update_mask("wmask2", WorkersMask(np.array([True, False, True])))
+  result.save()
+  new_header = json.loads((path / "header.json").read_text())
+
+  assert new_header["columns"] == header["columns"]
+  assert {p.name: p.stat().st_mtime_ns for p in (path / header["columns"]).iterdir()} == columns_mtimes
+  assert [m["name"] for m in new_header["masks"]] == ["wmask", "rmask", "wmask2"]
+  # rmask is unchanged
+  assert new_header["masks"][1] == header["masks"][1]
+  assert new_header["masks"][0]["path"] != header["masks"][0]["path"]
+  assert not (path / header["masks"][0]["path"]).exists()
+  assert EvaluationData.load(path).masks["wmask"].mask.tolist() == [True, True, False]
+
+
+def test_save__mask_changed_in_place__is_written(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+
+  result = EvaluationData.load(path)
+  result.masks["wmask"].mask_indices(0)
+  result.save()
+  result.masks["rmask"].reverse()
+  result.save_to(path)
+
+  loaded = EvaluationData.load(path)
+  assert loaded.masks["wmask"].mask.tolist() == [True, True, False]
+  assert loaded.masks["rmask"].n_masked == result.masks["rmask"].n_masked
+
+
+def test_save_to__other_directory__writes_everything(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+
+  result = EvaluationData.load(path)
+  result.save_to(tmp_path / "project2")
+
+  assert_equal(get_example_data(), EvaluationData.load(tmp_path / "project2"))
+
+
+def test_pickled_project__is_loaded_and_replaced_on_save(tmp_path: Path):
+  data = get_example_data()
+  path = tmp_path / "project.pkl"
+  save_obj(data, path)
+
+  result = EvaluationData.load(path)
+  assert_equal(data, result)
+  result.save()
+
+  assert path.is_dir()
+  assert sorted(p.name for p in tmp_path.iterdir()) == ["project.pkl"]
+  assert_equal(data, EvaluationData.load(path))
+
+
+def test_newer_version__raises_error(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+  header = json.loads((path / "header.json").read_text())
+  header["version"] += 1
+  (path / "header.json").write_text(json.dumps(header))
+
+  with pytest.raises(ValueError):
+    EvaluationData.load(path)
+
+
+def test_version_1_project__masks_are_loaded_and_saved_packed(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+  header = json.loads((path / "header.json").read_text())
+  header["version"] = 1
+  write_string_columns(path, header, get_example_data())
+  for mask_entry in header["masks"]:
+    shape = mask_entry.pop("shape")
+    packed = np.load(path / mask_entry["path"])
+    np.save(path / mask_entry["path"], np.unpackbits(packed, count=np.prod(shape)).reshape(shape).view(bool))
+  (path / "header.json").write_text(json.dumps(header))
+
+  result = EvaluationData.load(path)
+  assert_equal(get_example_data(), result)
+  result.save()
+
+  new_header = json.loads((path / "header.json").read_text())
+  assert all("shape" in mask_entry for mask_entry in new_header["masks"])
+  assert_equal(get_example_data(), EvaluationData.load(path))
+
+
+def test_version_2_project__columns_are_saved_as_codes(tmp_path: Path):
+  path = tmp_path / "project"
+  get_example_data().save_to(path)
+  header = json.loads((path / "header.json").read_text())
+  header["version"] = 2
+  write_string_columns(path, header, get_example_data())
+  (path / "header.json").write_text(json.dumps(header))
+
+  result = EvaluationData.load(path)
+  assert_equal(get_example_data(), result)
+  result.save()
+
+  new_header = json.loads((path / "header.json").read_text())
+  assert new_header["version"] == PROJECT_FORMAT_VERSION
+  assert not (path / "columns").exists()
+  assert not (path / new_header["columns"] / "assignment_devices.npy").exists()
+  assert (path / new_header["columns"] / "assignment_device_codes.npy").is_file()
+  assert_equal(get_example_data(), EvaluationData.load(path))
@@ -0,0 +1,60 @@
+import datetime
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+
+from ordered_set import OrderedSet
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk.result import Assignment, RatingData, Result, Worker
+
+TIME = datetime.datetime(2023, 7, 13, 5, 8, 4)
+
+
+def get_assignment(ratings: Dict[Tuple[str, str], Dict[str, float]], device: str = "headphone", state: str = "Approved", hit_id: str = "hit1", time: datetime.datetime = TIME) -> Assignment:
+  """ratings: the votes of each rating name for each algorithm/file combination"""
+  return Assignment(device, state, hit_id, time, OrderedDict(
+    (cell, RatingData(OrderedDict(votes)))
+    for cell, votes in ratings.items()
+  ))
+
+
+def get_worker(assignments: Dict[str, Assignment], age_group: str = "18-29", gender: str = "male") -> Worker:
+  return Worker(age_group, gender, OrderedDict(assignments))
+
+
+def get_result(workers: Dict[str, Worker], algorithms: Iterable[str] = ("alg1", "alg2"), files: Iterable[str] = ("file1", "file2")) -> Result:
+  return Result(OrderedSet(algorithms), OrderedSet(files), OrderedDict(workers))
+
+
+def get_example_result(with_worker_without_assignments: bool = True) -> Result:
+  """two workers with one assignment each (three ratings of two rating names) and optionally a third worker without assignments"""
+  workers = {
+    "worker1": get_worker({
+      "assignment1": get_assignment({
+        ("alg2", "file1"): {"naturalness": 5, "intelligibility": 3},
+        ("alg1", "file2"): {"naturalness": 4},
+      }),
+    }),
+    "worker2": get_worker({
+      "assignment2": get_assignment({
+        ("alg1", "file1"): {"naturalness": 2.5, "intelligibility": 1},
+      }, device="laptop", state="Submitted", hit_id="hit2", time=datetime.datetime(2023, 7, 14, 0, 0, 0)),
+    }, age_group="30-39", gender="female"),
+  }
+  if with_worker_without_assignments:
+    workers["worker3"] = get_worker({}, age_group="50+")
+  return get_result(workers)
+
+
+def get_example_data() -> EvaluationData:
+  """the project of the example result with a workers mask and a ratings mask"""
+  data = EvaluationData(get_example_result())
+  factory = MaskFactory(data)
+  wmask = factory.get_wmask()
+  wmask.mask_indices(1)
+  data.add_or_update_mask("wmask", wmask)
+  rmask = factory.get_rmask()
+  rmask.mask_indices((0, 0, 1))
+  data.add_or_update_mask("rmask", rmask)
+  return data
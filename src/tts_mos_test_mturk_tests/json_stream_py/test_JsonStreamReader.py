@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+
+from tts_mos_test_mturk.json_stream import JsonStreamReader
+
+DOCUMENT = {
+  "a": [1, 2.5, -3e-2, True, None],
+  "b": {"c": "x\"y\u00e4", "d": {}},
+  "e": 1234567890,
+}
+
+
+def read_object(reader: JsonStreamReader):
+  return {key: reader.read_value() for key in reader.iter_object()}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 1024])
+def test_returns_same_values_as_json_loads(chunk_size: int):
+  text = json.dumps(DOCUMENT, indent=2)
+  reader = JsonStreamReader(io.StringIO(text), chunk_size)
+
+  result = read_object(reader)
+  reader.ensure_end()
+
+  assert result == DOCUMENT
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+def test_skip_value__nested_objects_are_skipped(chunk_size: int):
+  text = json.dumps({"b": DOCUMENT, "a": 1})
+  reader = JsonStreamReader(io.StringIO(text), chunk_size)
+
+  result = {}
+  for key in reader.iter_object():
+    if key == "a":
+      result[key] = reader.read_value()
+    else:
+      reader.skip_value()
+
+  assert result == {"a": 1}
+
+
+def test_empty_object():
+  reader = JsonStreamReader(io.StringIO(" { } "), 1)
+  assert list(reader.iter_object()) == []
+  reader.ensure_end()
+
+
+def test_invalid_value__raises_error_with_location():
+  reader = JsonStreamReader(io.StringIO("{\n  \"a\": 1,\n  \"b\": [1, x]\n}"), 3)
+
+  with pytest.raises(ValueError) as error:
+    read_object(reader)
+
+  assert error.value.args[0] == "Expecting value (line 3, column 12)"
+
+
+def test_missing_comma__raises_error_with_location():
+  reader = JsonStreamReader(io.StringIO("{\"a\": 1\n\"b\": 2}"), 4)
+
+  with pytest.raises(ValueError) as error:
+    read_object(reader)
+
+  assert error.value.args[0] == "Expecting ',' (line 2, column 1)"
+
+
+def test_truncated_document__raises_error():
+  reader = JsonStreamReader(io.StringIO("{\"a\": [1, 2"), 2)
+
+  with pytest.raises(ValueError):
+    read_object(reader)
+
+
+def test_extra_data__raises_error():
+  reader = JsonStreamReader(io.StringIO("{} {}"), 2)
+  list(reader.iter_object())
+
+  with pytest.raises(ValueError):
+    reader.ensure_end()
@@ -0,0 +1,72 @@
+import numpy as np
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk_tests.helper import get_assignment, get_result, get_worker
+
+
+def get_data() -> EvaluationData:
+  votes = {"naturalness": 3}
+  result = get_result({
+    "worker1": get_worker({
+      "assignment1": get_assignment({("alg1", "file1"): votes, ("alg2", "file2"): votes}),
+      "assignment2": get_assignment({("alg1", "file2"): votes}),
+    }),
+    "worker2": get_worker({
+      "assignment3": get_assignment({("alg2", "file1"): votes, ("alg1", "file1"): votes}),
+    }),
+  })
+  return EvaluationData(result)
+
+
+def test_component():
+  data = get_data()
+  factory = MaskFactory(data)
+  amask = factory.get_amask()
+  amask.mask_indices([1, 2])
+
+  result = factory.convert_amask_to_rmask(amask)
+
+  np.testing.assert_array_equal(result.mask, [
+    [[False, True], [True, False]],
+    [[False, False], [True, False]],
+  ])
+
+
+def test_reversed_amask__unrated_cells_stay_unmasked():
+  data = get_data()
+  factory = MaskFactory(data)
+  amask = factory.get_amask()
+  amask.mask_indices([1, 2])
+  amask.reverse()
+
+  result = factory.convert_amask_to_rmask(amask)
+
+  np.testing.assert_array_equal(result.mask, [
+    [[True, False], [False, False]],
+    [[False, True], [False, False]],
+  ])
+
+
+def test_convert_wmask_to_amask():
+  data = get_data()
+  factory = MaskFactory(data)
+  wmask = factory.get_wmask()
+  wmask.mask_indices(0)
+
+  result = factory.convert_wmask_to_amask(wmask)
+
+  np.testing.assert_array_equal(result.mask, [True, True, False])
+
+
+def test_get_ratings_assignments_index_matrix__no_nan():
+  data = get_data()
+  factory = MaskFactory(data)
+
+  result = factory.get_ratings_assignments_index_matrix()
+
+  assert result.dtype == np.int32
+  np.testing.assert_array_equal(result, [
+    [[0, 1], [2, -1]],
+    [[-1, 0], [2, -1]],
+  ])
@@ -0,0 +1,105 @@
+import numpy as np
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk.masking.masks import WorkersMask
+from tts_mos_test_mturk_tests.helper import get_assignment, get_result, get_worker
+
+
+def get_data() -> EvaluationData:
+  ratings = {("alg1", "file1"): {"naturalness": 3}}
+  result = get_result({
+    "worker1": get_worker({
+      "assignment1": get_assignment(ratings),
+      "assignment2": get_assignment(ratings),
+    }),
+    "worker2": get_worker({
+      "assignment3": get_assignment(ratings),
+    }),
+  }, algorithms=["alg1"], files=["file1"])
+  data = EvaluationData(result)
+  data.add_or_update_mask("worker1", WorkersMask(np.array([True, False])))
+  data.add_or_update_mask("worker2", WorkersMask(np.array([False, True])))
+  return data
+
+
+def test_component():
+  data = get_data()
+  factory = MaskFactory(data)
+
+  result = factory.merge_masks_into_amask(data.get_masks_from_names(["worker2"]))
+
+  np.testing.assert_array_equal(result.mask, [False, False, True])
+
+
+def test_same_masks__merged_once():
+  data = get_data()
+  factory = MaskFactory(data)
+  masks = data.get_masks_from_names(["worker1", "worker2"])
+
+  result1 = factory.merge_masks_into_amask(masks)
+  result2 = MaskFactory(data).merge_masks_into_amask(list(reversed(masks)))
+
+  assert len(data.merged_masks_cache) == 1
+  assert result1 is not result2
+  np.testing.assert_array_equal(result1.mask, [True, True, True])
+  np.testing.assert_array_equal(result2.mask, [True, True, True])
+
+
+def test_changed_result__cache_is_unchanged():
+  data = get_data()
+  factory = MaskFactory(data)
+  masks = data.get_masks_from_names(["worker1"])
+
+  result = factory.merge_masks_into_amask(masks)
+  result.reverse()
+
+  np.testing.assert_array_equal(factory.merge_masks_into_amask(masks).mask, [True, True, False])
+
+
+def test_add_or_update_mask__invalidates_merged_masks():
+  data = get_data()
+  factory = MaskFactory(data)
+  factory.merge_masks_into_amask(data.get_masks_from_names(["worker1"]))
+  factory.merge_masks_into_amask(data.get_masks_from_names(["worker2"]))
+
+  data.add_or_update_mask("worker1", WorkersMask(np.array([False, True])))
+  result = factory.merge_masks_into_amask(data.get_masks_from_names(["worker1"]))
+
+  assert len(data.merged_masks_cache) == 2
+  np.testing.assert_array_equal(result.mask, [False, False, True])
+
+
+def test_mask_changed_in_place__merged_again():
+  data = get_data()
+  factory = MaskFactory(data)
+  masks = data.get_masks_from_names(["worker1"])
+  factory.merge_masks_into_amask(masks)
+
+  masks[0].reverse()
+  result = factory.merge_masks_into_amask(masks)
+
+  np.testing.assert_array_equal(result.mask, [False, False, True])
+
+
+def test_mask_changed_in_place__entry_is_replaced():
+  data = get_data()
+  factory = MaskFactory(data)
+  masks = data.get_masks_from_names(["worker1", "worker2"])
+
+  for _ in range(3):
+    masks[0].reverse()
+    factory.merge_masks_into_amask(masks)
+
+  assert len(data.merged_masks_cache) == 1
+
+
+def test_reversed_masks__not_cached():
+  data = get_data()
+  factory = MaskFactory(data)
+
+  for _ in range(3):
+    result = factory.merge_masks_into_amask(data.get_masks_from_names(["!worker1", "worker2"]))
+
+  assert len(data.merged_masks_cache) == 0
+  np.testing.assert_array_equal(result.mask, [False, False, True])
@@ -0,0 +1,56 @@
+import numpy as np
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.masking.mask_factory import MaskFactory
+from tts_mos_test_mturk_tests.helper import get_assignment, get_result, get_worker
+
+
+def get_data() -> EvaluationData:
+  rng = np.random.default_rng(1234)
+  algorithms = ["alg1", "alg2", "alg3"]
+  files = ["file1", "file2", "file3", "file4"]
+  workers = {}
+  for w_i in range(6):
+    assignments = {}
+    for a_i in range(2):
+      ratings = {}
+      # cells can be rated in both assignments of a worker
+      for alg_i, file_i in zip(rng.integers(0, 3, 3), rng.integers(0, 4, 3)):
+        ratings[(algorithms[alg_i], files[file_i])] = {"naturalness": int(rng.integers(1, 6))}
+      assignments[f"assignment{w_i}_{a_i}"] = get_assignment(ratings)
+    workers[f"worker{w_i}"] = get_worker(assignments)
+  return EvaluationData(get_result(workers, algorithms, files))
+
+
+def test_equals_dense_rmask_on_rated_cells():
+  data = get_data()
+  factory = MaskFactory(data)
+  wmask = factory.get_wmask()
+  wmask.mask_indices([1, 4])
+  amask = factory.get_amask()
+  amask.mask_indices([0, 5, 6])
+  rmask = factory.get_rmask()
+  rmask.mask_indices(2)
+  rmask.reverse()
+  masks = [wmask, amask, rmask]
+
+  dense = factory.merge_masks_into_rmask(masks)
+  result = factory.merge_masks_into_sparse_rmask(masks)
+
+  rated = np.zeros(dense.mask.shape, dtype=bool)
+  rated.flat[data.rated_cells] = True
+  np.testing.assert_array_equal(result.to_dense().mask, dense.mask & rated)
+  np.testing.assert_array_equal(
+    result.mask[data.rating_cells],
+    dense.mask[data.rating_algorithms, data.rating_workers, data.rating_files],
+  )
+
+
+def test_empty_masks__nothing_masked():
+  data = get_data()
+  factory = MaskFactory(data)
+
+  result = factory.merge_masks_into_sparse_rmask([])
+
+  assert result.mask.shape == data.rated_cells.shape
+  assert result.n_masked == 0
@@ -0,0 +1,163 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from tts_mos_test_mturk.masking.masks import RatingsMask, WorkersMask
+
+
+def get_masks():
+  rng = np.random.default_rng(1234)
+  # 3 * 5 * 7 = 105 cells, i.e., the last byte contains padding bits
+  mask1 = rng.random((3, 5, 7)) < 0.3
+  mask2 = rng.random((3, 5, 7)) < 0.3
+  packed1 = RatingsMask.from_packed(np.packbits(mask1), mask1.shape)
+  packed2 = RatingsMask.from_packed(np.packbits(mask2), mask2.shape)
+  return mask1, mask2, packed1, packed2
+
+
+def test_from_packed__unpacks_on_access():
+  mask1, _, packed1, _ = get_masks()
+
+  assert not packed1.is_unpacked
+  np.testing.assert_array_equal(packed1.mask, mask1)
+  assert packed1.is_unpacked
+  assert packed1.mask.dtype == bool
+
+
+def test_packed__equals_packbits():
+  mask1, _, _, _ = get_masks()
+
+  result = RatingsMask(mask1).packed
+
+  np.testing.assert_array_equal(result, np.packbits(mask1))
+
+
+def test_combine_mask__packed():
+  mask1, mask2, packed1, packed2 = get_masks()
+
+  packed1.combine_mask(packed2)
+
+  assert not packed1.is_unpacked
+  np.testing.assert_array_equal(packed1.mask, mask1 | mask2)
+
+
+def test_reverse__packed__padding_stays_unset():
+  mask1, _, packed1, _ = get_masks()
+
+  packed1.reverse()
+
+  assert not packed1.is_unpacked
+  assert packed1.n_masked == np.sum(~mask1)
+  assert packed1.n_unmasked == np.sum(mask1)
+  np.testing.assert_array_equal(packed1.mask, ~mask1)
+
+
+def test_n_masked__packed():
+  mask1, _, packed1, _ = get_masks()
+
+  assert packed1.n_masked == np.sum(mask1)
+  assert packed1.n_unmasked == np.sum(~mask1)
+  assert not packed1.is_unpacked
+
+
+def test_clone__packed__independent():
+  mask1, _, packed1, _ = get_masks()
+
+  result = packed1.clone()
+  result.reverse()
+
+  assert isinstance(result, RatingsMask)
+  np.testing.assert_array_equal(packed1.mask, mask1)
+  np.testing.assert_array_equal(result.mask, ~mask1)
+
+
+def test_mask_indices__updates_packed():
+  mask = WorkersMask.from_packed(np.packbits([False, False, False]), (3,))
+  packed_before = mask.packed
+
+  mask.mask_indices(np.array([1]))
+
+  assert mask.packed is not packed_before
+  np.testing.assert_array_equal(mask.packed, np.packbits([False, True, False]))
+
+
+def test_unpacked__packed_follows_changes():
+  mask1, mask2, packed1, _ = get_masks()
+  assert packed1.mask is not None
+  packed_before = packed1.packed
+
+  packed1.combine_mask_np(mask2)
+
+  assert packed1.packed is not packed_before
+  np.testing.assert_array_equal(packed1.packed, np.packbits(mask1 | mask2))
+
+
+def test_mask__is_read_only():
+  mask = WorkersMask(np.array([False, False]))
+
+  with pytest.raises(ValueError):
+    mask.mask[0] = True
+
+  assert mask.n_masked == 0
+
+
+def test_combine_mask__other_packed_mask_stays_packed():
+  mask1, mask2, _, packed2 = get_masks()
+  mask = RatingsMask(mask1.copy())
+
+  mask.combine_mask(packed2)
+
+  assert not packed2.is_unpacked
+  np.testing.assert_array_equal(mask.mask, mask1 | mask2)
+
+
+def test_combine_mask__packed_with_unpacked__stays_packed():
+  mask1, mask2, packed1, _ = get_masks()
+  other = RatingsMask(mask2)
+
+  packed1.combine_mask(other)
+
+  assert not packed1.is_unpacked
+  np.testing.assert_array_equal(packed1.mask, mask1 | mask2)
+
+
+def test_version__increased_by_each_change():
+  mask = WorkersMask.from_packed(np.packbits([False, False, False]), (3,))
+  versions = [mask.version]
+
+  mask.reverse()
+  versions.append(mask.version)
+  mask.combine_mask_np(np.array([True, False, False]))
+  versions.append(mask.version)
+  mask.mask_indices(np.array([1]))
+  versions.append(mask.version)
+  mask.mask = np.array([False, False, False])
+  versions.append(mask.version)
+
+  assert len(set(versions)) == 5
+
+
+def test_unpickle_old_mask():
+  mask = WorkersMask(np.array([True, False]))
+  state = {"mask": np.array([True, False])}
+
+  result = WorkersMask.__new__(WorkersMask)
+  result.__setstate__(state)
+
+  np.testing.assert_array_equal(result.mask, mask.mask)
+  np.testing.assert_array_equal(pickle.loads(pickle.dumps(result)).mask, mask.mask)
+
+
+def test_grow__appends_unmasked_entries():
+  mask = RatingsMask(np.array([[[True, False]], [[False, True]]]))
+
+  result = mask.grow((3, 2, 2))
+
+  assert isinstance(result, RatingsMask)
+  np.testing.assert_array_equal(result.mask, [
+    [[True, False], [False, False]],
+    [[False, True], [False, False]],
+    [[False, False], [False, False]],
+  ])
+  assert mask.mask.shape == (2, 1, 2)
@@ -0,0 +1,75 @@
+import numpy as np
+
+from tts_mos_test_mturk.masking.masks import RatingsMask, SparseRatingsMask
+
+SHAPE = (3, 5, 4)
+
+
+def get_masks():
+  rng = np.random.default_rng(1234)
+  rated = rng.random(SHAPE) < 0.4
+  cells = np.flatnonzero(rated)
+  dense = rng.random(SHAPE) < 0.5
+  sparse = SparseRatingsMask(dense.flat[cells].copy(), cells, SHAPE)
+  return rated, dense, sparse
+
+
+def test_to_dense__masks_only_rated_cells():
+  rated, dense, sparse = get_masks()
+
+  result = sparse.to_dense()
+
+  assert isinstance(result, RatingsMask)
+  np.testing.assert_array_equal(result.mask, dense & rated)
+
+
+def test_combine_mask__dense_and_sparse():
+  rated, dense, sparse = get_masks()
+  other = np.zeros(SHAPE, dtype=bool)
+  other[1] = True
+
+  sparse.combine_mask(RatingsMask(other))
+  np.testing.assert_array_equal(sparse.to_dense().mask, (dense | other) & rated)
+
+  dense_mask = RatingsMask(dense.copy())
+  dense_mask.combine_mask(sparse)
+  np.testing.assert_array_equal(dense_mask.mask, dense | (other & rated))
+
+
+def test_apply_by_nan__dense_and_sparse_ratings():
+  rated, dense, sparse = get_masks()
+  ratings = np.where(rated, 3.0, np.nan)
+  sparse_ratings = np.full(len(sparse.cells), 3.0)
+
+  sparse.apply_by_nan(ratings)
+  sparse.apply_by_nan(sparse_ratings)
+
+  np.testing.assert_array_equal(np.isnan(ratings), ~rated | dense)
+  np.testing.assert_array_equal(np.isnan(sparse_ratings), dense.flat[sparse.cells])
+
+
+def test_reverse__only_rated_cells():
+  rated, dense, sparse = get_masks()
+
+  sparse.reverse()
+
+  np.testing.assert_array_equal(sparse.to_dense().mask, ~dense & rated)
+  assert sparse.n_masked == np.sum(~dense & rated)
+
+
+def test_masked_counts__equals_dense():
+  rated, dense, sparse = get_masks()
+  dense_mask = RatingsMask(dense & rated)
+
+  for axis in range(3):
+    np.testing.assert_array_equal(sparse.masked_counts(axis), dense_mask.masked_counts(axis))
+  assert sparse.n_masked == dense_mask.n_masked
+
+
+def test_clone__shares_no_mask():
+  _, _, sparse = get_masks()
+
+  result = sparse.clone()
+  result.reverse()
+
+  assert np.all(result.mask != sparse.mask)
@@ -0,0 +1,24 @@
+import numpy as np
+
+from tts_mos_test_mturk.evaluation_data import EvaluationData
+from tts_mos_test_mturk.masking.masks import AssignmentsMask
+from tts_mos_test_mturk.masking.state_mask import get_states_amask, get_stats_df
+from tts_mos_test_mturk_tests.helper import get_example_result
+
+
+def test_masks_only_unmasked_assignments_of_states():
+  data = EvaluationData(get_example_result())
+
+  result = get_states_amask(data, {"Approved", "Submitted", "Unknown"}, AssignmentsMask(np.array([False, True])))
+
+  np.testing.assert_array_equal(result.mask, [True, False])
+
+
+def test_get_stats_df__counts_unmasked_assignments():
+  data = EvaluationData(get_example_result())
+
+  result = get_stats_df(data, {"Approved"}, AssignmentsMask(np.array([False, True])))
+
+  assert result["State"].tolist() == ["Approved", "-ALL-"]
+  assert result["# Assignments"].tolist() == [1, 1]
+  assert result["Masked?"].tolist() == [True, True]
@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pytest
+
+from tts_mos_test_mturk.evaluation_data import COLUMNS, EvaluationData
+from tts_mos_test_mturk.result import parse_result_from_json
+from tts_mos_test_mturk.result_json import parse_evaluation_data_from_json
+
+
+def get_json() -> Dict[str, Any]:
+  return {
+    "algorithms": ["alg1", "alg2"],
+    "files": ["file1", "file2"],
+    "workers": {
+      "worker1": {
+        "gender": "male",
+        "age_group": "18-29",
+        "assignments": {
+          "assignment1": {
+            "hit": "hit1",
+            "device": "headphone",
+            "state": "Approved",
+            "time": "13.7.23 05:08:04",
+            "ratings": [
+              {"algorithm": "alg2", "file": "file1", "votes": {"naturalness": 5, "intelligibility": 3}},
+              {"algorithm": "alg1", "file": "file2", "votes": {"naturalness": 4}},
+            ],
+          },
+        },
+      },
+      "worker2": {
+        "assignments": {
+          "assignment2": {
+            "hit": "hit2",
+            "device": "laptop",
+            "state": "Submitted",
+            "time": "14.7.23 00:00:00",
+            "ratings": [
+              {"algorithm": "alg1", "file": "file1", "votes": {"naturalness": 2.5, "intelligibility": 1}},
+            ],
+          },
+        },
+        "gender": "female",
+        "age_group": "30-39",
+      },
+      "worker3": {"gender": "male", "age_group": "50+", "assignments": {}},
+    },
+  }
+
+
+def write_json(data: Dict[str, Any], path: Path) -> Path:
+  path = path / "results.json"
+  path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+  return path
+
+
+def assert_equal(result: EvaluationData, expected: EvaluationData) -> None:
+  assert result.algorithms == expected.algorithms
+  assert result.files == expected.files
+  assert result.workers == expected.workers
+  assert result.assignments == expected.assignments
+  assert result.rating_names == expected.rating_names
+  assert result.n_ratings == expected.n_ratings
+  for column in COLUMNS:
+    assert getattr(result, column).dtype == getattr(expected, column).dtype
+    np.testing.assert_array_equal(getattr(result, column), getattr(expected, column))
+  assert result.worker_data == expected.worker_data
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1024])
+def test_returns_same_project_as_parse_result_from_json(tmp_path: Path, chunk_size: int):
+  data = get_json()
+  path = write_json(data, tmp_path)
+
+  result = parse_evaluation_data_from_json(path, chunk_size)
+
+  assert_equal(result, EvaluationData(parse_result_from_json(data)))
+
+
+@pytest.mark.parametrize("keys", [
+  ("workers", "files", "algorithms"),
+  ("algorithms", "workers", "files"),
+  ("files", "workers", "algorithms"),
+])
+@pytest.mark.parametrize("chunk_size", [3, 1024])
+def test_workers_before_algorithms_or_files__returns_same_project(tmp_path: Path, keys: Tuple[str, ...], chunk_size: int):
+  # the workers are parsed in a second pass over the file
+  data = get_json()
+  reordered = {key: data[key] for key in keys}
+  path = write_json(reordered, tmp_path)
+
+  result = parse_evaluation_data_from_json(path, chunk_size)
+
+  assert_equal(result, EvaluationData(parse_result_from_json(data)))
+
+
+def test_workers_before_algorithms_and_files__undefined_algorithm__raises_error_with_location(tmp_path: Path):
+  data = get_json()
+  data["workers"]["worker2"]["assignments"]["assignment2"]["ratings"][0]["algorithm"] = "alg3"
+  reordered = {"workers": data["workers"], "algorithms": data["algorithms"], "files": data["files"]}
+  path = write_json(reordered, tmp_path)
+
+  with pytest.raises(ValueError) as error:
+    parse_evaluation_data_from_json(path)
+
+  assert error.value.args[0] == "Referenced algorithm \"alg3\" was not defined in \"algorithms\"! (worker \"worker2\", assignment \"assignment2\", rating 1, line 34)"
+
+
+def test_undefined_algorithm__raises_error_with_location(tmp_path: Path):
+  data = get_json()
+  data["workers"]["worker2"]["assignments"]["assignment2"]["ratings"][0]["algorithm"] = "alg3"
+  path = write_json(data, tmp_path)
+
+  with pytest.raises(ValueError) as error:
+    parse_evaluation_data_from_json(path)
+
+  assert error.value.args[0] == "Referenced algorithm \"alg3\" was not defined in \"algorithms\"! (worker \"worker2\", assignment \"assignment2\", rating 1, line 42)"
+
+
+def test_undefined_file__raises_error(tmp_path: Path):
+  data = get_json()
+  data["workers"]["worker1"]["assignments"]["assignment1"]["ratings"][1]["file"] = "file3"
+  path = write_json(data, tmp_path)
+
+  with pytest.raises(ValueError, match="Referenced file \"file3\" was not defined in \"files\"! \\(worker \"worker1\", assignment \"assignment1\", rating 2"):
+    parse_evaluation_data_from_json(path)
+
+
+def test_duplicate_assignment__raises_error(tmp_path: Path):
+  data = get_json()
+  data["workers"]["worker3"]["assignments"]["assignment1"] = data["workers"]["worker1"]["assignments"]["assignment1"]
+  path = write_json(data, tmp_path)
+
+  with pytest.raises(ValueError, match="Assignment \"assignment1\" exist multiple times! \\(worker \"worker3\""):
+    parse_evaluation_data_from_json(path)
+
+
+def test_duplicate_rating__raises_error(tmp_path: Path):
+  data = get_json()
+  ratings = data["workers"]["worker1"]["assignments"]["assignment1"]["ratings"]
+  ratings.append(ratings[0])
+  path = write_json(data, tmp_path)
+
+  with pytest.raises(ValueError, match="Rating for algorithm and file combination exist multiple times! \\(worker \"worker1\", assignment \"assignment1\", rating 3"):
+    parse_evaluation_data_from_json(path)
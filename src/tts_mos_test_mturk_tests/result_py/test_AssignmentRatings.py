@@ -0,0 +1,61 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+from ordered_set import OrderedSet
+
+from tts_mos_test_mturk.result import AssignmentRatings, RatingData
+
+
+def get_ratings() -> AssignmentRatings:
+  return AssignmentRatings(
+    OrderedSet(["alg1", "alg2"]),
+    OrderedSet(["file1", "file2"]),
+    OrderedSet(["naturalness", "intelligibility"]),
+    np.array([1, 0], dtype=np.int32),
+    np.array([0, 1], dtype=np.int32),
+    np.array([[5, 2.5], [4, np.nan]], dtype=np.float32),
+  )
+
+
+def test_items__returns_rating_data_in_order():
+  ratings = get_ratings()
+
+  result = list(ratings.items())
+
+  assert result == [
+    (("alg2", "file1"), RatingData(OrderedDict([("naturalness", 5), ("intelligibility", 2.5)]))),
+    (("alg1", "file2"), RatingData(OrderedDict([("naturalness", 4)]))),
+  ]
+
+
+def test_getitem__missing_vote_is_skipped():
+  ratings = get_ratings()
+
+  result = ratings[("alg1", "file2")].votes
+
+  assert len(result) == 1
+  assert result["naturalness"] == 4
+  assert isinstance(result["naturalness"], int)
+  assert "intelligibility" not in result
+  with pytest.raises(KeyError):
+    result["intelligibility"]
+
+
+def test_getitem__unrated_cell__raises_key_error():
+  ratings = get_ratings()
+
+  assert ("alg1", "file1") not in ratings
+  assert ("alg3", "file1") not in ratings
+  with pytest.raises(KeyError):
+    ratings[("alg1", "file1")]
+
+
+def test_equals_ordered_dict():
+  ratings = get_ratings()
+
+  assert ratings == OrderedDict([
+    (("alg2", "file1"), RatingData(OrderedDict([("naturalness", 5), ("intelligibility", 2.5)]))),
+    (("alg1", "file2"), RatingData(OrderedDict([("naturalness", 4)]))),
+  ])
+  assert len(ratings) == 2
@@ -0,0 +1,44 @@
+import datetime
+import pickle
+from collections import OrderedDict
+
+from tts_mos_test_mturk.result import Assignment, RatingData, Worker
+
+
+def get_worker() -> Worker:
+  return Worker("18-29", "male", OrderedDict([
+    ("assignment1", Assignment("laptop", "Approved", "hit1", datetime.datetime(2023, 7, 13, 5, 8, 4), OrderedDict([
+      (("alg1", "file1"), RatingData(OrderedDict([("naturalness", 5)]))),
+    ]))),
+  ]))
+
+
+def test_has_no_dict():
+  worker = get_worker()
+
+  assert not hasattr(worker, "__dict__")
+  assert not hasattr(worker.assignments["assignment1"], "__dict__")
+
+
+def test_pickle__returns_equal_object():
+  worker = get_worker()
+
+  result = pickle.loads(pickle.dumps(worker))
+
+  assert result == worker
+
+
+def test_setstate__state_of_dataclass__sets_attributes():
+  # instances which were pickled by an older version
+  result = Worker.__new__(Worker)
+  result.__setstate__({"age_group": "18-29", "gender": "male", "assignments": OrderedDict()})
+
+  assert result == Worker("18-29", "male")
+
+
+def test_repr():
+  votes = OrderedDict([("naturalness", 5)])
+
+  result = repr(RatingData(votes))
+
+  assert result == f"RatingData(votes={votes!r})"
@@ -0,0 +1,39 @@
+import numpy as np
+
+from tts_mos_test_mturk.result import parse_time, parse_time2, parse_times
+
+
+def test_same_as_parse_time2():
+  values = ["26.8.23 08:48:21", "01.12.23 8:04:02", "31.12.99 23:59:59"]
+
+  result = parse_times(values)
+
+  assert result.dtype == np.dtype("datetime64[s]")
+  np.testing.assert_array_equal(result, np.array([parse_time2(v) for v in values], dtype="datetime64[s]"))
+
+
+def test_same_as_parse_time():
+  values = ["Mon Mar 06 08:59:21 PST 2023", "Tue Jul 04 18:00:00 PDT 2023"]
+
+  result = parse_times(values)
+
+  np.testing.assert_array_equal(result, np.array([parse_time(v) for v in values], dtype="datetime64[s]"))
+
+
+def test_mixed_formats():
+  result = parse_times(["Mon Mar 06 08:59:21 PST 2023", "26.8.23 08:48:21"])
+
+  np.testing.assert_array_equal(result, np.array(
+    ["2023-03-06T08:59:21", "2023-08-26T08:48:21"], dtype="datetime64[s]"))
+
+
+def test_invalid__returns_nat():
+  result = parse_times(["26.8.23 08:48:21", "yesterday"])
+
+  np.testing.assert_array_equal(np.isnat(result), [False, True])
+
+
+def test_empty():
+  result = parse_times([])
+
+  assert result.shape == (0,)
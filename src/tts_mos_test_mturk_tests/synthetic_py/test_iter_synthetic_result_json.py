@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tts_mos_test_mturk.result_json import parse_evaluation_data_from_json
+from tts_mos_test_mturk.synthetic import (SyntheticStudy, iter_synthetic_result_json,
+                                          write_synthetic_result_json)
+
+
+def get_study(**kwargs) -> SyntheticStudy:
+  settings = dict(n_workers=5, n_assignments=4, n_ratings=6, n_algorithms=3, n_files=10)
+  settings.update(kwargs)
+  return SyntheticStudy(**settings)
+
+
+def test_written_file_is_parsed_with_requested_counts(tmp_path: Path):
+  study = get_study(rating_names=("a", "b", "c"), devices=("laptop",), states=("Approved",))
+  path = tmp_path / "result.json"
+  write_synthetic_result_json(study, path)
+
+  data = parse_evaluation_data_from_json(path)
+
+  assert data.n_workers == 5
+  assert data.n_assignments == 20
+  assert data.n_ratings == 120
+  assert data.n_algorithms == 3
+  assert data.n_files == 10
+  assert list(data.rating_names) == ["a", "b", "c"]
+  assert data.devices.tolist() == ["laptop"]
+  assert data.states.tolist() == ["Approved"]
+
+
+def test_votes_are_integers_in_range():
+  result = json.loads("".join(iter_synthetic_result_json(get_study())))
+
+  votes = [
+    vote
+    for worker in result["workers"].values()
+    for assignment in worker["assignments"].values()
+    for rating in assignment["ratings"]
+    for vote in rating["votes"].values()
+  ]
+
+  assert len(votes) == 5 * 4 * 6 * 2
+  assert all(isinstance(vote, int) and 1 <= vote <= 5 for vote in votes)
+
+
+def test_same_seed__returns_same_json():
+  result1 = "".join(iter_synthetic_result_json(get_study(seed=1)))
+  result2 = "".join(iter_synthetic_result_json(get_study(seed=1)))
+  result3 = "".join(iter_synthetic_result_json(get_study(seed=2)))
+
+  assert result1 == result2
+  assert result1 != result3
+
+
+@pytest.mark.parametrize("duplicate_ratings", [0.0, 0.5])
+def test_duplicates_only_across_assignments(duplicate_ratings: float):
+  result = json.loads("".join(iter_synthetic_result_json(
+    get_study(duplicate_ratings=duplicate_ratings, n_files=100))))
+
+  n_duplicates = 0
+  for worker in result["workers"].values():
+    rated = set()
+    for assignment in worker["assignments"].values():
+      cells = [(rating["algorithm"], rating["file"]) for rating in assignment["ratings"]]
+      assert len(set(cells)) == len(cells)
+      n_duplicates += len(rated.intersection(cells))
+      rated.update(cells)
+
+  if duplicate_ratings == 0:
+    # the combinations are drawn from 300, therefore a few repeat by chance
+    assert n_duplicates < 10
+  else:
+    assert n_duplicates > 30
+
+
+def test_too_many_ratings__raises_error():
+  with pytest.raises(ValueError):
+    list(iter_synthetic_result_json(get_study(n_ratings=31)))